@@ -0,0 +1,110 @@
+# app/api/v1/routes/admin_routes.py
+import logging
+from typing import AsyncIterator, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from ....auth.auth0 import has_role
+from ....config import get_settings
+from ....db.session import ReadSessionLocal, async_engine
+from ....models.role import RoleType
+from ....services.export_service import ExportFormat, export_users
+from ....services.import_service import ImportFormat, ImportFormatError, UserImporter
+from ....services.provisioning_service import get_user_provisioner
+from ....services.user_service import UserFilters
+
+router = APIRouter()
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Route guards, compiled to role masks once when the router is built
+admin_only = Depends(has_role(["admin"]))
+
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/jsonlines": "ndjson",
+}
+
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def _stream_export(export_format: ExportFormat, filters: UserFilters, compress: bool) -> AsyncIterator[bytes]:
+    # The stream outlives the request's dependencies, so it owns its session
+    async with ReadSessionLocal() as db:
+        async for chunk in export_users(db, export_format, filters, compress=compress):
+            yield chunk
+
+
+@router.post("/users/import", dependencies=[admin_only])
+async def import_users(
+        request: Request,
+        import_format: Optional[ImportFormat] = Query(
+            None,
+            alias="format",
+            description="csv or ndjson; taken from Content-Type when omitted"
+        )
+) -> Dict:
+    """
+    Bulk import users, profiles and roles from a CSV or NDJSON request body (admin only)
+
+    Columns: auth0_id, email, username, first_name, last_name, is_active,
+    avatar_url, bio, location, phone_number and roles (comma or pipe separated
+    in CSV, a list in NDJSON). The body is streamed and merged in chunks;
+    invalid rows are listed in the report without stopping the import.
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        import_format = _CONTENT_TYPE_FORMATS.get(content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format="
+        )
+
+    try:
+        importer = UserImporter(
+            async_engine,
+            chunk_size=settings.BULK_IMPORT_CHUNK_SIZE,
+            max_errors=settings.BULK_IMPORT_MAX_ERRORS
+        )
+        report = await importer.run(request.stream(), import_format)
+    except ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if report.updated:
+        # Updated users may have gained roles; cached lookups would hide them until the TTL
+        get_user_provisioner().clear()
+    return report.as_dict()
+
+
+
+@router.get("/users/export", dependencies=[admin_only])
+async def export_all_users(
+        export_format: ExportFormat = Query("ndjson", alias="format"),
+        gzip: bool = Query(False, description="Compress the export as a .gz file"),
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        role: Optional[RoleType] = None
+) -> StreamingResponse:
+    """
+    Export all users with their profiles and roles as CSV or NDJSON (admin only)
+
+    The file is produced while rows are read, so exports of any size use the
+    same memory. Columns match the import format.
+    """
+    filters = UserFilters(is_active=is_active, is_verified=is_verified, role=role)
+    filename = f"users.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        _stream_export(export_format, filters, gzip),
+        media_type="application/gzip" if gzip else _EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
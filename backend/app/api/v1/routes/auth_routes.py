@@ -1,112 +1,69 @@
 # app/api/v1/routes/auth_routes.py
-from fastapi import APIRouter, HTTPException, status, Response, Request, Depends
-import requests
+from fastapi import APIRouter, Header, HTTPException, status, Response, Request, Depends
+import httpx
+import json
 import logging
-from jwt import decode, get_unverified_header
+from jwt import decode
 from jwt.exceptions import PyJWTError
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-import base64
-from typing import Union
+from typing import Optional
+from ....auth.userinfo_cache import fetch_user_info, get_userinfo_cache
 from ....config import get_settings
+from ....core.security.token_manager import get_session_token_manager, get_token_refresher
+from ....core.security.token_store import get_session_store
+from ....core.security.user_auth import Principal, get_principal, verify_access_token
+from ....middleware.authentication_middleware import set_token_cookies
+from ....services.activity_service import get_last_login_buffer
+from ....services.provisioning_service import get_user_provisioner
+from ....utils.etag import if_none_match, make_etag, not_modified, set_etag
+from ....utils.http_client import get_http_client
 
 router = APIRouter()
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-def ensure_bytes(key: Union[str, bytes]) -> bytes:
-    """Convert string to bytes if needed."""
-    if isinstance(key, str):
-        return key.encode('utf-8')
-    return key
-
-
-def decode_value(val: str) -> int:
-    """Decode JWT base64 value to integer."""
-    # Ensure proper padding
-    padded = val + '=' * (4 - len(val) % 4)
-    # Convert to bytes first
-    decoded = base64.urlsafe_b64decode(ensure_bytes(padded))
-    return int.from_bytes(decoded, 'big')
-
-
-def get_public_key(jwk: dict) -> bytes:
-    """Convert JWK to PEM format."""
-    e = decode_value(jwk['e'])
-    n = decode_value(jwk['n'])
+def _token_subject(access_token: Optional[str]) -> Optional[str]:
+    """Read ``sub`` without verification; only used to pick a cache entry to drop."""
+    if not access_token:
+        return None
+    try:
+        return decode(access_token, options={"verify_signature": False}).get("sub")
+    except PyJWTError:
+        return None
 
-    numbers = RSAPublicNumbers(e=e, n=n)
-    key = numbers.public_key(backend=default_backend())
 
-    return key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo
-    )
+async def _provision_user(access_token: str, http_client: httpx.AsyncClient) -> None:
+    """Create or update the local user on login; on failure the next request retries"""
+    try:
+        claims = await verify_access_token(access_token)
+        user_info = await get_userinfo_cache().get(
+            claims.get("sub"),
+            lambda: fetch_user_info(access_token, http_client)
+        )
+        local_user = await get_user_provisioner().provision(claims, user_info)
+        get_last_login_buffer().record(local_user.user_id)
+    except Exception as e:
+        logger.error(f"Failed to provision user on login: {str(e)}")
 
-def fetch_user_info(access_token: str):
-    userinfo_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.get(userinfo_url, headers=headers)
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail="Failed to fetch user info")
-    return response.json()
 
-async def get_current_user(request: Request):
+async def get_current_user(
+        principal: Principal = Depends(get_principal),
+        http_client: httpx.AsyncClient = Depends(get_http_client)
+):
     """
-    Get the current user from the access token in cookies
+    Get the current user from the principal verified by AuthenticationMiddleware
     """
-    access_token = request.cookies.get("access_token")
-    if not access_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
-
     try:
-        # Get JWKS
-        jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-        jwks_response = requests.get(jwks_url)
-        jwks = jwks_response.json()
-
-        # Decode header to get key ID
-        header = get_unverified_header(access_token)
-        rsa_key = None
-
-        # Find the matching key in JWKS
-        for key in jwks["keys"]:
-            if key["kid"] == header["kid"]:
-                rsa_key = get_public_key(key)
-                break
-
-        if not rsa_key:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token key"
-            )
-
-        # Verify and decode token
-        payload = decode(
-            access_token,
-            key=rsa_key,
-            algorithms=["RS256"],
-            audience=settings.AUTH0_AUDIENCE,
-            issuer=f"https://{settings.AUTH0_DOMAIN}/"
+        payload = dict(principal.claims)
+        user_info = await get_userinfo_cache().get(
+            principal.sub,
+            lambda: fetch_user_info(principal.token, http_client)
         )
-
-        user_info = fetch_user_info(access_token)
         payload.update(user_info)
         return payload
 
-    except PyJWTError as e:
-        logger.error(f"Token validation error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
     except Exception as e:
-        logger.error(f"Unexpected error during token validation: {str(e)}")
+        logger.error(f"Unexpected error while loading user info: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication error"
@@ -114,12 +71,19 @@ async def get_current_user(request: Request):
 
 
 @router.get("/me")
-async def get_user_profile(user: dict = Depends(get_current_user)):
+async def get_user_profile(
+        response: Response,
+        if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+        user: dict = Depends(get_current_user)
+):
     """
     Get current user profile information
+
+    Built from cached token claims and /userinfo, so the ETag is a hash of the
+    body itself; a matching If-None-Match is answered with 304.
     """
     try:
-        return {
+        profile = {
             "sub": user.get("sub"),
             "email": user.get("email"),
             "name": user.get("name", user.get("email")),
@@ -128,12 +92,17 @@ async def get_user_profile(user: dict = Depends(get_current_user)):
             "roles": user.get("permissions", []),
             "updated_at": user.get("updated_at"),
         }
+        etag = make_etag(json.dumps(profile, sort_keys=True, default=str))
     except Exception as e:
         logger.error(f"Error processing user profile: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing user profile"
         )
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return profile
 
 
 # noinspection PyUnusedLocal
@@ -142,6 +111,7 @@ async def auth_callback(
         response: Response,
         code: str,
         state: str | None = None,
+        http_client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """
     Auth0 callback endpoint that exchanges the authorization code for tokens
@@ -160,9 +130,9 @@ async def auth_callback(
         }
 
         # Exchange the authorization code for tokens
-        token_response = requests.post(token_url, json=token_payload)
+        token_response = await http_client.post(token_url, json=token_payload)
 
-        if not token_response.ok:
+        if not token_response.is_success:
             error_details = token_response.json()
             logger.error(f"Token exchange failed. Status: {token_response.status_code}")
             logger.error(f"Response body: {error_details}")
@@ -174,26 +144,31 @@ async def auth_callback(
         logger.info(f"Token exchange succeeded: {token_response.json()}")
         tokens = token_response.json()
         logger.info("Token exchange successful")
-
-        # Set secure cookies
-        response.set_cookie(
-            "access_token",
-            tokens["access_token"],
-            httponly=True,
-            secure=True,
-            samesite="lax",
-            max_age=3600  # 1 hour
-        )
-
-        if "refresh_token" in tokens:
+        await _provision_user(tokens["access_token"], http_client)
+
+        if settings.AUTH_MODE == "session":
+            # Keep the Auth0 tokens server side; the browser only gets an opaque ID
+            claims = await verify_access_token(tokens["access_token"])
+            session = await get_session_store().create(
+                claims,
+                tokens["access_token"],
+                tokens.get("refresh_token")
+            )
+            get_session_token_manager().track(session)
             response.set_cookie(
-                "refresh_token",
-                tokens["refresh_token"],
+                settings.SESSION_COOKIE_NAME,
+                session.session_id,
                 httponly=True,
                 secure=True,
                 samesite="lax",
-                max_age=2592000  # 30 days
+                max_age=settings.SESSION_TTL_SECONDS
             )
+            response.status_code = status.HTTP_307_TEMPORARY_REDIRECT
+            response.headers["Location"] = f"{settings.FRONTEND_URL}/landing"
+            return {"status": "success"}
+
+        # Set secure cookies
+        set_token_cookies(response, tokens)
 
         # Redirect to landing page instead of frontend root
         response.status_code = status.HTTP_307_TEMPORARY_REDIRECT
@@ -203,7 +178,7 @@ async def auth_callback(
             "status": "success"
         }
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request failed during token exchange: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -212,10 +187,17 @@ async def auth_callback(
 
 
 @router.post("/refresh")
-async def refresh_token_endpoint(request: Request, response: Response):
+async def refresh_token_endpoint(
+        request: Request,
+        response: Response,
+        http_client: httpx.AsyncClient = Depends(get_http_client)
+):
     """
     Refresh the access token using the refresh token
     """
+    if settings.AUTH_MODE == "session":
+        return await _refresh_server_session(request, http_client)
+
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         raise HTTPException(
@@ -224,31 +206,38 @@ async def refresh_token_endpoint(request: Request, response: Response):
         )
 
     try:
-        token_url = f"https://{settings.AUTH0_DOMAIN}/oauth/token"
-        refresh_payload = {
-            "grant_type": "refresh_token",
-            "client_id": settings.AUTH0_CLIENT_ID,
-            "client_secret": settings.AUTH0_CLIENT_SECRET,
-            "refresh_token": refresh_token
-        }
+        # Concurrent refreshes of the same token (tabs, token worker) share one exchange
+        new_tokens = await get_token_refresher().refresh(refresh_token, http_client)
+        get_userinfo_cache().invalidate(_token_subject(new_tokens["access_token"]))
 
-        token_response = requests.post(token_url, json=refresh_payload)
-        token_response.raise_for_status()
-        new_tokens = token_response.json()
+        # Set the new access token cookie and, with rotation, the new refresh token
+        set_token_cookies(response, new_tokens)
 
-        # Set new access token cookie
-        response.set_cookie(
-            "access_token",
-            new_tokens["access_token"],
-            httponly=True,
-            secure=True,
-            samesite="lax",
-            max_age=3600
+        return {"status": "success"}
+
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to refresh token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to refresh token: {str(e)}"
+        )
+
+
+async def _refresh_server_session(request: Request, http_client: httpx.AsyncClient):
+    """Refresh the Auth0 tokens held by the caller's server-side session"""
+    session = getattr(request.state, "session", None)
+    if session is None or not session.refresh_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No refresh token available"
         )
 
+    try:
+        session = await get_session_token_manager().refresh(session, http_client)
+        get_userinfo_cache().invalidate(session.sub)
         return {"status": "success"}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Failed to refresh token: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -257,10 +246,31 @@ async def refresh_token_endpoint(request: Request, response: Response):
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
     """
     Clear auth cookies and redirect to Auth0 logout
     """
+    subject = _token_subject(request.cookies.get("access_token"))
+    get_userinfo_cache().invalidate(subject)
+    get_user_provisioner().invalidate(subject)
+
+    session_id = request.cookies.get(settings.SESSION_COOKIE_NAME)
+    if session_id:
+        # Server-side revocation: the session ID stops working immediately
+        session = await get_session_store().get(session_id)
+        if session is not None:
+            get_userinfo_cache().invalidate(session.sub)
+            get_user_provisioner().invalidate(session.sub)
+        await get_session_store().revoke(session_id)
+        get_session_token_manager().untrack(session_id)
+        response.delete_cookie(
+            settings.SESSION_COOKIE_NAME,
+            httponly=True,
+            secure=True,
+            samesite="lax",
+            path="/"
+        )
+
     # Clear all auth-related cookies with proper flags
     response.delete_cookie(
         "access_token",
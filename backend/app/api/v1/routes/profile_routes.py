@@ -1,38 +1,83 @@
 # app/api/v1/routes/profile_routes.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Optional
 
-from ....middleware.auth0_middleware import get_current_user  # Adjusted import
-from ....auth.auth0 import protected_route  # Adjusted import
+from ....auth.auth0 import self_or_role
+from ....db.session import get_async_db, get_read_db
+from ....schemas.profile import UserProfile, UserProfileUpdate
+from ....services.user_service import UserService, profile_etag
+from ....utils.etag import if_match, if_none_match, not_modified, set_etag
 
 router = APIRouter()
 
-@router.get("/profiles/{user_id}", dependencies=protected_route())
+# Route guards, compiled to role masks once when the router is built
+can_read_profile = Depends(self_or_role(["admin"], "Not authorized to access this profile"))
+can_modify_profile = Depends(self_or_role(["admin"], "Not authorized to modify this profile"))
+
+@router.get("/profiles/{user_id}", dependencies=[can_read_profile], response_model=UserProfile)
 async def get_profile(
-    user_id: str,
-    current_user: Dict = Depends(get_current_user)
-) -> Dict:
+        user_id: str,
+        response: Response,
+        if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+        db: AsyncSession = Depends(get_read_db)
+):
     """
     Get user profile
+
+    Sends an ETag; a matching If-None-Match is answered with 304.
     """
-    if current_user["sub"] != user_id and "admin" not in current_user["roles"]:
+    user_service = UserService(db)
+    if if_none_match_header:
+        etag = await user_service.current_profile_etag(user_id)
+        if etag is not None and if_none_match(if_none_match_header, etag):
+            return not_modified(etag)
+
+    profile = await user_service.get_profile_by_auth0_id(user_id)
+    if profile is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this profile"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
         )
-    return {}  # TODO: Implement profile retrieval logic
+    set_etag(response, profile_etag(profile))
+    return profile
 
-@router.put("/profiles/{user_id}", dependencies=protected_route())
+@router.put("/profiles/{user_id}", dependencies=[can_modify_profile], response_model=UserProfile)
 async def update_profile(
-    user_id: str,
-    current_user: Dict = Depends(get_current_user)
-) -> Dict:
+        user_id: str,
+        changes: UserProfileUpdate,
+        response: Response,
+        if_match_header: Optional[str] = Header(None, alias="If-Match"),
+        db: AsyncSession = Depends(get_async_db)
+):
     """
-    Update user profile
+    Update user profile, creating it if the user has none
+
+    Send the ETag from a previous GET as If-Match to make the update conditional;
+    it fails with 412 when the profile changed in the meantime.
     """
-    if current_user["sub"] != user_id and "admin" not in current_user["roles"]:
+    user_service = UserService(db)
+    user = await user_service.get_by_auth0_id(user_id, load="full")
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    current_etag = profile_etag(user.profile) if user.profile is not None else None
+    if not if_match(if_match_header, current_etag):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Profile was modified, reload it and try again"
+        )
+
+    try:
+        profile = await user_service.save_profile(user, changes.model_dump(exclude_unset=True, mode="json"))
+    except StaleDataError:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to modify this profile"
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Profile was modified, reload it and try again"
         )
-    return {"message": "Profile updated successfully"}
\ No newline at end of file
+    set_etag(response, profile_etag(profile))
+    return profile
@@ -1,55 +1,216 @@
 # app/api/v1/routes/user_routes.py
-from typing import List, Dict
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from typing import AsyncIterator, Dict, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
-from ....middleware.auth0_middleware import get_current_user, get_auth0_middleware
-from ....auth.auth0 import has_role
+from ....auth.auth0 import has_role, self_or_role
+from ....core.security.roles import required_role_mask
+from ....core.security.user_auth import Principal
+from ....db.session import ReadSessionLocal, get_async_db, get_read_db
+from ....models.role import RoleType
+from ....schemas.user import User, UserUpdate, UserWithProfile
+from ....services.provisioning_service import get_user_provisioner
+from ....services.user_service import (
+    SEARCH_MIN_LENGTH, SortOrder, UserFilters, UserPage, UserSearch, UserService, UserSort, user_etag
+)
+from ....utils.etag import if_match, if_none_match, not_modified, set_etag
+from ....utils.pagination import InvalidCursorError
 
 router = APIRouter()
-auth0 = get_auth0_middleware()
 
-@router.get("/")
-@has_role(["admin"])  # Use as a decorator instead of dependencies parameter
-async def get_users() -> List[Dict]:
+# Route guards, compiled to role masks once when the router is built
+admin_only = Depends(has_role(["admin"]))
+can_read_user = Depends(self_or_role(["admin"], "Not authorized to access this user's data"))
+can_modify_user = Depends(self_or_role(["admin"], "Not authorized to modify this user's data"))
+
+ADMIN_MASK = required_role_mask(["admin"])
+# Account state only admins may change, even on their own user
+_ADMIN_FIELDS = {"is_active"}
+
+async def _stream_user_page(page: UserPage, filters: UserFilters, limit: int) -> AsyncIterator[bytes]:
+    """Serialize one page as JSON, one user at a time, while rows are still arriving."""
+    # The stream outlives the request's dependencies, so it owns its session
+    async with ReadSessionLocal() as db:
+        # One extra row tells whether another page follows
+        result = await UserService(db).stream_users(page, filters, limit=limit + 1, load="with_roles")
+        next_cursor = None
+        last_user = None
+        count = 0
+        try:
+            yield b'{"items":['
+            async for user in result:
+                if count == limit:
+                    # limit >= 1, so at least one row was yielded before this
+                    next_cursor = page.next_cursor(last_user)
+                    break
+                if count:
+                    yield b","
+                yield User.model_validate(user).model_dump_json().encode("utf-8")
+                last_user = user
+                count += 1
+        finally:
+            await result.close()
+        yield b'],"next_cursor":' + json.dumps(next_cursor).encode("utf-8") + b"}"
+
+
+@router.get("/", dependencies=[admin_only])
+async def get_users(
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        sort: UserSort = Query("created_at", description="Ignored when a cursor is given"),
+        order: SortOrder = Query("asc", description="Ignored when a cursor is given"),
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        role: Optional[RoleType] = None
+):
     """
     Get all user (admin only)
+
+    Keyset-paginated: returns ``{"items": [...], "next_cursor": ...}``. Pass
+    ``next_cursor`` back to get the following page; it is null on the last page.
     """
-    return []  # TODO: Implement user retrieval logic
+    try:
+        page = UserPage.from_cursor(cursor) if cursor else UserPage(sort=sort, order=order)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    filters = UserFilters(is_active=is_active, is_verified=is_verified, role=role)
+    return StreamingResponse(_stream_user_page(page, filters, limit), media_type="application/json")
 
-@router.get("/{user_id}")
+# Declared before /{user_id}, which would otherwise capture "search"
+@router.get("/search", dependencies=[admin_only])
+async def search_users(
+        q: str = Query(..., min_length=SEARCH_MIN_LENGTH, max_length=100,
+                       description="Matched anywhere in email, username, first or last name"),
+        limit: int = Query(10, ge=1, le=50),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+        role: Optional[RoleType] = None,
+        db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Search users (admin only)
+
+    Meant for search-as-you-type: exact and prefix matches on email or username
+    rank first, then name prefixes, then any other match. Returns
+    ``{"items": [...], "next_cursor": ...}`` like the listing.
+    """
+    filters = UserFilters(is_active=is_active, is_verified=is_verified, role=role)
+    search = UserSearch.from_query(q, filters)
+    if cursor:
+        # A cursor from a different q or different filters is rejected
+        try:
+            search = search.resume(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    # One extra row tells whether another page follows
+    matches = await UserService(db).search_users(search, limit=limit + 1)
+    next_cursor = None
+    if len(matches) > limit:
+        last_user, last_rank = matches[limit - 1]
+        next_cursor = search.next_cursor(last_rank, last_user)
+    return {
+        "items": [User.model_validate(user) for user, _ in matches[:limit]],
+        "next_cursor": next_cursor,
+    }
+
+@router.get("/{user_id}", dependencies=[can_read_user], response_model=UserWithProfile)
 async def get_user(
-    user_id: str,
-    current_user: Dict = Depends(get_current_user)
-) -> Dict:
+        user_id: str,
+        response: Response,
+        if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+        db: AsyncSession = Depends(get_read_db)
+):
     """
     Get user by ID
+
+    Sends an ETag. A request whose If-None-Match still matches is answered with
+    304 from the version columns alone, without loading or serializing the user.
     """
-    if current_user["sub"] != user_id and "admin" not in current_user["roles"]:
+    user_service = UserService(db)
+    if if_none_match_header:
+        etag = await user_service.current_user_etag(user_id)
+        if etag is not None and if_none_match(if_none_match_header, etag):
+            return not_modified(etag)
+
+    user = await user_service.get_by_auth0_id(user_id, load="full")
+    if user is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this user's data"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
-    return {}  # TODO: Implement user retrieval logic
+    set_etag(response, user_etag(user))
+    return user
 
-@router.put("/{user_id}")
+@router.put("/{user_id}", response_model=UserWithProfile)
 async def update_user(
-    user_id: str,
-    current_user: Dict = Depends(get_current_user)
-) -> Dict:
+        user_id: str,
+        changes: UserUpdate,
+        response: Response,
+        if_match_header: Optional[str] = Header(None, alias="If-Match"),
+        principal: Principal = can_modify_user,
+        db: AsyncSession = Depends(get_async_db)
+):
     """
     Update user information
+
+    Send the ETag from a previous GET as If-Match to make the update conditional;
+    it fails with 412 when the user changed in the meantime. email and
+    is_verified follow Auth0 and are rejected with 422.
     """
-    if current_user["sub"] != user_id and "admin" not in current_user["roles"]:
+    values = changes.model_dump(exclude_unset=True)
+    if _ADMIN_FIELDS & values.keys() and not principal.has_any_role(ADMIN_MASK):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to modify this user's data"
+            detail="Not authorized to change account status"
+        )
+
+    user_service = UserService(db)
+    user = await user_service.get_by_auth0_id(user_id, load="full")
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    if not if_match(if_match_header, user_etag(user)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="User was modified, reload it and try again"
+        )
+
+    try:
+        user = await user_service.update_user(user, values)
+    except StaleDataError:
+        # Changed between our read and write; same outcome as a failed If-Match
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="User was modified, reload it and try again"
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username already in use"
         )
-    return {"message": "User updated successfully"}
+    set_etag(response, user_etag(user))
+    return user
 
-@router.delete("/{user_id}")
-@has_role(["admin"])  # Use as a decorator instead of dependencies parameter
+@router.delete("/{user_id}", dependencies=[admin_only])
 async def delete_user(user_id: str) -> Dict:
     """
     Delete user (admin only)
     """
-    return {"message": "User deleted successfully"}
\ No newline at end of file
+    get_user_provisioner().invalidate(user_id)
+    return {"message": "User deleted successfully"}
@@ -1,134 +1,120 @@
 # auth/auth0.py
-from functools import lru_cache, wraps
-from typing import Dict, List, Optional, Callable
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import jwt
-from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-import requests
-from jwt.algorithms import RSAAlgorithm
+from fastapi import Depends, HTTPException, Request, status
 
 from ..config import get_settings
+from ..core.security.roles import required_role_mask
+from ..core.security.user_auth import Principal, get_principal, verify_access_token
+from ..services.activity_service import get_last_login_buffer
+from ..services.provisioning_service import get_user_provisioner
+from ..utils.http_client import get_http_client
+from .userinfo_cache import fetch_user_info, get_userinfo_cache
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Auth0 configuration
 AUTH0_DOMAIN = settings.AUTH0_DOMAIN
 AUTH0_AUDIENCE = settings.AUTH0_AUDIENCE
 ALGORITHMS = ["RS256"]
 
-# HTTP bearer token scheme
-security = HTTPBearer()
-
 
 class Auth0Handler:
-    def __init__(self):
-        self.jwks = None
-        self.jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-        self._load_jwks()
-
-    def _load_jwks(self) -> None:
-        """Load JSON Web Key Set from Auth0"""
-        try:
-            jwks_response = requests.get(self.jwks_url)
-            jwks_response.raise_for_status()
-            self.jwks = jwks_response.json()
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to load JWKS: {str(e)}"
-            )
+    async def verify_token(self, token: str) -> Dict:
+        """Verify a raw access token outside the request cycle"""
+        return await verify_access_token(token)
 
-    def _get_signing_key(self, kid: str) -> str:
-        """Get signing key from JWKS"""
-        if not self.jwks:
-            self._load_jwks()
-
-        for key in self.jwks.get("keys", []):
-            if key.get("kid") == kid:
-                return RSAAlgorithm.from_jwk(key)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Unable to find appropriate key"
-        )
 
-    def verify_token(self, token: str) -> Dict:
-        try:
-            unverified_headers = jwt.get_unverified_header(token)
-            kid = unverified_headers.get("kid")
-            if not kid:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="No key ID in token header"
-                )
-
-            signing_key = self._get_signing_key(kid)
-
-            payload = jwt.decode(
-                token,
-                signing_key,
-                algorithms=ALGORITHMS,
-                audience=AUTH0_AUDIENCE,
-                issuer=f"https://{AUTH0_DOMAIN}/"
-            )
+@lru_cache()
+def get_auth0_handler() -> Auth0Handler:
+    return Auth0Handler()
 
-            return payload
 
-        except ExpiredSignatureError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired"
-            )
-        except InvalidTokenError as e:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Invalid token claims: {str(e)}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Unable to verify token: {str(e)}"
-            )
+async def verify_token(request: Request) -> Dict:
+    """Return the claims verified once per request by AuthenticationMiddleware"""
+    return dict(get_principal(request).claims)
 
 
-@lru_cache()
-def get_auth0_handler() -> Auth0Handler:
-    return Auth0Handler()
+async def link_local_user(principal: Principal) -> Principal:
+    """``principal`` linked to its local user, provisioning the user on first sight.
+
+    Lookup failures leave the principal unlinked; the provisioner remembers
+    them briefly, so an unavailable database isn't asked on every request.
+    """
+    def fetch_profile():
+        return get_userinfo_cache().get(
+            principal.sub,
+            lambda: fetch_user_info(principal.token, get_http_client())
+        )
 
+    try:
+        principal = await get_user_provisioner().resolve(principal, fetch_profile)
+    except Exception as e:
+        logger.error(f"Failed to load local user: {str(e)}")
+        return principal
+    if principal.user_id is not None:
+        # Buffered; written in the background with other users' activity
+        get_last_login_buffer().record(principal.user_id)
+    return principal
 
-async def verify_token(
-        credentials: HTTPAuthorizationCredentials = Depends(security),
-        auth0_handler: Auth0Handler = Depends(get_auth0_handler)
-) -> Dict:
-    token = credentials.credentials
-    return auth0_handler.verify_token(token)
+
+async def get_local_principal(request: Request, principal: Principal = Depends(get_principal)) -> Principal:
+    """The caller with its local user id and locally assigned roles.
+
+    AuthenticationMiddleware links principals the provisioner has cached; for
+    the rest the lookup happens here, so only routes that need the local user
+    ever wait on the database for it.
+    """
+    if principal.user_id is None:
+        principal = await link_local_user(principal)
+        request.state.principal = principal
+    return principal
 
 
 def has_role(required_roles: List[str]):
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            token = await verify_token(
-                credentials=Depends(security),
-                auth0_handler=Depends(get_auth0_handler)
+    """Dependency factory requiring any of ``required_roles`` (or a role above them)"""
+    required_mask = required_role_mask(required_roles)
+
+    async def role_checker(principal: Principal = Depends(get_local_principal)) -> Principal:
+        if not principal.has_any_role(required_mask):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions"
             )
+        return principal
 
-            # Get roles from token payload
-            user_roles = token.get("https://your-namespace/roles", [])
+    return role_checker
 
-            # Check if user has any of the required roles
-            if not any(role in user_roles for role in required_roles):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Insufficient permissions"
-                )
 
-            return await func(*args, **kwargs)
+def has_permission(required_mask: int):
+    """Dependency factory requiring every permission bit in ``required_mask``"""
+    async def permission_checker(principal: Principal = Depends(get_local_principal)) -> Principal:
+        if not principal.has_permissions(required_mask):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions"
+            )
+        return principal
+
+    return permission_checker
+
 
-        return wrapper
+def self_or_role(required_roles: List[str], detail: str):
+    """Dependency factory allowing the `user_id` path owner, or any of ``required_roles``"""
+    required_mask = required_role_mask(required_roles)
+
+    async def owner_checker(user_id: str, principal: Principal = Depends(get_local_principal)) -> Principal:
+        if principal.sub != user_id and not principal.has_any_role(required_mask):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return principal
 
-    return decorator
+    return owner_checker
 
 
 # Example protected route decorator
@@ -137,4 +123,4 @@ def protected_route(roles: Optional[List[str]] = None):
     dependencies = [Depends(verify_token)]
     if roles:
         dependencies.append(Depends(has_role(roles)))
-    return dependencies
\ No newline at end of file
+    return dependencies
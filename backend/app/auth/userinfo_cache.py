@@ -0,0 +1,106 @@
+# backend/app/auth/userinfo_cache.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UserInfoFetcher = Callable[[], Awaitable[Dict]]
+
+
+async def fetch_user_info(access_token: str, http_client: httpx.AsyncClient):
+    userinfo_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await http_client.get(userinfo_url, headers=headers)
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail="Failed to fetch user info")
+    return response.json()
+
+
+class UserInfoCache:
+    """Bounded per-subject cache of Auth0 /userinfo responses.
+
+    Fresh entries are served directly. Entries past their TTL but inside the stale
+    window are still served, and a single background refresh is started for them.
+    Anything older is fetched inline.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, stale_ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def get(self, sub: str, fetch: UserInfoFetcher) -> Dict:
+        """Return userinfo for ``sub``, calling ``fetch`` only when the cache can't answer."""
+        entry = self._entries.get(sub)
+        if entry is not None:
+            fetched_at, user_info = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(sub)
+                if age >= self.ttl:
+                    self._revalidate(sub, fetch)
+                return dict(user_info)
+
+        user_info = await fetch()
+        self._store(sub, user_info)
+        return dict(user_info)
+
+    def invalidate(self, sub: Optional[str]) -> None:
+        """Drop the cached entry for ``sub`` and discard any refresh in flight."""
+        if not sub:
+            return
+        self._entries.pop(sub, None)
+        task = self._refreshing.pop(sub, None)
+        if task is not None:
+            task.cancel()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+
+    def _revalidate(self, sub: str, fetch: UserInfoFetcher) -> None:
+        if sub in self._refreshing:
+            return
+        task = asyncio.create_task(self._background_refresh(sub, fetch))
+        self._refreshing[sub] = task
+
+    async def _background_refresh(self, sub: str, fetch: UserInfoFetcher) -> None:
+        task = asyncio.current_task()
+        try:
+            user_info = await fetch()
+        except Exception as e:
+            logger.warning(f"Background userinfo refresh failed for {sub}: {str(e)}")
+            return
+        finally:
+            if self._refreshing.get(sub) is task:
+                del self._refreshing[sub]
+        self._store(sub, user_info)
+
+    def _store(self, sub: str, user_info: Dict) -> None:
+        self._entries[sub] = (time.monotonic(), dict(user_info))
+        self._entries.move_to_end(sub)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@lru_cache()
+def get_userinfo_cache() -> UserInfoCache:
+    return UserInfoCache(
+        max_entries=settings.USERINFO_CACHE_MAX_ENTRIES,
+        ttl=settings.USERINFO_CACHE_TTL_SECONDS,
+        stale_ttl=settings.USERINFO_CACHE_STALE_SECONDS,
+    )
@@ -0,0 +1,55 @@
+# backend/app/cli/import_users.py
+"""Bulk import users from a CSV or NDJSON file.
+
+Usage (from backend/): python -m app.cli.import_users users.csv [--format csv|ndjson]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from ..config import get_settings
+from ..db.session import async_engine
+from ..services.import_service import ImportFormatError, ImportReport, UserImporter
+
+settings = get_settings()
+
+READ_SIZE = 1024 * 1024
+
+
+async def _read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as upload:
+        while chunk := await asyncio.to_thread(upload.read, READ_SIZE):
+            yield chunk
+
+
+async def _run(path: Path, import_format: str, chunk_size: int) -> ImportReport:
+    try:
+        importer = UserImporter(async_engine, chunk_size=chunk_size, max_errors=settings.BULK_IMPORT_MAX_ERRORS)
+        return await importer.run(_read_file(path), import_format)
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV or NDJSON file")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=settings.BULK_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    import_format = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    try:
+        report = asyncio.run(_run(args.path, import_format, args.chunk_size))
+    except ImportFormatError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    print(json.dumps(report.as_dict(), indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
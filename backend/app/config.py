@@ -43,6 +43,67 @@ class Settings(pydantic_settings.BaseSettings):
     # Security Settings
     JWT_ALGORITHM: str = Field(default="RS256", description="JWT algorithm")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, description="JWT expiration time in minutes")
+    TOKEN_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of verified access tokens kept in memory"
+    )
+    TOKEN_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Longest time verified token claims are cached, capped by the token's exp"
+    )
+    TOKEN_REFRESH_RESULT_TTL_SECONDS: int = Field(
+        default=10,
+        ge=0,
+        description="Seconds a refresh result is reused for concurrent callers with the same refresh token"
+    )
+    TOKEN_REFRESH_FAILURE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        description="Seconds a refresh token rejected by Auth0 (4xx) fails again without another exchange"
+    )
+    TOKEN_REFRESH_LEAD_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        description="Refresh Auth0 access tokens this many seconds before they expire"
+    )
+    TOKEN_REFRESH_JITTER_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        description="Random extra lead added per session so scheduled refreshes don't all fire together"
+    )
+    TOKEN_REFRESH_RETRY_SECONDS: int = Field(
+        default=30,
+        ge=1,
+        description="Delay before a failed background refresh is retried"
+    )
+    TOKEN_REFRESH_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum background token refreshes running at once"
+    )
+    TOKEN_REFRESH_IDLE_SECONDS: int = Field(
+        default=3600,
+        ge=1,
+        description="Sessions idle this long stop being refreshed in the background"
+    )
+    JWT_VERIFY_MODE: Literal["inline", "thread", "process"] = Field(
+        default="inline",
+        description="Where cache-miss RS256 verifications run: on the event loop, a thread pool or a process pool"
+    )
+    JWT_VERIFY_WORKERS: int = Field(default=4, ge=1, description="Worker count for thread/process verification")
+    JWT_VERIFY_QUEUE_SIZE: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum verifications waiting for a worker before callers are held back"
+    )
+    JWT_VERIFY_BATCH_SIZE: int = Field(default=32, ge=1, description="Maximum tokens verified per worker call")
+    JWT_VERIFY_BATCH_WINDOW_MS: float = Field(
+        default=2.0,
+        ge=0,
+        description="How long the dispatcher waits to fill a verification batch"
+    )
     CORS_ORIGINS: str = Field(default="*", description="Allowed CORS origins")
     CORS_CREDENTIALS: bool = Field(default=True, description="Allow CORS credentials")
     CORS_METHODS: str = Field(default="*", description="Allowed CORS methods")
@@ -55,6 +116,74 @@ class Settings(pydantic_settings.BaseSettings):
     AUTH0_CLIENT_SECRET: str = Field(default=None, description="Auth0 application client secret")
     APP_URL: str = Field(default="http://localhost:8000", description="Backend API URL")
     FRONTEND_URL: str = Field(default="http://localhost:5173", description="Frontend application URL")
+    JWKS_CACHE_TTL_SECONDS: int = Field(
+        default=600,
+        ge=1,
+        description="JWKS cache lifetime in seconds when Auth0 sends no Cache-Control max-age"
+    )
+    JWKS_REFRESH_COOLDOWN_SECONDS: int = Field(
+        default=30,
+        ge=0,
+        description="Minimum seconds between JWKS refreshes triggered by unknown key IDs"
+    )
+    JWKS_REFRESH_INTERVAL_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        description="Longest interval between background JWKS refreshes, so rotated keys are picked up early"
+    )
+    USERINFO_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        description="Seconds a cached Auth0 /userinfo response is served without revalidation"
+    )
+    USERINFO_CACHE_STALE_SECONDS: int = Field(
+        default=600,
+        ge=0,
+        description="Extra seconds a stale /userinfo response is served while it refreshes in the background"
+    )
+    USERINFO_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=1, description="Maximum cached /userinfo responses")
+    LOCAL_USER_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        description="Seconds an Auth0 subject's local user id and roles are cached before the next lookup"
+    )
+    LOCAL_USER_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=1, description="Maximum cached local user lookups")
+    LOCAL_USER_FAILURE_TTL_SECONDS: int = Field(
+        default=5,
+        ge=0,
+        description="Seconds a failed local user lookup is remembered before the database is asked again"
+    )
+
+    # Session Settings
+    AUTH_MODE: Literal["token", "session"] = Field(
+        default="token",
+        description="Cookie auth flow: raw Auth0 access token cookie, or opaque server-side session ID"
+    )
+    SESSION_COOKIE_NAME: str = Field(default="session_id", description="Cookie holding the opaque session ID")
+    SESSION_STORE_BACKEND: Literal["memory", "database"] = Field(
+        default="memory",
+        description="Where sessions live: sharded in-process dict, or the auth_session table"
+    )
+    SESSION_TTL_SECONDS: int = Field(default=2592000, ge=60, description="Session lifetime in seconds")
+    SESSION_STORE_SHARDS: int = Field(default=16, ge=1, description="Shard count for the in-memory session store")
+    SESSION_SWEEP_INTERVAL_SECONDS: int = Field(default=300, ge=1, description="Seconds between expired-session sweeps")
+    SESSION_SWEEP_BATCH_SIZE: int = Field(default=1000, ge=1, description="Expired sessions deleted per sweep batch")
+
+    # Outbound HTTP Client Settings
+    HTTP_MAX_CONNECTIONS: int = Field(default=20, ge=1, description="Maximum open connections to Auth0")
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=10,
+        ge=0,
+        description="Maximum idle keep-alive connections kept in the pool"
+    )
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=30.0, ge=0, description="Idle connection lifetime")
+    HTTP_TIMEOUT_SECONDS: float = Field(default=10.0, gt=0, description="Read/write timeout for outbound requests")
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0, gt=0, description="Connect timeout for outbound requests")
+    HTTP_POOL_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        gt=0,
+        description="Maximum wait for a free pooled connection"
+    )
 
     # Database Settings
     DB_USER: str = Field(default=None, description="Database user")
@@ -62,6 +191,100 @@ class Settings(pydantic_settings.BaseSettings):
     DB_HOST: str = Field(default=None, description="Database host")
     DB_PORT: int = Field(default=None, description="Database port")
     DB_NAME: str = Field(default=None, description="Database name")
+    DB_READ_REPLICA_URLS: str = Field(
+        default="",
+        description="Comma-separated SQLAlchemy URLs of read replicas; empty sends all reads to the primary"
+    )
+    DB_REPLICA_RETRY_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long a failed read replica is skipped before it is tried again"
+    )
+    DB_POOL_SIZE: int = Field(default=5, ge=1, description="Connections kept open in each engine's pool")
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0, description="Extra connections opened when the pool is exhausted")
+    DB_POOL_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Maximum wait for a pooled connection before the checkout fails"
+    )
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        default=1800,
+        ge=-1,
+        description="Replace connections older than this many seconds; -1 disables recycling"
+    )
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = Field(
+        default="idle",
+        description="Liveness check on checkout: every time, only after the connection sat idle, or never"
+    )
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        description="Idle time after which an 'idle' pre-ping checks a connection before handing it out"
+    )
+    DB_ECHO: bool = Field(default=False, description="Log every SQL statement")
+    DB_QUERY_METRICS: bool = Field(
+        default=True,
+        description="Count statements and database time per request and report them in a Server-Timing header"
+    )
+    DB_REPEATED_QUERY_MODE: Literal["off", "warn", "raise"] = Field(
+        default="off",
+        description=(
+            "N+1 detection for development and tests: when a request runs one statement "
+            "DB_REPEATED_QUERY_THRESHOLD times, do nothing, log a warning, or fail the request"
+        )
+    )
+    DB_REPEATED_QUERY_THRESHOLD: int = Field(
+        default=10,
+        ge=2,
+        description="Executions of the same statement within one request that count as an N+1"
+    )
+    DB_SCHEMA_INIT: Literal["auto", "create_all", "skip"] = Field(
+        default="auto",
+        description=(
+            "Schema handling at startup: 'auto' runs create_all only when alembic_version is not at the "
+            "migration head, 'create_all' always runs it, 'skip' leaves the schema to Alembic"
+        )
+    )
+    DB_MIGRATIONS_PATH: str = Field(
+        default=str(Path(__file__).parents[2] / "migrations"),
+        description="Alembic script directory, read once at startup to find the head revision"
+    )
+
+    # Bulk Import/Export Settings
+    BULK_IMPORT_CHUNK_SIZE: int = Field(
+        default=5000,
+        ge=1,
+        description="Rows validated, COPYed and merged per transaction during a bulk user import"
+    )
+    BULK_IMPORT_MAX_ERRORS: int = Field(
+        default=1000,
+        ge=0,
+        description="Row errors listed in a bulk import report; further errors are only counted"
+    )
+    BULK_EXPORT_YIELD_PER: int = Field(
+        default=1000,
+        ge=1,
+        description="Rows fetched per round trip from the server-side cursor during a user export"
+    )
+
+    # Role Catalog Settings
+    ROLE_CATALOG_RECONNECT_SECONDS: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds before the role catalog's change listener reconnects after losing its connection"
+    )
+
+    # Activity Tracking Settings
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=15.0,
+        gt=0,
+        description="Seconds between writes of buffered last_login timestamps"
+    )
+    LAST_LOGIN_FLUSH_THRESHOLD: int = Field(
+        default=1000,
+        ge=1,
+        description="Buffered users that trigger an early last_login write"
+    )
 
     @computed_field
     @property
@@ -69,6 +292,10 @@ class Settings(pydantic_settings.BaseSettings):
         """Construct database URL from components."""
         return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def read_replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DB_READ_REPLICA_URLS.split(",") if url.strip()]
+
     # Model config using SettingsConfigDict
     model_config = pydantic_settings.SettingsConfigDict(
         env_file=str(Path(__file__).parents[2] / ".env"),
@@ -0,0 +1,204 @@
+# backend/app/core/security/jwks.py
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, UTC
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import InvalidKeyError
+
+from ...config import get_settings
+from ...utils.http_client import get_http_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Upper bound on remembered unknown key IDs, so garbage `kid` headers can't grow it forever
+_MAX_UNKNOWN_KIDS = 1024
+
+
+class JWKSUnavailableError(Exception):
+    """Raised when the JWKS cannot be fetched and no usable cached key exists."""
+
+
+class JWKSKeyProvider:
+    """Process-wide cache of parsed JWKS signing keys, indexed by key ID.
+
+    Keys are parsed once per refresh and served from a dict. Refreshes are
+    single-flight: concurrent callers share one in-flight fetch. Unknown key IDs
+    trigger a refresh at most once per cooldown and are negatively cached in
+    between, and stale keys keep being served while Auth0 is unreachable.
+
+    ``start()`` loads the keys up front and keeps them refreshed from a background
+    task, ahead of expiry and at least every ``refresh_interval`` seconds, so rotated
+    keys are usually known before the first token signed with them arrives.
+    """
+
+    def __init__(
+            self,
+            jwks_url: str,
+            default_ttl: int,
+            refresh_cooldown: int,
+            refresh_interval: int,
+            http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.jwks_url = jwks_url
+        self.http_client = http_client
+        self.default_ttl = default_ttl
+        self.refresh_cooldown = refresh_cooldown
+        self.refresh_interval = refresh_interval
+        self.last_refreshed_at: Optional[datetime] = None
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_attempt: Optional[float] = None
+        self._unknown_kids: Dict[str, float] = {}
+        self._inflight: Optional[asyncio.Task] = None
+        self._scheduler: Optional[asyncio.Task] = None
+
+    @property
+    def key_ids(self) -> Tuple[str, ...]:
+        return tuple(self._keys)
+
+    async def start(self) -> None:
+        """Load the key set and start the background refresh task."""
+        if self._scheduler is not None:
+            return
+        try:
+            await self.refresh()
+        except JWKSUnavailableError as e:
+            # Not fatal: the scheduler and the request path keep retrying
+            logger.error(f"Initial JWKS load failed: {str(e)}")
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self) -> None:
+        if self._scheduler is None:
+            return
+        self._scheduler.cancel()
+        try:
+            await self._scheduler
+        except asyncio.CancelledError:
+            pass
+        self._scheduler = None
+
+    async def get_signing_key(self, kid: str) -> Optional[Any]:
+        """Return the parsed public key for ``kid``, or None if Auth0 doesn't publish it."""
+        now = time.monotonic()
+        key = self._keys.get(kid)
+
+        if key is not None:
+            if now < self._expires_at or not self._can_refresh(now):
+                return key
+            try:
+                await self.refresh()
+            except JWKSUnavailableError as e:
+                logger.warning(f"Serving stale JWKS key {kid}: {str(e)}")
+                return key
+            key = self._keys.get(kid)
+            if key is None:
+                self._remember_unknown(kid)
+            return key
+
+        retry_at = self._unknown_kids.get(kid)
+        if retry_at is not None and now < retry_at:
+            return None
+        if self._can_refresh(now):
+            await self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._remember_unknown(kid)
+        return key
+
+    async def refresh(self) -> None:
+        """Refresh the key set, joining an already running refresh if there is one."""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._refresh())
+            self._inflight.add_done_callback(self._refresh_done)
+        # Shield so a cancelled request doesn't cancel the fetch other callers are waiting on
+        await asyncio.shield(self._inflight)
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            try:
+                await self.refresh()
+            except JWKSUnavailableError as e:
+                logger.warning(f"Scheduled JWKS refresh failed: {str(e)}")
+
+    def _next_refresh_delay(self) -> float:
+        if not self._keys:
+            return max(self.refresh_cooldown, 1)
+        # Refresh shortly before the cache expires, but never wait longer than the interval
+        until_expiry = (self._expires_at - time.monotonic()) * 0.9
+        return max(min(until_expiry, self.refresh_interval), self.refresh_cooldown, 1)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._inflight = None
+        if not task.cancelled():
+            # Mark the exception retrieved even when every waiter was cancelled
+            task.exception()
+
+    async def _refresh(self) -> None:
+        self._last_attempt = time.monotonic()
+        try:
+            jwks, ttl = await self._fetch()
+        except (httpx.HTTPError, ValueError) as e:
+            raise JWKSUnavailableError(f"Failed to load JWKS: {str(e)}") from e
+
+        keys: Dict[str, Any] = {}
+        for jwk in jwks.get("keys", []):
+            kid = jwk.get("kid")
+            if not kid or jwk.get("kty") != "RSA":
+                continue
+            try:
+                keys[kid] = RSAAlgorithm.from_jwk(jwk)
+            except InvalidKeyError as e:
+                logger.warning(f"Skipping unusable JWKS key {kid}: {str(e)}")
+
+        self._keys = keys
+        self._expires_at = time.monotonic() + ttl
+        self.last_refreshed_at = datetime.now(UTC)
+        self._unknown_kids = {
+            kid: retry_at for kid, retry_at in self._unknown_kids.items() if kid not in keys
+        }
+        logger.info(f"Loaded {len(keys)} JWKS signing keys (ttl={ttl}s)")
+
+    async def _fetch(self) -> Tuple[Dict, int]:
+        http_client = self.http_client or get_http_client()
+        response = await http_client.get(self.jwks_url)
+        response.raise_for_status()
+        return response.json(), self._ttl_from_headers(response.headers)
+
+    def _ttl_from_headers(self, headers) -> int:
+        """Derive the cache lifetime from Cache-Control, falling back to the configured TTL."""
+        cache_control = headers.get("Cache-Control", "")
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return max(int(match.group(1)), self.refresh_cooldown)
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return self.refresh_cooldown
+        return self.default_ttl
+
+    def _can_refresh(self, now: float) -> bool:
+        return self._last_attempt is None or now - self._last_attempt >= self.refresh_cooldown
+
+    def _remember_unknown(self, kid: str) -> None:
+        if len(self._unknown_kids) >= _MAX_UNKNOWN_KIDS:
+            self._unknown_kids.clear()
+        self._unknown_kids[kid] = time.monotonic() + self.refresh_cooldown
+
+
+@lru_cache()
+def get_jwks_provider() -> JWKSKeyProvider:
+    return JWKSKeyProvider(
+        jwks_url=f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json",
+        default_ttl=settings.JWKS_CACHE_TTL_SECONDS,
+        refresh_cooldown=settings.JWKS_REFRESH_COOLDOWN_SECONDS,
+        refresh_interval=settings.JWKS_REFRESH_INTERVAL_SECONDS,
+    )
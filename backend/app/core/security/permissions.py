@@ -0,0 +1,38 @@
+# backend/app/core/security/permissions.py
+from enum import IntFlag
+from typing import Dict, Iterable
+
+
+class Permission(IntFlag):
+    """Individual permissions, one bit each."""
+    NONE = 0
+    READ_OWN_PROFILE = 1 << 0
+    UPDATE_OWN_PROFILE = 1 << 1
+    READ_USERS = 1 << 2
+    UPDATE_USERS = 1 << 3
+    DELETE_USERS = 1 << 4
+    MANAGE_ROLES = 1 << 5
+
+
+# Auth0 RBAC permission strings, as they appear in the token's `permissions` claim
+PERMISSION_CLAIMS: Dict[str, Permission] = {
+    "read:profile": Permission.READ_OWN_PROFILE,
+    "update:profile": Permission.UPDATE_OWN_PROFILE,
+    "read:users": Permission.READ_USERS,
+    "update:users": Permission.UPDATE_USERS,
+    "delete:users": Permission.DELETE_USERS,
+    "manage:roles": Permission.MANAGE_ROLES,
+}
+
+
+def permission_mask(names: Iterable[str]) -> int:
+    """OR together the bits for known permission strings; unknown strings are ignored."""
+    mask = 0
+    for name in names:
+        mask |= PERMISSION_CLAIMS.get(name.lower(), 0)
+    return mask
+
+
+def has_permissions(mask: int, required: int) -> bool:
+    """True when ``mask`` contains every bit of ``required``."""
+    return mask & required == required
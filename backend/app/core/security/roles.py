@@ -0,0 +1,75 @@
+# backend/app/core/security/roles.py
+from enum import IntFlag
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+from ...models.role import RoleType
+from .permissions import Permission, permission_mask
+
+
+class RoleFlag(IntFlag):
+    """Role bits; a principal's role mask already includes every role it inherits."""
+    NONE = 0
+    USER = 1 << 0
+    MODERATOR = 1 << 1
+    ADMIN = 1 << 2
+
+
+# ADMIN ⊇ MODERATOR ⊇ USER
+ROLE_HIERARCHY: Dict[RoleType, RoleFlag] = {
+    RoleType.USER: RoleFlag.USER,
+    RoleType.MODERATOR: RoleFlag.MODERATOR | RoleFlag.USER,
+    RoleType.ADMIN: RoleFlag.ADMIN | RoleFlag.MODERATOR | RoleFlag.USER,
+}
+
+_USER_PERMISSIONS = Permission.READ_OWN_PROFILE | Permission.UPDATE_OWN_PROFILE
+_MODERATOR_PERMISSIONS = _USER_PERMISSIONS | Permission.READ_USERS
+_ADMIN_PERMISSIONS = (
+    _MODERATOR_PERMISSIONS
+    | Permission.UPDATE_USERS
+    | Permission.DELETE_USERS
+    | Permission.MANAGE_ROLES
+)
+
+ROLE_PERMISSIONS: Dict[RoleType, Permission] = {
+    RoleType.USER: _USER_PERMISSIONS,
+    RoleType.MODERATOR: _MODERATOR_PERMISSIONS,
+    RoleType.ADMIN: _ADMIN_PERMISSIONS,
+}
+
+# Role names as they may appear in the token's `permissions` claim, e.g. "admin"
+_ROLE_NAMES: Dict[str, RoleType] = {role.value.lower(): role for role in RoleType}
+
+
+def role_bit(role: RoleType) -> RoleFlag:
+    """The single bit identifying ``role``, without inherited roles."""
+    return RoleFlag[role.name]
+
+
+def required_role_mask(names: Iterable[str]) -> int:
+    """Mask matching any of the named roles; compile once when declaring a route guard."""
+    mask = 0
+    for name in names:
+        role = _ROLE_NAMES.get(name.lower())
+        if role is None:
+            raise ValueError(f"Unknown role: {name}")
+        mask |= role_bit(role)
+    return mask
+
+
+@lru_cache(maxsize=1024)
+def resolve_masks(claims: Tuple[str, ...]) -> Tuple[int, int]:
+    """Return ``(role_mask, permission_mask)`` for a token's `permissions` claim.
+
+    Role names expand through the hierarchy and grant their role's permissions;
+    other strings map to individual permission bits. Memoized on the claim
+    contents, so each distinct claim set is compiled once.
+    """
+    roles = 0
+    permissions = permission_mask(claims)
+    for name in claims:
+        role = _ROLE_NAMES.get(name.lower())
+        if role is not None:
+            roles |= ROLE_HIERARCHY[role]
+            permissions |= ROLE_PERMISSIONS[role]
+    return roles, permissions
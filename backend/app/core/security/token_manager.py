@@ -0,0 +1,269 @@
+# backend/app/core/security/token_manager.py
+import asyncio
+import hashlib
+import heapq
+import logging
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from ...config import get_settings
+from ...utils.http_client import get_http_client
+from .token_store import SessionRecord, get_session_store
+from .user_auth import verify_access_token
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class Auth0TokenRefresher:
+    """Exchanges Auth0 refresh tokens, coalescing concurrent exchanges of the same token.
+
+    Callers presenting the same refresh token while an exchange is in flight share
+    its result, and for ``result_ttl`` seconds afterwards they get the same new
+    tokens instead of starting another exchange. This matters under refresh token
+    rotation, where a second exchange of an already-rotated token would fail.
+
+    A token Auth0 rejects with a 4xx (revoked, expired or already rotated) is
+    remembered for ``failure_ttl`` seconds and fails again without a round trip,
+    so a client sending a dead refresh token doesn't cost an exchange per request.
+    """
+
+    def __init__(self, result_ttl: int, failure_ttl: int = 0):
+        self.result_ttl = result_ttl
+        self.failure_ttl = failure_ttl
+        self.token_url = f"https://{settings.AUTH0_DOMAIN}/oauth/token"
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+        self._results: Dict[bytes, Tuple[float, Dict]] = {}
+        self._failures: Dict[bytes, Tuple[float, httpx.HTTPStatusError]] = {}
+
+    @staticmethod
+    def _key(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+    async def refresh(self, refresh_token: str, http_client: httpx.AsyncClient) -> Dict:
+        """Return new tokens for ``refresh_token``; raises httpx.HTTPError on failure."""
+        key = self._key(refresh_token)
+        now = time.monotonic()
+        self._purge(now)
+
+        cached = self._results.get(key)
+        if cached is not None:
+            return dict(cached[1])
+        failed = self._failures.get(key)
+        if failed is not None:
+            error = failed[1]
+            raise httpx.HTTPStatusError(str(error), request=error.request, response=error.response)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._exchange(refresh_token, http_client))
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._inflight[key] = task
+        # Shield so one cancelled caller doesn't abort the exchange others are waiting on
+        return dict(await asyncio.shield(task))
+
+    async def _exchange(self, refresh_token: str, http_client: httpx.AsyncClient) -> Dict:
+        refresh_payload = {
+            "grant_type": "refresh_token",
+            "client_id": settings.AUTH0_CLIENT_ID,
+            "client_secret": settings.AUTH0_CLIENT_SECRET,
+            "refresh_token": refresh_token
+        }
+        token_response = await http_client.post(self.token_url, json=refresh_payload)
+        token_response.raise_for_status()
+        return token_response.json()
+
+    def _finish(self, key: bytes, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # Only Auth0's verdict on the token is remembered; network errors and 5xx are retried
+            if (
+                self.failure_ttl > 0
+                and isinstance(error, httpx.HTTPStatusError)
+                and error.response.is_client_error
+            ):
+                self._failures[key] = (time.monotonic() + self.failure_ttl, error)
+            return
+        if self.result_ttl > 0:
+            self._results[key] = (time.monotonic() + self.result_ttl, task.result())
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (expires_at, _) in self._results.items() if expires_at <= now]
+        for key in expired:
+            del self._results[key]
+        expired = [key for key, (expires_at, _) in self._failures.items() if expires_at <= now]
+        for key in expired:
+            del self._failures[key]
+
+
+@lru_cache()
+def get_token_refresher() -> Auth0TokenRefresher:
+    return Auth0TokenRefresher(
+        result_ttl=settings.TOKEN_REFRESH_RESULT_TTL_SECONDS,
+        failure_ttl=settings.TOKEN_REFRESH_FAILURE_TTL_SECONDS
+    )
+
+
+async def refresh_session(record: SessionRecord, http_client: httpx.AsyncClient) -> SessionRecord:
+    """Exchange a session's refresh token and store the new Auth0 tokens on it."""
+    new_tokens = await get_token_refresher().refresh(record.refresh_token, http_client)
+    claims = await verify_access_token(new_tokens["access_token"])
+    return await get_session_store().update_tokens(
+        record,
+        claims,
+        new_tokens["access_token"],
+        new_tokens.get("refresh_token")
+    )
+
+
+class SessionTokenManager:
+    """Keeps the Auth0 access tokens behind server-side sessions fresh.
+
+    Each session seen by the app is scheduled for refresh ``lead`` seconds, plus a
+    random share of ``jitter``, before its access token expires, so sessions that
+    logged in together don't all refresh together. A background task pops due
+    sessions off a heap and refreshes at most ``concurrency`` of them at once.
+    Sessions idle for longer than ``idle_timeout`` are dropped from the schedule;
+    when they come back, ensure_fresh refreshes them inline before the request
+    reaches a route.
+    """
+
+    def __init__(self, lead: int, jitter: int, retry_interval: int, concurrency: int, idle_timeout: int):
+        self.lead = lead
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.idle_timeout = idle_timeout
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._scheduler: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def needs_refresh(self, record: SessionRecord) -> bool:
+        return bool(record.refresh_token) and record.access_token_expires_at - time.time() <= self.lead
+
+    def track(self, record: SessionRecord) -> None:
+        """Note activity on a session and schedule its refresh if it isn't scheduled yet."""
+        if not record.refresh_token:
+            # Never scheduled, so nothing would ever remove its entries
+            return
+        self._last_seen[record.session_id] = time.monotonic()
+        if record.session_id not in self._due:
+            self._schedule(record.session_id, self._refresh_at(record))
+
+    def untrack(self, session_id: str) -> None:
+        # Heap entries are dropped lazily once they no longer match ``_due``
+        self._due.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+
+    async def refresh(self, record: SessionRecord, http_client: httpx.AsyncClient) -> SessionRecord:
+        """Refresh a session's tokens now and reschedule its next refresh."""
+        refreshed = await refresh_session(record, http_client)
+        self._last_seen[refreshed.session_id] = time.monotonic()
+        self._schedule(refreshed.session_id, self._refresh_at(refreshed))
+        return refreshed
+
+    async def ensure_fresh(self, record: SessionRecord, http_client: httpx.AsyncClient) -> SessionRecord:
+        """Return ``record`` with an access token that isn't about to expire."""
+        if not self.needs_refresh(record):
+            return record
+        return await self.refresh(record, http_client)
+
+    def _refresh_at(self, record: SessionRecord) -> float:
+        return record.access_token_expires_at - self.lead - random.uniform(0, self.jitter)
+
+    def _schedule(self, session_id: str, when: float) -> None:
+        self._due[session_id] = when
+        heapq.heappush(self._heap, (when, session_id))
+        if self._heap[0][1] == session_id:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self) -> None:
+        tasks = list(self._running)
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._scheduler = None
+        self._running.clear()
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            when, session_id = heapq.heappop(self._heap)
+            if self._due.get(session_id) != when:
+                continue
+            del self._due[session_id]
+
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._refresh_due(session_id))
+            self._running.add(task)
+            task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._semaphore.release()
+
+    async def _refresh_due(self, session_id: str) -> None:
+        last_seen = self._last_seen.get(session_id)
+        if last_seen is None or time.monotonic() - last_seen > self.idle_timeout:
+            self._last_seen.pop(session_id, None)
+            return
+        if session_id in self._due:
+            # Rescheduled by an inline refresh while this one was waiting
+            return
+
+        try:
+            record = await get_session_store().get(session_id)
+            if record is None or not record.refresh_token:
+                self.untrack(session_id)
+                return
+            if not self.needs_refresh(record):
+                # Another worker already refreshed it
+                self._schedule(session_id, self._refresh_at(record))
+                return
+            await self.refresh(record, get_http_client())
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500:
+                # Refresh token revoked or expired; retrying won't help
+                logger.warning(f"Dropping background refresh for a session: {str(e)}")
+                self.untrack(session_id)
+            else:
+                logger.error(f"Background token refresh failed: {str(e)}")
+                self._schedule(session_id, time.time() + self.retry_interval)
+        except Exception as e:
+            logger.error(f"Background token refresh failed: {str(e)}")
+            self._schedule(session_id, time.time() + self.retry_interval)
+
+
+@lru_cache()
+def get_session_token_manager() -> SessionTokenManager:
+    return SessionTokenManager(
+        lead=settings.TOKEN_REFRESH_LEAD_SECONDS,
+        jitter=settings.TOKEN_REFRESH_JITTER_SECONDS,
+        retry_interval=settings.TOKEN_REFRESH_RETRY_SECONDS,
+        concurrency=settings.TOKEN_REFRESH_CONCURRENCY,
+        idle_timeout=settings.TOKEN_REFRESH_IDLE_SECONDS,
+    )
@@ -0,0 +1,356 @@
+# backend/app/core/security/token_store.py
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime, UTC
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from ...config import get_settings
+from ...db.session import AsyncSessionLocal
+from ...models.session import AuthSession
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of decoded claims for access tokens that already passed verification.
+
+    Entries are keyed by a SHA-256 digest of the raw token, so the token itself is
+    never held in memory, and expire at the earlier of the token's ``exp`` claim and
+    the configured TTL. Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Return a copy of the cached claims, or None on a miss or expired entry."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict) -> None:
+        """Cache verified claims until the token expires or the TTL elapses."""
+        now = time.time()
+        expires_at = now + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache()
+def get_verified_token_cache() -> VerifiedTokenCache:
+    return VerifiedTokenCache(
+        max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+        ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+    )
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """Server-side state behind an opaque session cookie. Times are epoch seconds."""
+    session_id: str
+    sub: str
+    claims: Dict
+    access_token: str
+    refresh_token: Optional[str]
+    access_token_expires_at: float
+    expires_at: float
+
+
+def _hash_session_id(session_id: str) -> str:
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+
+class SessionStore(ABC):
+    """Pluggable store for opaque login sessions.
+
+    Session IDs are 256-bit random values. Backends key records by the ID's SHA-256
+    hash, so a leaked store can't be replayed as cookies.
+    """
+
+    def __init__(self, ttl: int, sweep_interval: int):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def create(
+            self,
+            claims: Dict,
+            access_token: str,
+            refresh_token: Optional[str]
+    ) -> SessionRecord:
+        """Start a session for verified ``claims`` and return it, including the new ID.
+
+        Without a refresh token the session can't outlive its access token, so
+        its lifetime is capped at the token's expiry.
+        """
+        access_token_expires_at = float(claims.get("exp", time.time()))
+        expires_at = time.time() + self.ttl
+        if not refresh_token:
+            expires_at = min(expires_at, access_token_expires_at)
+        record = SessionRecord(
+            session_id=secrets.token_urlsafe(32),
+            sub=claims.get("sub"),
+            claims=dict(claims),
+            access_token=access_token,
+            refresh_token=refresh_token,
+            access_token_expires_at=access_token_expires_at,
+            expires_at=expires_at,
+        )
+        await self._save(record)
+        return record
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Return the live session for ``session_id``, or None if unknown or expired."""
+        record = await self._load(_hash_session_id(session_id))
+        if record is None or record.expires_at <= time.time():
+            return None
+        return replace(record, session_id=session_id)
+
+    async def update_tokens(
+            self,
+            record: SessionRecord,
+            claims: Dict,
+            access_token: str,
+            refresh_token: Optional[str]
+    ) -> SessionRecord:
+        """Store refreshed Auth0 tokens on an existing session."""
+        updated = replace(
+            record,
+            claims=dict(claims),
+            access_token=access_token,
+            refresh_token=refresh_token or record.refresh_token,
+            access_token_expires_at=float(claims.get("exp", time.time())),
+        )
+        await self._save(updated)
+        return updated
+
+    async def revoke(self, session_id: str) -> None:
+        await self._delete(_hash_session_id(session_id))
+
+    async def start(self) -> None:
+        """Start the periodic expiry sweep."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._run_sweeper())
+
+    async def stop(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await self.sweep_expired()
+                if removed:
+                    logger.info(f"Removed {removed} expired sessions")
+            except Exception as e:
+                logger.error(f"Session sweep failed: {str(e)}")
+
+    @abstractmethod
+    async def _save(self, record: SessionRecord) -> None: ...
+
+    @abstractmethod
+    async def _load(self, session_hash: str) -> Optional[SessionRecord]: ...
+
+    @abstractmethod
+    async def _delete(self, session_hash: str) -> None: ...
+
+    @abstractmethod
+    async def sweep_expired(self) -> int:
+        """Delete expired sessions and return how many were removed."""
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store split into shards.
+
+    A sweep walks one shard at a time and yields to the event loop in between,
+    so expiring a large number of sessions never stalls request handling.
+    """
+
+    def __init__(self, ttl: int, sweep_interval: int, shards: int):
+        super().__init__(ttl, sweep_interval)
+        self._shards: List[Dict[str, SessionRecord]] = [{} for _ in range(shards)]
+
+    def _shard(self, session_hash: str) -> Dict[str, SessionRecord]:
+        return self._shards[int(session_hash[:8], 16) % len(self._shards)]
+
+    async def _save(self, record: SessionRecord) -> None:
+        session_hash = _hash_session_id(record.session_id)
+        self._shard(session_hash)[session_hash] = replace(record, session_id="")
+
+    async def _load(self, session_hash: str) -> Optional[SessionRecord]:
+        return self._shard(session_hash).get(session_hash)
+
+    async def _delete(self, session_hash: str) -> None:
+        self._shard(session_hash).pop(session_hash, None)
+
+    async def sweep_expired(self) -> int:
+        removed = 0
+        for shard in self._shards:
+            now = time.time()
+            expired = [key for key, record in shard.items() if record.expires_at <= now]
+            for key in expired:
+                del shard[key]
+            removed += len(expired)
+            await asyncio.sleep(0)
+        return removed
+
+
+def _as_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC)
+
+
+def _as_timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class DatabaseSessionStore(SessionStore):
+    """Session store backed by the ``auth_session`` table (PostgreSQL or SQLite).
+
+    Uses the async engine, so lookups don't tie up a threadpool worker. Expired rows
+    are deleted in batches of ``sweep_batch_size``, so one sweep never holds long
+    row locks.
+    """
+
+    def __init__(self, ttl: int, sweep_interval: int, sweep_batch_size: int):
+        super().__init__(ttl, sweep_interval)
+        self.sweep_batch_size = sweep_batch_size
+
+    async def _save(self, record: SessionRecord) -> None:
+        session_hash = _hash_session_id(record.session_id)
+        async with AsyncSessionLocal() as db:
+            row = (await db.scalars(
+                select(AuthSession).where(AuthSession.session_hash == session_hash)
+            )).first()
+            if row is None:
+                row = AuthSession(session_hash=session_hash)
+                db.add(row)
+            row.sub = record.sub
+            row.claims = record.claims
+            row.access_token = record.access_token
+            row.refresh_token = record.refresh_token
+            row.access_token_expires_at = _as_datetime(record.access_token_expires_at)
+            row.expires_at = _as_datetime(record.expires_at)
+            await db.commit()
+
+    async def _load(self, session_hash: str) -> Optional[SessionRecord]:
+        async with AsyncSessionLocal() as db:
+            row = (await db.scalars(
+                select(AuthSession).where(AuthSession.session_hash == session_hash)
+            )).first()
+            if row is None:
+                return None
+            return SessionRecord(
+                session_id="",
+                sub=row.sub,
+                claims=row.claims,
+                access_token=row.access_token,
+                refresh_token=row.refresh_token,
+                access_token_expires_at=_as_timestamp(row.access_token_expires_at),
+                expires_at=_as_timestamp(row.expires_at),
+            )
+
+    async def _delete(self, session_hash: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(AuthSession).where(AuthSession.session_hash == session_hash))
+            await db.commit()
+
+    async def sweep_expired(self) -> int:
+        removed = 0
+        while True:
+            batch = await self._sweep_batch()
+            removed += batch
+            if batch < self.sweep_batch_size:
+                return removed
+
+    async def _sweep_batch(self) -> int:
+        async with AsyncSessionLocal() as db:
+            expired_ids = (
+                select(AuthSession.id)
+                .where(AuthSession.expires_at <= datetime.now(UTC))
+                .limit(self.sweep_batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(AuthSession).where(AuthSession.id.in_(expired_ids)))
+            await db.commit()
+            return result.rowcount
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    if settings.SESSION_STORE_BACKEND == "database":
+        return DatabaseSessionStore(
+            ttl=settings.SESSION_TTL_SECONDS,
+            sweep_interval=settings.SESSION_SWEEP_INTERVAL_SECONDS,
+            sweep_batch_size=settings.SESSION_SWEEP_BATCH_SIZE,
+        )
+    return InMemorySessionStore(
+        ttl=settings.SESSION_TTL_SECONDS,
+        sweep_interval=settings.SESSION_SWEEP_INTERVAL_SECONDS,
+        shards=settings.SESSION_STORE_SHARDS,
+    )
@@ -0,0 +1,204 @@
+# backend/app/core/security/token_verifier.py
+import asyncio
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from ...config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ["RS256"]
+
+# Parsed keys inside each worker process, keyed by PEM; JWKS only ever holds a few keys
+_worker_keys: Dict[bytes, Any] = {}
+_MAX_WORKER_KEYS = 64
+
+
+def _decode_batch(
+        jobs: List[Tuple[str, Any]],
+        audience: str,
+        issuer: str
+) -> List[Tuple[bool, Any]]:
+    """Verify a batch of tokens in a worker; returns (ok, claims-or-exception) per token."""
+    results: List[Tuple[bool, Any]] = []
+    for token, key in jobs:
+        if isinstance(key, bytes):
+            parsed = _worker_keys.get(key)
+            if parsed is None:
+                if len(_worker_keys) >= _MAX_WORKER_KEYS:
+                    _worker_keys.clear()
+                parsed = _worker_keys[key] = serialization.load_pem_public_key(key)
+            key = parsed
+        try:
+            payload = jwt.decode(token, key, algorithms=ALGORITHMS, audience=audience, issuer=issuer)
+            results.append((True, payload))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class TokenVerifier:
+    """Runs RS256 signature verification inline, or in a thread or process pool.
+
+    In pool modes, requests go through a bounded queue. When the queue fills,
+    callers wait, which applies backpressure. A dispatcher drains the queue into
+    micro-batches of up to ``batch_size`` tokens, collected for at most
+    ``batch_window`` seconds, so a burst of new sessions costs one executor
+    round trip per batch rather than per token.
+    """
+
+    def __init__(
+            self,
+            mode: str,
+            max_workers: int,
+            queue_size: int,
+            batch_size: int,
+            batch_window: float
+    ):
+        self.mode = mode
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.audience = settings.AUTH0_AUDIENCE
+        self.issuer = f"https://{settings.AUTH0_DOMAIN}/"
+        self._executor: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        # Running batches and the caller futures each one will resolve
+        self._batches: Dict[asyncio.Task, List[asyncio.Future]] = {}
+        self._pem_cache: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+
+    async def decode(self, token: str, key: Any) -> Dict:
+        """Verify ``token`` against ``key``; raises the same PyJWT errors as jwt.decode."""
+        if self.mode == "inline":
+            return jwt.decode(token, key, algorithms=ALGORITHMS, audience=self.audience, issuer=self.issuer)
+
+        if self._dispatcher is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((token, self._worker_key(key), future))
+        return await future
+
+    def start(self) -> None:
+        """Create the executor and dispatcher. Safe to call more than once."""
+        if self.mode == "inline" or self._dispatcher is not None:
+            return
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="jwt-verify"
+            )
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._batch_slots = asyncio.Semaphore(self.max_workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        logger.info(f"Started {self.mode} token verifier with {self.max_workers} workers")
+
+    async def close(self) -> None:
+        """Stop the dispatcher, fail queued and in-flight requests and shut the executor down."""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        pending = [future for futures in self._batches.values() for future in futures]
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait()[2])
+        # Cancelled executor work never resolves its batch, so callers are failed here
+        for future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Token verifier is shutting down"))
+        for task in list(self._batches):
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._dispatcher = None
+        self._executor = None
+        self._queue = None
+
+    def _worker_key(self, key: Any) -> Any:
+        # Key objects can't be pickled, so process workers receive PEM bytes instead
+        if self.mode != "process":
+            return key
+        # Keyed by the RSA modulus and exponent rather than the object: a JWKS refresh
+        # parses new objects for the same keys, and ids of freed keys get reused
+        numbers = key.public_numbers()
+        material = (numbers.n, numbers.e)
+        pem = self._pem_cache.get(material)
+        if pem is not None:
+            self._pem_cache.move_to_end(material)
+            return pem
+        pem = self._pem_cache[material] = key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        if len(self._pem_cache) > _MAX_WORKER_KEYS:
+            self._pem_cache.popitem(last=False)
+        return pem
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._batch_slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches[task] = [future for _, _, future in batch]
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        self._batches.pop(task, None)
+        self._batch_slots.release()
+
+    async def _run_batch(self, batch: List[Tuple[str, Any, asyncio.Future]]) -> None:
+        jobs = [(token, key) for token, key, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _decode_batch, jobs, self.audience, self.issuer
+            )
+        except Exception as e:
+            logger.error(f"Token verification batch failed: {str(e)}")
+            results = [(False, e)] * len(batch)
+
+        for (_, _, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+@lru_cache()
+def get_token_verifier() -> TokenVerifier:
+    return TokenVerifier(
+        mode=settings.JWT_VERIFY_MODE,
+        max_workers=settings.JWT_VERIFY_WORKERS,
+        queue_size=settings.JWT_VERIFY_QUEUE_SIZE,
+        batch_size=settings.JWT_VERIFY_BATCH_SIZE,
+        batch_window=settings.JWT_VERIFY_BATCH_WINDOW_MS / 1000,
+    )
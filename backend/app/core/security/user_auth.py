@@ -0,0 +1,121 @@
+# backend/app/core/security/user_auth.py
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import jwt
+from fastapi import HTTPException, Request, status
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+
+from .jwks import JWKSUnavailableError, get_jwks_provider
+from .permissions import has_permissions
+from .roles import resolve_masks
+from .token_store import get_verified_token_cache
+from .token_verifier import get_token_verifier
+
+BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+
+def claim_permissions(claims: Mapping[str, Any]) -> Tuple[str, ...]:
+    """The token's permissions claim; a null or malformed claim grants nothing rather than failing the request."""
+    permissions = claims.get("permissions")
+    if not isinstance(permissions, (list, tuple)):
+        return ()
+    return tuple(permission for permission in permissions if isinstance(permission, str))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller, built once per request from verified token claims."""
+    sub: str
+    email: Optional[str]
+    roles: Tuple[str, ...]
+    role_mask: int
+    permission_mask: int
+    claims: Mapping[str, Any]
+    token: str = field(repr=False)
+    # Local User.id, once the subject is provisioned
+    user_id: Optional[int] = None
+
+    @classmethod
+    def from_claims(cls, claims: Dict, token: str) -> "Principal":
+        roles = claim_permissions(claims)
+        role_mask, permission_mask = resolve_masks(roles)
+        return cls(
+            sub=claims.get("sub"),
+            email=claims.get("email"),
+            roles=roles,
+            role_mask=role_mask,
+            permission_mask=permission_mask,
+            claims=MappingProxyType(dict(claims)),
+            token=token,
+        )
+
+    def with_local_user(self, user_id: int, role_mask: int, permission_mask: int) -> "Principal":
+        """Copy linked to the local user, adding the roles assigned to it locally."""
+        return replace(
+            self,
+            user_id=user_id,
+            role_mask=self.role_mask | role_mask,
+            permission_mask=self.permission_mask | permission_mask,
+        )
+
+    def has_any_role(self, required_mask: int) -> bool:
+        return bool(self.role_mask & required_mask)
+
+    def has_permissions(self, required_mask: int) -> bool:
+        return has_permissions(self.permission_mask, required_mask)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=BEARER_HEADERS,
+    )
+
+
+async def verify_access_token(token: str) -> Dict:
+    """Verify an Auth0 access token and return its claims.
+
+    Tokens that were verified before are answered from the verified-claims cache.
+    Raises HTTPException(401) for any token that does not verify.
+    """
+    token_cache = get_verified_token_cache()
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+
+    try:
+        unverified_header = jwt.get_unverified_header(token)
+        kid = unverified_header.get("kid")
+        if not kid:
+            raise _unauthorized("No key ID in token header")
+
+        key = await get_jwks_provider().get_signing_key(kid)
+        if key is None:
+            raise _unauthorized("Invalid token signature")
+
+        payload = await get_token_verifier().decode(token, key)
+
+    except JWKSUnavailableError as e:
+        raise _unauthorized(f"Authentication service unavailable: {str(e)}")
+    except ExpiredSignatureError:
+        raise _unauthorized("Token has expired")
+    except InvalidTokenError:
+        raise _unauthorized("Invalid token")
+
+    token_cache.put(token, payload)
+    return payload
+
+
+def get_principal(request: Request) -> Principal:
+    """Return the principal attached by AuthenticationMiddleware, or raise 401."""
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    auth_error = getattr(request.state, "auth_error", None)
+    if auth_error is not None:
+        raise auth_error
+    raise _unauthorized("Not authenticated")
@@ -1,5 +1,13 @@
 # backend/app/db/__init__.py
 from .base import Base
-from .session import SessionLocal, get_db
+from .session import AsyncSessionLocal, ReadSessionLocal, SessionLocal, get_async_db, get_db, get_read_db
 
-__all__ = ["Base", "SessionLocal", "get_db"]
\ No newline at end of file
+__all__ = [
+    "Base",
+    "AsyncSessionLocal",
+    "ReadSessionLocal",
+    "SessionLocal",
+    "get_async_db",
+    "get_db",
+    "get_read_db",
+]
@@ -1,55 +1,109 @@
 # backend/app/db/init_db.py
 import logging
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker
 from . import Base
-from .session import engine, SessionLocal
+from .session import async_engine, AsyncSessionLocal
+from ..config import get_settings
 from ..models import Role, RoleType
+from ..utils.timing import PhaseTimer
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Application-wide key of the advisory lock held while seeding roles
+SEED_ROLES_LOCK_KEY = 7_345_021_001
+
+DEFAULT_ROLES = {
+    RoleType.ADMIN: "Administrator with full access",
+    RoleType.MODERATOR: "Moderator with limited administrative access",
+    RoleType.USER: "Regular user with standard access",
+}
+
+
+@lru_cache()
+def migration_heads() -> FrozenSet[str]:
+    """Head revisions of the Alembic scripts, read once per process."""
+    return frozenset(ScriptDirectory(settings.DB_MIGRATIONS_PATH).get_heads())
 
-def init_db() -> None:
-    """Initialize the database, creating all tables and default data."""
+
+async def init_db(
+        engine: AsyncEngine = async_engine,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        schema_init: str = settings.DB_SCHEMA_INIT,
+        timer: Optional[PhaseTimer] = None
+) -> None:
+    """Initialize the database: make sure the schema exists and seed default data.
+
+    With ``schema_init`` "auto" (the DB_SCHEMA_INIT default), a database whose
+    alembic_version is at the migration head is left alone; create_all, which
+    reflects every table, only runs for databases Alembic hasn't brought up to
+    date. Default roles are seeded by whichever worker first finds the role
+    table empty.
+    """
+    timer = timer or PhaseTimer(logger, "Database initialization")
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        logger.info("Successfully created database tables.")
+        if schema_init != "skip":
+            with timer.phase("db_schema"):
+                async with engine.begin() as conn:
+                    if schema_init == "create_all" or not await _schema_is_current(conn):
+                        # DDL helpers are sync, so run them on the async connection
+                        await conn.run_sync(Base.metadata.create_all)
+                        logger.info("Successfully created database tables.")
 
-        # Initialize default roles
-        _init_default_roles()
-        logger.info("Successfully initialized default data.")
+        with timer.phase("db_seed_roles"):
+            await _init_default_roles(session_factory)
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
 
-def _init_default_roles() -> None:
-    """Initialize default roles if they don't exist."""
-    db = SessionLocal()
+async def _schema_is_current(conn: AsyncConnection) -> bool:
+    """Whether alembic_version holds exactly the migration head revisions."""
     try:
-        # Check if roles already exist
-        existing_roles = db.query(Role).count()
-        if existing_roles == 0:
-            # Create default roles
-            default_roles = [
-                Role(
-                    name=RoleType.ADMIN,
-                    description="Administrator with full access"
-                ),
-                Role(
-                    name=RoleType.MODERATOR,
-                    description="Moderator with limited administrative access"
-                ),
-                Role(
-                    name=RoleType.USER,
-                    description="Regular user with standard access"
-                )
-            ]
-            db.add_all(default_roles)
-            db.commit()
-            logger.info("Created default roles")
+        heads = migration_heads()
     except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to create default roles: {str(e)}")
-        raise
-    finally:
-        db.close()
\ No newline at end of file
+        logger.warning(f"Could not read migration scripts from {settings.DB_MIGRATIONS_PATH}: {str(e)}")
+        return False
+    current = frozenset(
+        await conn.run_sync(lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads())
+    )
+    if current == heads:
+        logger.info(f"Database schema is at migration head {', '.join(sorted(heads))}; skipping create_all")
+        return True
+    logger.warning(
+        f"Database schema is at revision {', '.join(sorted(current)) or 'none'} but the migration head is "
+        f"{', '.join(sorted(heads))}; falling back to create_all"
+    )
+    return False
+
+
+async def _init_default_roles(session_factory: async_sessionmaker) -> None:
+    """Create the default roles if the role table is empty."""
+    async with session_factory() as db:
+        try:
+            if await db.scalar(select(Role.id).limit(1)) is not None:
+                return
+
+            if db.get_bind().dialect.name == "postgresql":
+                # Held until commit. Workers that don't get it skip seeding; the role
+                # catalog picks the new roles up from the role table's NOTIFY trigger.
+                if not await db.scalar(select(func.pg_try_advisory_xact_lock(SEED_ROLES_LOCK_KEY))):
+                    logger.info("Another worker is seeding default roles")
+                    return
+                # The lock holder before us may have committed them already
+                if await db.scalar(select(Role.id).limit(1)) is not None:
+                    return
+
+            db.add_all(Role(name=name, description=description) for name, description in DEFAULT_ROLES.items())
+            await db.commit()
+            logger.info("Created default roles")
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Failed to create default roles: {str(e)}")
+            raise
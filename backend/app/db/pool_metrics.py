@@ -0,0 +1,208 @@
+# backend/app/db/pool_metrics.py
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Counters and gauges for one engine's connection pool.
+
+    Checkout wait is timed by the instrumented pool classes below; the remaining
+    numbers come from SQLAlchemy pool events. Sync pools are used from several
+    threads, so updates take a lock.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self._created_at: Dict[int, float] = {}
+        self._wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.overflow_connections_opened = 0
+        self.invalidations = 0
+        self.pre_pings = 0
+        self.pre_ping_failures = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS) if seconds <= bound), len(WAIT_BUCKETS))
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self._wait_buckets[bucket] += 1
+
+    def attach(self, engine: Engine) -> None:
+        """Start collecting metrics for ``engine`` (pass ``sync_engine`` for async engines)."""
+        self.pool = engine.pool
+        engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_pre_ping(self, failed: bool = False) -> None:
+        with self._lock:
+            self.pre_pings += 1
+            if failed:
+                self.pre_ping_failures += 1
+
+    def _on_connect(self, dbapi_connection: Any, _connection_record: Any) -> None:
+        with self._lock:
+            self._created_at[id(dbapi_connection)] = time.monotonic()
+            self.connections_opened += 1
+            # The pool counts a new connection before opening it, so overflow > 0 means this one
+            if self.pool is not None and self.pool.overflow() > 0:
+                self.overflow_connections_opened += 1
+
+    def _on_close(self, dbapi_connection: Any, *_: Any) -> None:
+        with self._lock:
+            if self._created_at.pop(id(dbapi_connection), None) is not None:
+                self.connections_closed += 1
+
+    def _on_invalidate(self, *_: Any) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - created_at for created_at in self._created_at.values()]
+            total_checkouts = self.checkouts + self.checkout_timeouts
+            snapshot = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_seconds_avg": self.wait_seconds_total / total_checkouts if total_checkouts else 0.0,
+                "checkout_wait_seconds_max": self.wait_seconds_max,
+                "checkout_wait_histogram": {
+                    **{f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self._wait_buckets)},
+                    "gt_last": self._wait_buckets[-1],
+                },
+                "connections_opened": self.connections_opened,
+                "connections_closed": self.connections_closed,
+                "overflow_connections_opened": self.overflow_connections_opened,
+                "invalidations": self.invalidations,
+                "pre_pings": self.pre_pings,
+                "pre_ping_failures": self.pre_ping_failures,
+                "connection_age_seconds_max": max(ages, default=0.0),
+                "connection_age_seconds_avg": sum(ages) / len(ages) if ages else 0.0,
+            }
+        if self.pool is not None:
+            snapshot.update({
+                "pool_size": self.pool.size(),
+                "in_use": self.pool.checkedout(),
+                "idle": self.pool.checkedin(),
+                "overflow": max(self.pool.overflow(), 0),
+            })
+        return snapshot
+
+
+class _TimedCheckoutMixin:
+    """Times how long each checkout waits for a connection, including pool timeouts."""
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float, metrics: PoolMetrics) -> None:
+    """Ping connections on checkout only when they sat idle for ``idle_seconds``.
+
+    Connections handed back and forth under load skip the round trip that
+    ``pool_pre_ping`` adds to every checkout. A failed ping raises
+    DisconnectionError, which makes the pool discard the connection and retry.
+    """
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(_dbapi_connection: Any, connection_record: Any) -> None:
+        if connection_record is not None:
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection: Any, connection_record: Any, _connection_proxy: Any) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+            metrics.record_pre_ping()
+        except Exception as e:
+            metrics.record_pre_ping(failed=True)
+            logger.warning(f"Discarding stale pooled connection: {str(e)}")
+            raise exc.DisconnectionError() from e
+
+
+def pool_options(pool_class: type) -> Dict[str, Any]:
+    """Engine keyword arguments for the configured pool."""
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Attach metrics and the configured pre-ping strategy to ``engine``."""
+    metrics = PoolMetrics(name)
+    metrics.attach(engine)
+    if settings.DB_POOL_PRE_PING == "idle":
+        install_idle_pre_ping(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS, metrics)
+    _pool_metrics[name] = metrics
+    return metrics
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every instrumented pool, keyed by engine name."""
+    return {name: metrics.snapshot() for name, metrics in _pool_metrics.items()}
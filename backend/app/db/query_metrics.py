@@ -0,0 +1,113 @@
+# backend/app/db/query_metrics.py
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class RepeatedQueryError(RuntimeError):
+    """One unit of work ran the same statement too often, the signature of an N+1."""
+
+
+class QueryStats:
+    """Statements run during one request (or any other ``track_queries`` block).
+
+    Statements are compared as SQL text with bind placeholders, so every
+    execution of the same ORM query counts as one shape whatever its
+    parameters. The same shape turning up once per row of an earlier result is
+    what an N+1 looks like.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[statement] += 1
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times, most frequent first."""
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; statement text stays out of it."""
+        max_repeats = max(self.shapes.values(), default=0)
+        return (
+            f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}, "
+            f'db-repeats;desc="{max_repeats}"'
+        )
+
+    def check_repeats(self, threshold: int, raise_error: bool, label: str) -> None:
+        """Warn about, or with ``raise_error`` fail on, statements repeated ``threshold`` times."""
+        repeated = self.repeated(threshold)
+        if not repeated:
+            return
+        statement, count = repeated[0]
+        message = f"{label} ran the same statement {count} times (possible N+1): {_shorten(statement)}"
+        if raise_error:
+            raise RepeatedQueryError(message)
+        logger.warning(message)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements run in this block, including tasks it starts, into a QueryStats."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _shorten(statement: str, length: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+def _before_cursor_execute(conn: Any, _cursor: Any, _statement: str, _parameters: Any, _context: Any,
+                           _executemany: bool) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, _parameters: Any, _context: Any,
+                          _executemany: bool) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(context: Any) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    started = context.connection.info.get("query_started_at") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Record statements run on ``engine`` (pass ``sync_engine`` for async engines) into the current QueryStats."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,88 @@
+# backend/app/db/routing.py
+import itertools
+import logging
+import time
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, skipping the ones that recently failed.
+
+    A replica is marked down when connecting to it fails or a connection to it is
+    lost, and is tried again ``retry_after`` seconds later. When every replica is
+    down, reads fall back to the primary.
+    """
+
+    def __init__(self, engines: List[Engine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(engines)
+        self._next = itertools.count()
+        for index, engine in enumerate(engines):
+            event.listen(engine, "handle_error", self._error_handler(index))
+
+    def choose(self) -> Optional[Engine]:
+        """Return the next healthy replica, or None when none is available."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._next) % len(self.engines)
+            if self._down_until[index] <= now:
+                return self.engines[index]
+        return None
+
+    def mark_down(self, index: int) -> None:
+        if self._down_until[index] <= time.monotonic():
+            logger.warning(f"Read replica {index} is unavailable; routing reads elsewhere for {self.retry_after}s")
+        self._down_until[index] = time.monotonic() + self.retry_after
+
+    def healthy_count(self) -> int:
+        now = time.monotonic()
+        return sum(1 for down_until in self._down_until if down_until <= now)
+
+    def _error_handler(self, index: int):
+        def handle_error(context: Any) -> None:
+            # No connection means the connect itself failed
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(index)
+        return handle_error
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica and everything else to the primary.
+
+    Flushes, DML statements and SELECT ... FOR UPDATE go to the primary, and from
+    the first of those on the session stays on the primary, so a request reads
+    its own writes. Without replicas every statement goes to the primary.
+    """
+
+    def __init__(self, primary: Engine, replicas: Optional[ReplicaSet] = None, **kw: Any):
+        super().__init__(**kw)
+        self.primary = primary
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("use_primary") or self._flushing or self._is_write(clause):
+            self.info["use_primary"] = True
+            return self.primary
+        if self.replicas is not None:
+            replica = self.info.get("replica")
+            if replica is None:
+                # One replica per session keeps its reads on a single snapshot source
+                replica = self.replicas.choose()
+                self.info["replica"] = replica
+            if replica is not None:
+                return replica
+        return self.primary
+
+    @staticmethod
+    def _is_write(clause: Any) -> bool:
+        if isinstance(clause, UpdateBase):
+            return True
+        return getattr(clause, "_for_update_arg", None) is not None
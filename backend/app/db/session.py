@@ -1,22 +1,30 @@
 # backend/app/db/session.py
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from ..config import get_settings
+from .pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+    pool_options,
+)
+from .query_metrics import instrument_queries
+from .routing import ReplicaSet, RoutingSession
 
 settings = get_settings()
 
 # Create database engine with psycopg3 driver
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
     future=True,
-    echo=settings.DEBUG,
+    echo=settings.DB_ECHO,
     # Specify psycopg3 driver explicitly
-    module=__import__('psycopg')
+    module=__import__('psycopg'),
+    **pool_options(InstrumentedQueuePool)
 )
+instrument_engine(engine, "sync")
 
 # Create session maker
 SessionLocal = sessionmaker(
@@ -25,10 +33,75 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine for request handling; the same psycopg3 URL runs in async mode here,
+# so database I/O waits on the event loop instead of holding a threadpool worker
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **pool_options(InstrumentedAsyncQueuePool)
+)
+# Pool events are registered on the sync facade of the async engine
+instrument_engine(async_engine.sync_engine, "async")
+
+# Objects stay usable after commit; lazy loads would need an await we can't do there
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read replicas share the pool settings; each one reports its own pool metrics
+replica_engines = [
+    create_async_engine(url, echo=settings.DB_ECHO, **pool_options(InstrumentedAsyncQueuePool))
+    for url in settings.read_replica_urls_list
+]
+for index, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine.sync_engine, f"replica_{index}")
+
+# Per-request statement counts and timings; see QueryMetricsMiddleware
+if settings.DB_QUERY_METRICS:
+    instrument_queries(engine)
+    instrument_queries(async_engine.sync_engine)
+    for replica_engine in replica_engines:
+        instrument_queries(replica_engine.sync_engine)
+
+replica_set = ReplicaSet(
+    [replica_engine.sync_engine for replica_engine in replica_engines],
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS
+) if replica_engines else None
+
+# Sessions for read-mostly work: reads go to a replica until the session writes
+ReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    replicas=replica_set,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Dependency to get database session
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get an async database session
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency to get a session that reads from replicas
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with ReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection of the async primary and replica engines."""
+    await async_engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
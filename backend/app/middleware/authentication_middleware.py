@@ -0,0 +1,218 @@
+# backend/app/middleware/authentication_middleware.py
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Response, status
+from jwt import decode
+from jwt.exceptions import PyJWTError
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from ..core.security.token_manager import get_session_token_manager, get_token_refresher
+from ..core.security.token_store import SessionRecord, get_session_store
+from ..core.security.user_auth import BEARER_HEADERS, Principal, verify_access_token
+from ..services.activity_service import get_last_login_buffer
+from ..services.provisioning_service import get_user_provisioner
+from ..utils.http_client import get_http_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN_COOKIE = "access_token"
+REFRESH_TOKEN_COOKIE = "refresh_token"
+
+
+def extract_bearer_token(headers: Headers) -> Optional[str]:
+    """Return the bearer token from the Authorization header, if any."""
+    authorization = headers.get("authorization")
+    if authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer" and credentials:
+            return credentials.strip()
+    return None
+
+
+def parse_cookies(headers: Headers) -> Dict[str, str]:
+    cookie_header = headers.get("cookie")
+    return cookie_parser(cookie_header) if cookie_header else {}
+
+
+def set_token_cookies(response: Response, tokens: Dict) -> None:
+    """Set the access token cookie, and the refresh token cookie when Auth0 sent one."""
+    response.set_cookie(
+        ACCESS_TOKEN_COOKIE,
+        tokens["access_token"],
+        httponly=True,
+        secure=True,
+        samesite="lax",
+        max_age=3600  # 1 hour
+    )
+    # Auth0 issues a new refresh token when rotation is enabled
+    if "refresh_token" in tokens:
+        response.set_cookie(
+            REFRESH_TOKEN_COOKIE,
+            tokens["refresh_token"],
+            httponly=True,
+            secure=True,
+            samesite="lax",
+            max_age=2592000  # 30 days
+        )
+
+
+def _expires_within(token: str, seconds: int) -> bool:
+    """Whether ``token`` has expired or expires within ``seconds``, read without verification."""
+    try:
+        exp = decode(token, options={"verify_signature": False}).get("exp")
+    except PyJWTError:
+        # Malformed; leave it to verification to reject
+        return False
+    return isinstance(exp, (int, float)) and exp - time.time() <= seconds
+
+
+def _authentication_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Authentication unavailable",
+        headers=BEARER_HEADERS,
+    )
+
+
+class AuthenticationMiddleware:
+    """Pure ASGI middleware that authenticates the caller once per request.
+
+    A bearer token wins. Otherwise the cookie is used: the access_token cookie in
+    token mode, or the opaque session cookie in session mode, where auth is one
+    session store lookup. The result is stored on ``request.state``:
+    ``principal`` holds an immutable Principal, or None. ``auth_error`` holds
+    the HTTPException to raise when a route needs authentication. ``session``
+    holds the SessionRecord in session mode. Requests are never rejected here,
+    so public routes are unaffected.
+
+    Access tokens close to expiry are refreshed before the route runs. In session
+    mode the session's tokens are refreshed through the SessionTokenManager, which
+    also keeps refreshing active sessions in the background. In token mode the
+    refresh_token cookie is exchanged when the access_token cookie is close to
+    expiry, and the new cookies are added to the response.
+
+    The principal is then linked to its local user when the UserProvisioner has
+    the link cached, and the user's activity is recorded in the last_login
+    write-behind buffer. Otherwise the link is made by the get_local_principal
+    dependency, so only routes that need the local user wait for the lookup.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        principal = None
+        auth_error = None
+        session = None
+        headers = Headers(scope=scope)
+        token = extract_bearer_token(headers)
+
+        if token is None:
+            cookies = parse_cookies(headers)
+            if settings.AUTH_MODE == "session":
+                session_id = cookies.get(settings.SESSION_COOKIE_NAME)
+                if session_id:
+                    try:
+                        session = await get_session_store().get(session_id)
+                        if session is not None:
+                            session = await self._fresh_session(session)
+                        if session is not None and session.access_token_expires_at > time.time():
+                            principal = Principal.from_claims(session.claims, session.access_token)
+                        else:
+                            # Unknown, or its Auth0 token expired and couldn't be refreshed
+                            session = None
+                            auth_error = HTTPException(
+                                status_code=status.HTTP_401_UNAUTHORIZED,
+                                detail="Session expired",
+                                headers=BEARER_HEADERS,
+                            )
+                    except Exception as e:
+                        logger.error(f"Failed to load session: {str(e)}")
+                        session = None
+                        auth_error = _authentication_unavailable()
+            else:
+                token = cookies.get(ACCESS_TOKEN_COOKIE) or None
+                refresh_token = cookies.get(REFRESH_TOKEN_COOKIE)
+                # Only for a present access token that is about to expire or already has;
+                # without one the client refreshes through /api/auth/refresh
+                if token and refresh_token and _expires_within(token, settings.TOKEN_REFRESH_LEAD_SECONDS):
+                    new_tokens = await self._refresh_cookie_tokens(refresh_token)
+                    if new_tokens is not None:
+                        token = new_tokens["access_token"]
+                        send = self._with_token_cookies(send, new_tokens)
+
+        if token:
+            try:
+                claims = await verify_access_token(token)
+                principal = Principal.from_claims(claims, token)
+            except HTTPException as e:
+                auth_error = e
+            except Exception as e:
+                # Only routes that need a principal fail; public routes still work
+                logger.error(f"Unexpected error while verifying access token: {str(e)}")
+                auth_error = _authentication_unavailable()
+
+        if principal is not None:
+            principal = self._with_local_user(principal)
+
+        state = scope.setdefault("state", {})
+        state["principal"] = principal
+        state["auth_error"] = auth_error
+        state["session"] = session
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _fresh_session(session: SessionRecord) -> SessionRecord:
+        manager = get_session_token_manager()
+        manager.track(session)
+        try:
+            return await manager.ensure_fresh(session, get_http_client())
+        except Exception as e:
+            # The stored claims still identify the user; the background scheduler retries
+            logger.error(f"Failed to refresh session tokens: {str(e)}")
+            return session
+
+    @staticmethod
+    def _with_local_user(principal: Principal) -> Principal:
+        """Link ``principal`` from the provisioner's cache; never waits on the database."""
+        linked = get_user_provisioner().cached(principal)
+        if linked is None:
+            # Resolved by get_local_principal, for the routes that need it
+            return principal
+        if linked.user_id is not None:
+            # Buffered; written in the background with other users' activity
+            get_last_login_buffer().record(linked.user_id)
+        return linked
+
+    @staticmethod
+    async def _refresh_cookie_tokens(refresh_token: str) -> Optional[Dict]:
+        try:
+            return await get_token_refresher().refresh(refresh_token, get_http_client())
+        except Exception as e:
+            logger.error(f"Failed to refresh token: {str(e)}")
+            return None
+
+    @staticmethod
+    def _with_token_cookies(send: Send, tokens: Dict) -> Send:
+        cookies = Response()
+        set_token_cookies(cookies, tokens)
+        set_cookie_headers = [
+            (name, value) for name, value in cookies.raw_headers if name == b"set-cookie"
+        ]
+
+        async def send_with_cookies(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + set_cookie_headers
+            await send(message)
+
+        return send_with_cookies
@@ -0,0 +1,52 @@
+# backend/app/middleware/query_metrics_middleware.py
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from ..db.query_metrics import track_queries
+
+settings = get_settings()
+
+
+class QueryMetricsMiddleware:
+    """Pure ASGI middleware that tracks the SQL statements each request runs.
+
+    The statement count, total database time, slowest statement and the most
+    executions of a single statement go out in a Server-Timing header. Statements
+    a streamed body runs after the headers were sent are not included.
+
+    With DB_REPEATED_QUERY_MODE set to warn or raise, a request that ran one
+    statement DB_REPEATED_QUERY_THRESHOLD times or more is logged, or fails with
+    RepeatedQueryError so the test that made it fails too. The check runs before
+    the response starts, so in raise mode the request itself fails with a 500;
+    statements a streamed body runs later are only checked once it finishes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = settings.DB_REPEATED_QUERY_MODE
+        label = f"{scope['method']} {scope['path']}"
+        checked_count = None
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message) -> None:
+                nonlocal checked_count
+                if message["type"] == "http.response.start":
+                    # Checked before the headers go out, so raise mode can still fail the request
+                    if mode != "off":
+                        checked_count = stats.count
+                        stats.check_repeats(settings.DB_REPEATED_QUERY_THRESHOLD, mode == "raise", label)
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        # No response was started, or a streamed body ran more statements after the headers
+        if mode != "off" and stats.count != checked_count:
+            stats.check_repeats(settings.DB_REPEATED_QUERY_THRESHOLD, mode == "raise", label)
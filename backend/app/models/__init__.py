@@ -3,5 +3,6 @@ from .base import TimeStampedModel
 from .user import User
 from .role import Role, RoleType
 from .profile import UserProfile
+from .session import AuthSession
 
-__all__ = ["TimeStampedModel", "User", "Role", "RoleType", "UserProfile"]
\ No newline at end of file
+__all__ = ["TimeStampedModel", "User", "Role", "RoleType", "UserProfile", "AuthSession"]
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/app/models/profile.py
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, Text
+from sqlalchemy import String, ForeignKey, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import TimeStampedModel
 
@@ -23,5 +23,9 @@ class UserProfile(TimeStampedModel):
     location: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     phone_number: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
 
+    # Bumped on every update; the ORM checks it on flush (optimistic concurrency) and it feeds the ETag
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationship back to user - using string literal for type hint
     user: Mapped["User"] = relationship("User", back_populates="profile")
\ No newline at end of file
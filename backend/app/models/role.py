@@ -1,9 +1,12 @@
 # backend/app/models/role.py
 from enum import Enum as PyEnum
-from sqlalchemy import Enum, String
+from sqlalchemy import DDL, Enum, String, event
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import TimeStampedModel
 
+# NOTIFY channel signalled whenever the role table changes
+ROLE_CHANGES_CHANNEL = "role_catalog_changed"
+
 class RoleType(str, PyEnum):
     ADMIN = "ADMIN"
     MODERATOR = "MODERATOR"
@@ -16,4 +19,24 @@ class Role(TimeStampedModel):
         unique=True,
         nullable=False
     )
-    description: Mapped[str] = mapped_column(String(200))
\ No newline at end of file
+    description: Mapped[str] = mapped_column(String(200))
+
+
+# Tell every worker's role catalog to reload, whatever changed the table. The same
+# DDL is applied to existing databases by a migration.
+NOTIFY_ROLE_CHANGES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_role_catalog_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{ROLE_CHANGES_CHANNEL}', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+NOTIFY_ROLE_CHANGES_TRIGGER = """
+CREATE TRIGGER role_catalog_changed
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON role
+FOR EACH STATEMENT EXECUTE FUNCTION notify_role_catalog_changed()
+"""
+
+for _statement in (NOTIFY_ROLE_CHANGES_FUNCTION, NOTIFY_ROLE_CHANGES_TRIGGER):
+    event.listen(Role.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,24 @@
+# backend/app/models/session.py
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import String, Text, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import TimeStampedModel
+
+
+class AuthSession(TimeStampedModel):
+    """Server-side login session referenced by an opaque session cookie."""
+
+    # Override the default table name
+    __tablename__ = "auth_session"
+
+    # SHA-256 of the session ID; the raw ID only ever lives in the client's cookie
+    session_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    sub: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
+    claims: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    # Auth0 tokens, kept server side
+    access_token: Mapped[str] = mapped_column(Text, nullable=False)
+    refresh_token: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    access_token_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
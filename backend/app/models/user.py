@@ -1,7 +1,9 @@
 # backend/app/models/user.py
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Table, Column
+from sqlalchemy import (
+    String, Boolean, DateTime, ForeignKey, Index, Integer, Table, Column, DDL, event, func, literal_column
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import TimeStampedModel
 from .role import Role
@@ -19,6 +21,11 @@ user_roles = Table(
 class User(TimeStampedModel):
     """User model for storing user account information."""
 
+    # Keyset pagination of the admin listing seeks on (created_at, id)
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
+
     # Basic user information
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     username: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
@@ -30,6 +37,10 @@ class User(TimeStampedModel):
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     auth0_id: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
 
+    # Bumped on every update; the ORM checks it on flush (optimistic concurrency) and it feeds the ETag
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
     # Timestamps
     last_login: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     email_verified_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -44,4 +55,28 @@ class User(TimeStampedModel):
         back_populates="user",
         uselist=False,
         cascade="all, delete-orphan"
-    )
\ No newline at end of file
+    )
+
+
+# Searched by the admin user search. The separators are SQL literals rather than
+# bind parameters, otherwise PostgreSQL can't match queries to the index expression.
+SEARCH_SEPARATOR = literal_column("' '", String)
+SEARCH_TEXT = func.lower(
+    User.email + SEARCH_SEPARATOR + User.username + SEARCH_SEPARATOR
+    + User.first_name + SEARCH_SEPARATOR + User.last_name
+)
+
+# Trigram index for substring search; pg_trgm is PostgreSQL-only, other databases scan
+Index(
+    "ix_user_search_trgm",
+    SEARCH_TEXT.label("search_text"),
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+# create_all builds the index too, so the extension has to exist first
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
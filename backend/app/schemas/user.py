@@ -1,14 +1,11 @@
 # backend/app/schemas/user.py
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING
-from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from .profile import UserProfile
 from .role import Role
 
-# Handle circular imports
-if TYPE_CHECKING:
-    from .profile import UserProfile
-
 
 class UserBase(BaseModel):
     """Base schema for User with common attributes."""
@@ -25,13 +22,26 @@ class UserCreate(UserBase):
 
 
 class UserUpdate(BaseModel):
-    """Schema for updating a user."""
-    email: Optional[EmailStr] = None
+    """Schema for updating a user.
+
+    email and is_verified are not accepted: Auth0 owns them, and every login
+    copies them from Auth0 onto the local user. Fields may be left out, but not
+    set to null.
+    """
     username: Optional[str] = Field(None, min_length=3, max_length=50)
     first_name: Optional[str] = Field(None, min_length=1, max_length=50)
     last_name: Optional[str] = Field(None, min_length=1, max_length=50)
     is_active: Optional[bool] = None
-    is_verified: Optional[bool] = None
+
+    @field_validator("username", "first_name", "last_name", "is_active")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+    class Config:
+        extra = "forbid"
 
 
 class UserInDBBase(UserBase):
@@ -56,7 +66,6 @@ class User(UserInDBBase):
 
 class UserWithProfile(User):
     """Schema for returning a user with profile information."""
-    from .profile import UserProfile  # Import here to avoid circular import
     profile: Optional[UserProfile] = None
 
     class Config:
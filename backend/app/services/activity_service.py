@@ -0,0 +1,146 @@
+# backend/app/services/activity_service.py
+import asyncio
+import logging
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..config import get_settings
+from ..db.session import AsyncSessionLocal
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE; two bind parameters each keeps well under the driver's 65535 limit
+_FLUSH_BATCH_SIZE = 5000
+
+# Never moves last_login backwards; activity isn't an edit, so updated_at is left alone
+_UPDATE_LAST_LOGIN = """
+    UPDATE "user" AS u
+    SET last_login = activity.last_login
+    FROM (VALUES {rows}) AS activity (id, last_login)
+    WHERE u.id = activity.id
+      AND (u.last_login IS NULL OR u.last_login < activity.last_login)
+"""
+
+
+def _utcnow() -> datetime:
+    # last_login is a naive timestamp column holding UTC
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class LastLoginBuffer:
+    """Write-behind buffer for ``User.last_login``.
+
+    ``record`` only updates an in-memory dict, keeping the latest timestamp per
+    user. A background task writes the buffer every ``interval`` seconds, or as
+    soon as ``threshold`` users are waiting, with one UPDATE ... FROM (VALUES ...)
+    per batch. The update never moves last_login backwards, so several workers
+    can flush the same users in any order.
+
+    A failed flush puts its rows back and the next round retries them. Rows still
+    buffered when the process dies are lost, which is acceptable for an activity
+    timestamp; ``stop`` flushes what is left on a clean shutdown.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, interval: float, threshold: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.threshold = threshold
+        self._pending: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, user_id: int, at: Optional[datetime] = None) -> None:
+        """Note activity by ``user_id``; written on the next flush."""
+        self._merge(user_id, at or _utcnow())
+        if len(self._pending) >= self.threshold:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every buffered timestamp now and return how many users were written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            # Sorted, so concurrent flushes from several workers lock rows in the same order
+            rows = sorted(pending.items())
+            try:
+                async with self.session_factory() as db:
+                    conn = await db.connection()
+                    for start in range(0, len(rows), _FLUSH_BATCH_SIZE):
+                        batch = rows[start:start + _FLUSH_BATCH_SIZE]
+                        await conn.exec_driver_sql(
+                            self._statement(len(batch)),
+                            tuple(value for row in batch for value in row)
+                        )
+                    await db.commit()
+            except BaseException:
+                # Also on cancellation, so a shutdown mid-flush loses nothing
+                for user_id, at in rows:
+                    self._merge(user_id, at)
+                raise
+            return len(rows)
+
+    async def start(self) -> None:
+        """Start the periodic flush."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final last_login flush failed, {self.pending} updates lost: {str(e)}")
+
+    def _merge(self, user_id: int, at: datetime) -> None:
+        previous = self._pending.get(user_id)
+        if previous is None or at > previous:
+            self._pending[user_id] = at
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _statement(row_count: int) -> str:
+        # Rendered once per batch size; building it through SQL expressions costs
+        # tens of microseconds per row on the event loop
+        rows = ", ".join(["(%s::integer, %s::timestamp)"] * row_count)
+        return _UPDATE_LAST_LOGIN.format(rows=rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                # Shielded: stop() cancels this task, and the flush it interrupts must still finish
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logger.error(f"last_login flush failed, {self.pending} updates kept for retry: {str(e)}")
+                # Don't let a full buffer turn a database outage into a retry loop
+                await asyncio.sleep(self.interval)
+
+
+@lru_cache()
+def get_last_login_buffer() -> LastLoginBuffer:
+    return LastLoginBuffer(
+        AsyncSessionLocal,
+        interval=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+        threshold=settings.LAST_LOGIN_FLUSH_THRESHOLD,
+    )
@@ -0,0 +1,149 @@
+# backend/app/services/export_service.py
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from ..config import get_settings
+from ..models import User, UserProfile
+from ..models.user import user_roles
+from .role_service import get_role_catalog
+from .user_service import UserFilters
+
+settings = get_settings()
+
+ExportFormat = Literal["csv", "ndjson"]
+
+# Same names as the import columns, so an export can be imported again as is
+EXPORT_COLUMNS = (
+    "auth0_id", "email", "username", "first_name", "last_name", "is_active", "is_verified",
+    "created_at", "last_login", "avatar_url", "bio", "location", "phone_number", "roles",
+)
+
+# Encoded output is collected up to this size before it is handed to the response
+_FLUSH_BYTES = 64 * 1024
+
+
+def _export_query(filters: UserFilters) -> Select:
+    """One row per (user, role), ordered by user so a user's rows are adjacent."""
+    query = (
+        select(
+            User.id,
+            User.auth0_id,
+            User.email,
+            User.username,
+            User.first_name,
+            User.last_name,
+            User.is_active,
+            User.is_verified,
+            User.created_at,
+            User.last_login,
+            UserProfile.avatar_url,
+            UserProfile.bio,
+            UserProfile.location,
+            UserProfile.phone_number,
+            user_roles.c.role_id,
+        )
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .outerjoin(user_roles, user_roles.c.user_id == User.id)
+    )
+    return query.where(*filters.clauses()).order_by(User.id, user_roles.c.role_id)
+
+
+async def _iter_records(rows: AsyncIterable[Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Fold the joined rows back into one record per user, naming roles from the role catalog."""
+    catalog = get_role_catalog()
+    record = None
+    current_id = None
+    async for row in rows:
+        if row.id != current_id:
+            if record is not None:
+                yield record
+            current_id = row.id
+            record = {column: getattr(row, column) for column in EXPORT_COLUMNS[:-1]}
+            record["roles"] = []
+        role = catalog.by_id(row.role_id) if row.role_id is not None else None
+        if role is not None and role.name.value not in record["roles"]:
+            record["roles"].append(role.name.value)
+    if record is not None:
+        yield record
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return "|".join(value)
+    return value
+
+
+async def _encode(records: AsyncIterable[Dict[str, Any]], export_format: ExportFormat) -> AsyncIterator[str]:
+    """Text of the export in blocks of roughly _FLUSH_BYTES."""
+    buffer = io.StringIO()
+    if export_format == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(EXPORT_COLUMNS)
+        async for record in records:
+            writer.writerow([_csv_value(record[column]) for column in EXPORT_COLUMNS])
+            if buffer.tell() >= _FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    else:
+        async for record in records:
+            buffer.write(json.dumps(record, default=_json_default, separators=(",", ":")))
+            buffer.write("\n")
+            if buffer.tell() >= _FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def export_users(
+        db: AsyncSession,
+        export_format: ExportFormat = "ndjson",
+        filters: UserFilters = UserFilters(),
+        compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Stream every matching user with profile and roles as CSV or NDJSON bytes.
+
+    Rows come from a server-side cursor BULK_EXPORT_YIELD_PER at a time and are
+    encoded as they arrive, so memory use does not grow with the table. The
+    export runs in a single transaction and sees one consistent snapshot. With
+    ``compress`` the output is a gzip stream.
+    """
+    query = _export_query(filters).execution_options(yield_per=settings.BULK_EXPORT_YIELD_PER)
+    result = await db.stream(query)
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    try:
+        async for text in _encode(_iter_records(result), export_format):
+            data = text.encode("utf-8")
+            if compressor is None:
+                yield data
+            else:
+                data = compressor.compress(data)
+                if data:
+                    yield data
+        if compressor is not None:
+            yield compressor.flush()
+    finally:
+        await result.close()
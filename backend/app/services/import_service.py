@@ -0,0 +1,373 @@
+# backend/app/services/import_service.py
+import codecs
+import csv
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Literal, Optional, Set, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import get_settings
+from ..models.role import RoleType
+from ..schemas.profile import UserProfileUpdate
+from ..schemas.user import UserCreate
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+_USER_FIELDS = ("auth0_id", "email", "username", "first_name", "last_name", "is_active")
+_PROFILE_FIELDS = ("avatar_url", "bio", "location", "phone_number")
+_STAGING_COLUMNS = ("row_number",) + _USER_FIELDS + _PROFILE_FIELDS + ("roles",)
+_ROLE_SEPARATORS = re.compile(r"[,|;]")
+
+# Staged rows: row number, then the columns above in order
+StagedRow = Tuple[Any, ...]
+
+_CREATE_STAGING = """
+    CREATE TEMPORARY TABLE user_import_staging (
+        row_number integer NOT NULL,
+        auth0_id varchar(128) NOT NULL,
+        email varchar(255) NOT NULL,
+        username varchar(50) NOT NULL,
+        first_name varchar(50) NOT NULL,
+        last_name varchar(50) NOT NULL,
+        is_active boolean NOT NULL,
+        avatar_url varchar(255),
+        bio text,
+        location varchar(100),
+        phone_number varchar(20),
+        roles text
+    ) ON COMMIT DROP
+"""
+
+# Rows whose email or username already belongs to a different user would abort the
+# whole upsert with a unique violation, so they are reported and dropped first.
+# Emails compare case-insensitively, as in the in-upload dedupe.
+_FIND_CONFLICTS = """
+    SELECT s.row_number,
+           CASE WHEN EXISTS (
+               SELECT 1 FROM "user" u WHERE lower(u.email) = lower(s.email) AND u.auth0_id <> s.auth0_id
+           ) THEN 'email' ELSE 'username' END
+    FROM user_import_staging s
+    WHERE EXISTS (SELECT 1 FROM "user" u WHERE lower(u.email) = lower(s.email) AND u.auth0_id <> s.auth0_id)
+       OR EXISTS (SELECT 1 FROM "user" u WHERE u.username = s.username AND u.auth0_id <> s.auth0_id)
+"""
+
+_DROP_ROWS = "DELETE FROM user_import_staging WHERE row_number = ANY(%s)"
+
+_UPSERT_USERS = """
+    WITH upserted AS (
+        INSERT INTO "user" (
+            auth0_id, email, username, first_name, last_name, is_active, is_verified, created_at, updated_at
+        )
+        SELECT auth0_id, email, username, first_name, last_name, is_active, false,
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM user_import_staging
+        ON CONFLICT (auth0_id) DO UPDATE SET
+            email = EXCLUDED.email,
+            username = EXCLUDED.username,
+            first_name = EXCLUDED.first_name,
+            last_name = EXCLUDED.last_name,
+            is_active = EXCLUDED.is_active,
+            updated_at = CURRENT_TIMESTAMP,
+            version = "user".version + 1
+        RETURNING xmax = 0 AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+"""
+
+_HAS_PROFILE = "COALESCE(s.avatar_url, s.bio, s.location, s.phone_number) IS NOT NULL"
+
+_UPDATE_PROFILES = f"""
+    UPDATE user_profile p SET
+        avatar_url = COALESCE(s.avatar_url, p.avatar_url),
+        bio = COALESCE(s.bio, p.bio),
+        location = COALESCE(s.location, p.location),
+        phone_number = COALESCE(s.phone_number, p.phone_number),
+        updated_at = CURRENT_TIMESTAMP,
+        version = p.version + 1
+    FROM user_import_staging s
+    JOIN "user" u ON u.auth0_id = s.auth0_id
+    WHERE p.user_id = u.id AND {_HAS_PROFILE}
+"""
+
+_INSERT_PROFILES = f"""
+    INSERT INTO user_profile (user_id, avatar_url, bio, location, phone_number, created_at, updated_at)
+    SELECT u.id, s.avatar_url, s.bio, s.location, s.phone_number, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM user_import_staging s
+    JOIN "user" u ON u.auth0_id = s.auth0_id
+    WHERE {_HAS_PROFILE}
+      AND NOT EXISTS (SELECT 1 FROM user_profile p WHERE p.user_id = u.id)
+"""
+
+# Like profile columns left empty, role assignments are additive: existing ones are kept
+_INSERT_ROLES = """
+    INSERT INTO user_roles (user_id, role_id)
+    SELECT u.id, r.id
+    FROM user_import_staging s
+    JOIN "user" u ON u.auth0_id = s.auth0_id
+    CROSS JOIN LATERAL unnest(string_to_array(s.roles, ',')) AS assigned(name)
+    JOIN role r ON r.name::text = assigned.name
+    WHERE s.roles IS NOT NULL
+    ON CONFLICT DO NOTHING
+"""
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload can't be parsed at all, e.g. a CSV without a header."""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import. Only the first ``max_errors`` row errors are kept."""
+    max_errors: int
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row_number: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "error": error})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines, keeping line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _iter_csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Union[Dict, str]]]:
+    header: Optional[List[str]] = None
+    record = ""
+    row_number = 0
+    async for line in lines:
+        record += line
+        if record.count('"') % 2:
+            # A quoted field continues on the next line
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+
+        if header is None:
+            header = [name.strip() for name in values]
+            missing = [name for name in ("auth0_id", "email", "username") if name not in header]
+            if missing:
+                raise ImportFormatError(f"CSV header is missing columns: {', '.join(missing)}")
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield row_number, dict(zip(header, values))
+
+    if header is None:
+        raise ImportFormatError("CSV upload has no header row")
+    if record.strip():
+        yield row_number + 1, "Unterminated quoted field"
+
+
+async def _iter_ndjson_rows(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Union[Dict, str]]]:
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, "Invalid JSON"
+            continue
+        yield row_number, row if isinstance(row, dict) else "Expected a JSON object"
+
+
+def _parse_roles(value: Any) -> List[str]:
+    names = _ROLE_SEPARATORS.split(value) if isinstance(value, str) else value
+    if not isinstance(names, list):
+        raise ValueError("roles must be a list or a separated string")
+    roles = []
+    for name in names:
+        name = str(name).strip().upper()
+        if not name:
+            continue
+        if name not in RoleType.__members__:
+            raise ValueError(f"Unknown role: {name}")
+        roles.append(name)
+    return roles
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def validate_row(row_number: int, row: Dict) -> StagedRow:
+    """Validate one uploaded row against UserCreate/UserProfileUpdate and stage it.
+
+    Empty CSV cells count as missing. Raises ValueError with a readable message.
+    """
+    values = {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key and value is not None
+    }
+    values = {key: value for key, value in values.items() if value != ""}
+    try:
+        user = UserCreate.model_validate({key: values[key] for key in _USER_FIELDS if key in values})
+        # Profile columns are checked against the profile schema; user_id only exists after the merge
+        profile = UserProfileUpdate.model_validate({key: values[key] for key in _PROFILE_FIELDS if key in values})
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e))
+    roles = _parse_roles(values.get("roles", []))
+
+    return (
+        row_number,
+        user.auth0_id,
+        str(user.email),
+        user.username,
+        user.first_name,
+        user.last_name,
+        user.is_active,
+        str(profile.avatar_url) if profile.avatar_url else None,
+        profile.bio,
+        profile.location,
+        profile.phone_number,
+        ",".join(roles) if roles else None,
+    )
+
+
+class UserImporter:
+    """Loads users, profiles and role assignments from a CSV or NDJSON stream.
+
+    Rows are validated and merged in chunks of ``chunk_size``. Each chunk is
+    COPYed into a temporary staging table and merged into ``user``,
+    ``user_profile`` and ``user_roles`` in a single transaction, so the upload is
+    never held in memory and every chunk costs a handful of statements. Bad rows
+    are reported and skipped; they never abort the batch. The upsert arbiter is
+    ``auth0_id``. A row whose email or username belongs to another user is
+    reported as a conflict, and so is a row repeating an earlier row's
+    auth0_id, email or username.
+    """
+
+    def __init__(self, engine: AsyncEngine, chunk_size: int, max_errors: int):
+        if engine.dialect.name != "postgresql":
+            raise RuntimeError("Bulk import uses COPY and requires PostgreSQL")
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def run(self, chunks: AsyncIterable[bytes], import_format: ImportFormat) -> ImportReport:
+        report = ImportReport(max_errors=self.max_errors)
+        lines = _iter_lines(chunks)
+        rows = _iter_csv_rows(lines) if import_format == "csv" else _iter_ndjson_rows(lines)
+        seen: Dict[str, Set[str]] = {"auth0_id": set(), "email": set(), "username": set()}
+
+        async with self.engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            pg = raw_connection.driver_connection
+
+            batch: List[StagedRow] = []
+            async for row_number, row in rows:
+                report.rows += 1
+                staged = self._stage(row_number, row, seen, report)
+                if staged is not None:
+                    batch.append(staged)
+                if len(batch) >= self.chunk_size:
+                    await self._merge_chunk(pg, batch, report)
+                    batch = []
+            if batch:
+                await self._merge_chunk(pg, batch, report)
+
+        logger.info(
+            f"User import finished: {report.rows} rows, {report.inserted} inserted, "
+            f"{report.updated} updated, {report.failed} failed"
+        )
+        return report
+
+    @staticmethod
+    def _stage(
+            row_number: int,
+            row: Union[Dict, str],
+            seen: Dict[str, Set[str]],
+            report: ImportReport
+    ) -> Optional[StagedRow]:
+        if isinstance(row, str):
+            report.add_error(row_number, row)
+            return None
+        try:
+            staged = validate_row(row_number, row)
+        except ValueError as e:
+            report.add_error(row_number, str(e))
+            return None
+
+        keys = {"auth0_id": staged[1], "email": staged[2].lower(), "username": staged[3]}
+        for name, value in keys.items():
+            if value in seen[name]:
+                report.add_error(row_number, f"Duplicate {name} earlier in this upload")
+                return None
+        for name, value in keys.items():
+            seen[name].add(value)
+        return staged
+
+    async def _merge_chunk(self, pg: Any, batch: List[StagedRow], report: ImportReport) -> None:
+        try:
+            async with pg.transaction():
+                async with pg.cursor() as cur:
+                    await cur.execute(_CREATE_STAGING)
+                    async with cur.copy(
+                        f"COPY user_import_staging ({', '.join(_STAGING_COLUMNS)}) FROM STDIN"
+                    ) as copy:
+                        for staged in batch:
+                            await copy.write_row(staged)
+
+                    await cur.execute(_FIND_CONFLICTS)
+                    conflicts = await cur.fetchall()
+                    if conflicts:
+                        await cur.execute(_DROP_ROWS, ([row_number for row_number, _ in conflicts],))
+
+                    await cur.execute(_UPSERT_USERS)
+                    inserted, updated = await cur.fetchone()
+                    await cur.execute(_UPDATE_PROFILES)
+                    await cur.execute(_INSERT_PROFILES)
+                    await cur.execute(_INSERT_ROLES)
+        except Exception as e:
+            # The chunk rolled back as a whole; report its rows and carry on with the next one
+            logger.error(f"User import chunk failed: {str(e)}")
+            for staged in batch:
+                report.add_error(staged[0], f"Chunk failed: {str(e)}")
+            return
+
+        for row_number, column in conflicts:
+            report.add_error(row_number, f"{column} already belongs to another user")
+        report.inserted += inserted
+        report.updated += updated
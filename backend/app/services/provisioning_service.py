@@ -0,0 +1,273 @@
+# backend/app/services/provisioning_service.py
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import exists, func, insert, literal, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import get_settings
+from ..core.security.roles import resolve_masks
+from ..core.security.user_auth import Principal
+from ..db.session import AsyncSessionLocal
+from ..models import RoleType, User
+from ..models.user import user_roles
+from .role_service import get_role_catalog
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ProfileFetcher = Callable[[], Awaitable[Dict]]
+
+
+class ProvisioningError(Exception):
+    """The Auth0 subject can't be linked to a local user."""
+
+
+@dataclass(frozen=True)
+class LocalUser:
+    """The local user behind an Auth0 subject, with its locally assigned roles as masks."""
+    user_id: int
+    role_mask: int
+    permission_mask: int
+
+    @classmethod
+    def from_roles(cls, user_id: int, roles: Iterable[RoleType]) -> "LocalUser":
+        role_mask, permission_mask = resolve_masks(tuple(sorted(role.value for role in roles)))
+        return cls(user_id=user_id, role_mask=role_mask, permission_mask=permission_mask)
+
+
+def _user_values(sub: str, claims: Mapping[str, Any], user_info: Mapping[str, Any]) -> Dict[str, Any]:
+    """Columns for a new local user, taken from /userinfo with the token claims as fallback."""
+    info = {**claims, **user_info}
+    email = info.get("email")
+    if not email:
+        raise ProvisioningError(f"No email available for {sub}")
+    username = (info.get("nickname") or email.split("@")[0])[:50]
+    return {
+        "auth0_id": sub,
+        "email": email[:255],
+        "username": username,
+        "first_name": (info.get("given_name") or info.get("name") or username)[:50],
+        "last_name": (info.get("family_name") or "")[:50],
+        "is_verified": bool(info.get("email_verified", False)),
+    }
+
+
+def _unique_username(username: str, sub: str) -> str:
+    """``username`` with a suffix derived from ``sub``, for when the plain name is taken."""
+    suffix = hashlib.sha256(sub.encode("utf-8")).hexdigest()[:8]
+    return f"{username[:41]}_{suffix}"
+
+
+class UserProvisioner:
+    """Links Auth0 subjects to local users, creating the user the first time it is seen.
+
+    ``resolve`` answers from a bounded in-process cache, so a known subject costs
+    a dict lookup. On a miss, one query loads the user id and roles. A subject
+    without a local row is provisioned with a single INSERT ... ON CONFLICT
+    (auth0_id) DO UPDATE, and new users get the USER role. Concurrent misses for
+    the same subject share one lookup.
+
+    Entries expire after ``ttl`` seconds, so changes made by other processes show
+    up within the TTL. Within this process, call ``invalidate`` or ``clear``
+    after changing a user's roles or deleting a user. A lookup that fails, e.g.
+    because the database is down, is remembered as unresolved for
+    ``failure_ttl`` seconds, so an outage doesn't cost every request a timeout.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, max_entries: int, ttl: int, failure_ttl: int = 5):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        # None marks a subject that could not be provisioned, so it isn't retried per request
+        self._entries: "OrderedDict[str, Tuple[float, Optional[LocalUser]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Bumped on invalidation, so a lookup that started before it doesn't store a stale entry
+        self._generation = 0
+
+    def cached(self, principal: Principal) -> Optional[Principal]:
+        """``principal`` linked from the cache alone, or None when it would take a lookup.
+
+        Subjects cached as unresolved come back unchanged.
+        """
+        entry = self._entries.get(principal.sub)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(principal.sub)
+        local = entry[1]
+        if local is None:
+            return principal
+        return principal.with_local_user(local.user_id, local.role_mask, local.permission_mask)
+
+    async def resolve(self, principal: Principal, fetch_profile: ProfileFetcher) -> Principal:
+        """Return ``principal`` linked to its local user, provisioning the user if needed.
+
+        ``fetch_profile`` returns the Auth0 /userinfo response; it is only called
+        when a new user has to be created. Subjects that can't be provisioned are
+        returned unchanged.
+        """
+        sub = principal.sub
+        entry = self._entries.get(sub)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(sub)
+            local = entry[1]
+        else:
+            task = self._inflight.get(sub)
+            if task is None:
+                task = asyncio.create_task(self._lookup(sub, dict(principal.claims), fetch_profile))
+                task.add_done_callback(lambda _: self._inflight.pop(sub, None))
+                self._inflight[sub] = task
+            # Shield so one cancelled request doesn't abort the lookup others are waiting on
+            local = await asyncio.shield(task)
+
+        if local is None:
+            return principal
+        return principal.with_local_user(local.user_id, local.role_mask, local.permission_mask)
+
+    async def provision(self, claims: Mapping[str, Any], user_info: Mapping[str, Any]) -> LocalUser:
+        """Create or update the local user for a login and cache the result.
+
+        Raises ProvisioningError when the user can't be stored, e.g. because its
+        email belongs to another local user.
+        """
+        sub = claims.get("sub")
+        generation = self._generation
+        try:
+            local = await self._upsert(_user_values(sub, claims, user_info))
+        except ProvisioningError:
+            self._store(sub, None, generation)
+            raise
+        self._store(sub, local, generation)
+        return local
+
+    def invalidate(self, sub: Optional[str]) -> None:
+        """Forget ``sub``; its next request loads the user again."""
+        if not sub:
+            return
+        self._generation += 1
+        self._entries.pop(sub, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def _lookup(self, sub: str, claims: Dict, fetch_profile: ProfileFetcher) -> Optional[LocalUser]:
+        generation = self._generation
+        try:
+            async with self.session_factory() as db:
+                local = await self._load(db, sub)
+        except Exception as e:
+            logger.error(f"Could not load local user for {sub}: {str(e)}")
+            self._store(sub, None, generation, ttl=self.failure_ttl)
+            return None
+        if local is not None:
+            self._store(sub, local, generation)
+            return local
+
+        try:
+            return await self.provision(claims, await fetch_profile())
+        except ProvisioningError as e:
+            logger.warning(f"Could not provision local user for {sub}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to provision local user for {sub}: {str(e)}")
+            self._store(sub, None, generation, ttl=self.failure_ttl)
+            return None
+
+    @staticmethod
+    async def _load(db: AsyncSession, sub: str) -> Optional[LocalUser]:
+        query = (
+            select(User.id, user_roles.c.role_id)
+            .outerjoin(user_roles, user_roles.c.user_id == User.id)
+            .where(User.auth0_id == sub)
+        )
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return None
+        role_ids = [row.role_id for row in rows if row.role_id is not None]
+        return LocalUser.from_roles(rows[0].id, get_role_catalog().names(role_ids))
+
+    async def _upsert(self, values: Dict[str, Any]) -> LocalUser:
+        async with self.session_factory() as db:
+            try:
+                user_id = await self._upsert_user(db, values)
+            except IntegrityError:
+                # The username belongs to someone else; an email clash fails again below
+                await db.rollback()
+                values = {**values, "username": _unique_username(values["username"], values["auth0_id"])}
+                try:
+                    user_id = await self._upsert_user(db, values)
+                except IntegrityError as e:
+                    await db.rollback()
+                    raise ProvisioningError(f"Email or username already in use: {values['email']}") from e
+
+            default_role = get_role_catalog().by_name(RoleType.USER)
+            if default_role is not None:
+                # Only users without any role get the default, so removed roles stay removed
+                await db.execute(
+                    insert(user_roles).from_select(
+                        ["user_id", "role_id"],
+                        select(literal(user_id), literal(default_role.id)).where(
+                            ~exists().where(user_roles.c.user_id == user_id)
+                        )
+                    )
+                )
+            local = await self._load(db, values["auth0_id"])
+            await db.commit()
+        return local
+
+    @staticmethod
+    async def _upsert_user(db: AsyncSession, values: Dict[str, Any]) -> int:
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(User).values(
+            **values,
+            is_active=True,
+            created_at=func.now(),
+            updated_at=func.now()
+        )
+        # Existing users keep their locally edited names; identity fields follow Auth0
+        statement = statement.on_conflict_do_update(
+            index_elements=[User.auth0_id],
+            set_={
+                "email": statement.excluded.email,
+                "is_verified": statement.excluded.is_verified,
+                "updated_at": statement.excluded.updated_at,
+                "version": User.version + 1,
+            },
+            # Unchanged logins leave the row, its version and its ETag alone
+            where=or_(
+                User.email != statement.excluded.email,
+                User.is_verified != statement.excluded.is_verified
+            )
+        ).returning(User.id)
+        user_id = (await db.execute(statement)).scalar_one_or_none()
+        if user_id is None:
+            user_id = await db.scalar(select(User.id).where(User.auth0_id == values["auth0_id"]))
+        return user_id
+
+    def _store(self, sub: str, local: Optional[LocalUser], generation: int, ttl: Optional[float] = None) -> None:
+        if generation != self._generation:
+            return
+        self._entries[sub] = (time.monotonic() + (self.ttl if ttl is None else ttl), local)
+        self._entries.move_to_end(sub)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@lru_cache()
+def get_user_provisioner() -> UserProvisioner:
+    return UserProvisioner(
+        AsyncSessionLocal,
+        max_entries=settings.LOCAL_USER_CACHE_MAX_ENTRIES,
+        ttl=settings.LOCAL_USER_CACHE_TTL_SECONDS,
+        failure_ttl=settings.LOCAL_USER_FAILURE_TTL_SECONDS,
+    )
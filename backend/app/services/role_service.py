@@ -0,0 +1,130 @@
+# backend/app/services/role_service.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+import psycopg
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from ..config import get_settings
+from ..db.session import AsyncSessionLocal, async_engine
+from ..models.role import ROLE_CHANGES_CHANNEL, Role, RoleType
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogRole:
+    """Immutable copy of a role row; validates as the Role response schema."""
+    id: int
+    name: RoleType
+    description: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    roles: Tuple[CatalogRole, ...]
+    by_id: Mapping[int, CatalogRole]
+    by_name: Mapping[RoleType, CatalogRole]
+
+
+class RoleCatalog:
+    """In-memory copy of the role table, so role lookups need no database round trip.
+
+    Loaded once at startup. A trigger on the role table sends a NOTIFY on every
+    change, and each worker keeps one LISTEN connection that reloads the catalog
+    when it fires. The catalog is also reloaded whenever the listener connects,
+    since notifications sent while it was away are lost. Reloads build a new
+    snapshot and swap it in whole, so readers never see a half-loaded catalog.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, engine: AsyncEngine, reconnect_interval: float):
+        self.session_factory = session_factory
+        self.engine = engine
+        self.reconnect_interval = reconnect_interval
+        self._snapshot = _Snapshot(roles=(), by_id=MappingProxyType({}), by_name=MappingProxyType({}))
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def roles(self) -> Tuple[CatalogRole, ...]:
+        return self._snapshot.roles
+
+    def by_id(self, role_id: int) -> Optional[CatalogRole]:
+        return self._snapshot.by_id.get(role_id)
+
+    def by_name(self, name: RoleType) -> Optional[CatalogRole]:
+        return self._snapshot.by_name.get(name)
+
+    def names(self, role_ids: Iterable[int]) -> List[RoleType]:
+        """Role names for ``role_ids``; ids missing from the catalog are skipped."""
+        by_id = self._snapshot.by_id
+        return [by_id[role_id].name for role_id in role_ids if role_id in by_id]
+
+    async def load(self) -> None:
+        """Read the role table and replace the catalog with it."""
+        async with self.session_factory() as db:
+            rows = (await db.scalars(select(Role).order_by(Role.id))).all()
+        roles = tuple(
+            CatalogRole(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        )
+        self._snapshot = _Snapshot(
+            roles=roles,
+            by_id=MappingProxyType({role.id: role for role in roles}),
+            by_name=MappingProxyType({role.name: role for role in roles}),
+        )
+        logger.info(f"Loaded role catalog with {len(roles)} roles")
+
+    async def start(self) -> None:
+        """Load the catalog and, on PostgreSQL, start listening for changes."""
+        await self.load()
+        if self._listener is None and self.engine.dialect.name == "postgresql":
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        # A dedicated connection outside the pool; LISTEN lasts as long as the connection
+        conninfo = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {ROLE_CHANGES_CHANNEL}")
+                    # Catch up on changes made before LISTEN took effect
+                    await self.load()
+                    async for _ in conn.notifies():
+                        await self.load()
+            except Exception as e:
+                logger.error(f"Role catalog listener failed, reconnecting in {self.reconnect_interval}s: {str(e)}")
+                await asyncio.sleep(self.reconnect_interval)
+
+
+@lru_cache()
+def get_role_catalog() -> RoleCatalog:
+    return RoleCatalog(
+        AsyncSessionLocal,
+        async_engine,
+        reconnect_interval=settings.ROLE_CATALOG_RECONNECT_SECONDS,
+    )
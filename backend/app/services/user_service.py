@@ -0,0 +1,339 @@
+# backend/app/services/user_service.py
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+from sqlalchemy import case, exists, false, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio.result import AsyncScalarResult
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.sql import Select
+
+from ..models import RoleType, User, UserProfile
+from ..models.user import SEARCH_SEPARATOR, SEARCH_TEXT, user_roles
+from ..utils.etag import make_etag
+from ..utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from .role_service import get_role_catalog
+
+LoadProfile = Literal["summary", "with_roles", "full"]
+UserSort = Literal["created_at", "email", "username"]
+SortOrder = Literal["asc", "desc"]
+
+# Columns the listing can seek on. Each is paired with id, so equal values still
+# give a strict order; created_at has the composite (created_at, id) index, email
+# and username have their unique indexes.
+_SORT_COLUMNS = {
+    "created_at": User.created_at,
+    "email": User.email,
+    "username": User.username,
+}
+
+# Rows fetched per round trip while streaming a page
+STREAM_CHUNK_SIZE = 100
+
+# pg_trgm can only use the index for terms of at least one trigram
+SEARCH_MIN_LENGTH = 3
+
+# Relationships each loading profile fetches up front. Anything not listed raises
+# on access instead of lazy loading, so a new N+1 shows up as an error in testing
+# rather than as one extra query per row in production.
+_LOAD_OPTIONS: Dict[str, Sequence] = {
+    "summary": (raiseload("*"),),
+    # selectinload: one extra IN query for the whole page, no row multiplication
+    "with_roles": (selectinload(User.roles), raiseload("*")),
+    # joinedload for the one-to-one profile, selectinload for the many-to-many roles
+    "full": (selectinload(User.roles), joinedload(User.profile), raiseload("*")),
+}
+
+
+def _user_etag(user_id: int, version: int, updated_at: datetime, role_ids: List[int],
+               profile_version: Optional[int], profile_updated_at: Optional[datetime]) -> str:
+    # last_login is left out: the write-behind buffer changes it without bumping the
+    # version, and counting it would fail every If-Match shortly after any activity
+    return make_etag("user", user_id, version, updated_at, sorted(role_ids), profile_version, profile_updated_at)
+
+
+def user_etag(user: User) -> str:
+    """ETag of a user loaded with the ``full`` profile."""
+    profile = user.profile
+    return _user_etag(
+        user.id,
+        user.version,
+        user.updated_at,
+        [role.id for role in user.roles],
+        profile.version if profile is not None else None,
+        profile.updated_at if profile is not None else None,
+    )
+
+
+def _profile_etag(profile_id: int, version: int, updated_at: datetime) -> str:
+    return make_etag("profile", profile_id, version, updated_at)
+
+
+def profile_etag(profile: UserProfile) -> str:
+    return _profile_etag(profile.id, profile.version, profile.updated_at)
+
+
+@dataclass(frozen=True)
+class UserFilters:
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    role: Optional[RoleType] = None
+
+    def clauses(self) -> List[Any]:
+        """WHERE clauses for the set filters; the role id comes from the role catalog."""
+        clauses = []
+        if self.is_active is not None:
+            clauses.append(User.is_active == self.is_active)
+        if self.is_verified is not None:
+            clauses.append(User.is_verified == self.is_verified)
+        if self.role is not None:
+            role = get_role_catalog().by_name(self.role)
+            if role is None:
+                clauses.append(false())
+            else:
+                # Aliased, so it doesn't correlate with a user_roles join in the outer query
+                links = user_roles.alias("role_filter")
+                clauses.append(exists().where(links.c.user_id == User.id, links.c.role_id == role.id))
+        return clauses
+
+
+@dataclass(frozen=True)
+class UserPage:
+    """Where a page of the listing starts: sort key, direction and last seen key."""
+    sort: UserSort = "created_at"
+    order: SortOrder = "asc"
+    after: Optional[Tuple[Any, int]] = None
+
+    def next_cursor(self, user: User) -> str:
+        """Opaque cursor for the page that follows ``user``."""
+        return encode_cursor({
+            "sort": self.sort,
+            "order": self.order,
+            "after": [getattr(user, self.sort), user.id],
+        })
+
+    @classmethod
+    def from_cursor(cls, cursor: str) -> "UserPage":
+        payload = decode_cursor(cursor)
+        sort, order, after = payload.get("sort"), payload.get("order"), payload.get("after")
+        if sort not in _SORT_COLUMNS or order not in ("asc", "desc"):
+            raise InvalidCursorError("Invalid cursor")
+        try:
+            value, last_id = after
+            if sort == "created_at":
+                value = datetime.fromisoformat(value)
+            return cls(sort=sort, order=order, after=(value, int(last_id)))
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Invalid cursor") from e
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_rank(term: str) -> Any:
+    """0 for an exact email or username, 1 for a prefix of either, 2 for a name
+    prefix and 3 for a match anywhere else."""
+    prefix = _escape_like(term) + "%"
+    email, username = func.lower(User.email), func.lower(User.username)
+    full_name = func.lower(User.first_name + SEARCH_SEPARATOR + User.last_name)
+    return case(
+        (or_(email == term, username == term), 0),
+        (or_(email.like(prefix, escape="\\"), username.like(prefix, escape="\\")), 1),
+        (or_(full_name.like(prefix, escape="\\"), func.lower(User.last_name).like(prefix, escape="\\")), 2),
+        else_=3
+    )
+
+
+@dataclass(frozen=True)
+class UserSearch:
+    """A search term and filters and, past the first page, the last (rank, username) seen."""
+    term: str
+    filters: UserFilters = UserFilters()
+    after: Optional[Tuple[int, str]] = None
+
+    @classmethod
+    def from_query(cls, query: str, filters: UserFilters = UserFilters()) -> "UserSearch":
+        """Search for ``query``, case-insensitive and with whitespace collapsed."""
+        return cls(term=" ".join(query.lower().split()), filters=filters)
+
+    def _fingerprint(self) -> str:
+        # Binds a cursor to the term and filters; ranks and usernames mean nothing under others
+        role = self.filters.role.value if self.filters.role is not None else None
+        raw = json.dumps([self.term, self.filters.is_active, self.filters.is_verified, role])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def next_cursor(self, rank: int, user: User) -> str:
+        """Opaque cursor for the page that follows ``user``."""
+        return encode_cursor({"search": self._fingerprint(), "after": [rank, user.username]})
+
+    def resume(self, cursor: str) -> "UserSearch":
+        """This search from the position in ``cursor``, which must come from the same search."""
+        payload = decode_cursor(cursor)
+        if "search" not in payload or "after" not in payload:
+            raise InvalidCursorError("Invalid cursor")
+        if payload["search"] != self._fingerprint():
+            raise InvalidCursorError("Cursor belongs to a different search")
+        try:
+            rank, username = payload["after"]
+            if not isinstance(username, str):
+                raise InvalidCursorError("Invalid cursor")
+            return replace(self, after=(int(rank), username))
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Invalid cursor") from e
+
+
+class UserService:
+    """Read and write users with an explicit loading profile per query.
+
+    ``summary`` loads only the user row, ``with_roles`` adds roles and ``full``
+    adds roles and profile. A query costs a fixed number of statements whatever
+    the number of rows: 1 for summary and 2 for with_roles or full. Streamed
+    listings repeat the roles query once per chunk of STREAM_CHUNK_SIZE rows.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _select(load: LoadProfile) -> Select:
+        return select(User).options(*_LOAD_OPTIONS[load])
+
+    async def get_by_id(self, user_id: int, load: LoadProfile = "full") -> Optional[User]:
+        return (await self.db.scalars(self._select(load).where(User.id == user_id))).first()
+
+    async def get_by_auth0_id(self, auth0_id: str, load: LoadProfile = "full") -> Optional[User]:
+        return (await self.db.scalars(self._select(load).where(User.auth0_id == auth0_id))).first()
+
+    def _page_query(self, page: UserPage, filters: UserFilters, limit: int, load: LoadProfile) -> Select:
+        key = (_SORT_COLUMNS[page.sort], User.id)
+        query = self._select(load).where(*filters.clauses())
+
+        if page.after is not None:
+            # Row-value comparison seeks straight to the position through the index
+            position = tuple_(*key)
+            after = tuple_(*page.after)
+            query = query.where(position < after if page.order == "desc" else position > after)
+
+        order_by = [column.desc() for column in key] if page.order == "desc" else list(key)
+        return query.order_by(*order_by).limit(limit)
+
+    async def list_users(
+            self,
+            page: UserPage = UserPage(),
+            filters: UserFilters = UserFilters(),
+            limit: int = 50,
+            load: LoadProfile = "with_roles"
+    ) -> List[User]:
+        """One keyset page of users."""
+        return list((await self.db.scalars(self._page_query(page, filters, limit, load))).all())
+
+    async def stream_users(
+            self,
+            page: UserPage = UserPage(),
+            filters: UserFilters = UserFilters(),
+            limit: int = 50,
+            load: LoadProfile = "with_roles"
+    ) -> AsyncScalarResult:
+        """Like list_users, but rows arrive in chunks; the caller closes the result."""
+        query = self._page_query(page, filters, limit, load).execution_options(yield_per=STREAM_CHUNK_SIZE)
+        return await self.db.stream_scalars(query)
+
+    async def search_users(
+            self,
+            search: UserSearch,
+            limit: int = 10,
+            load: LoadProfile = "with_roles"
+    ) -> List[Tuple[User, int]]:
+        """One keyset page of users matching ``search.term`` and ``search.filters``, best matches first.
+
+        Users whose email, username or names contain the term, ordered by
+        _search_rank and then username. On PostgreSQL the substring match is
+        served by the ix_user_search_trgm trigram index. Returns (user, rank)
+        pairs; the rank of the last one goes into the next cursor.
+        """
+        rank = _search_rank(search.term)
+        query = (
+            select(User, rank.label("rank"))
+            .options(*_LOAD_OPTIONS[load])
+            .where(SEARCH_TEXT.like(f"%{_escape_like(search.term)}%", escape="\\"), *search.filters.clauses())
+        )
+        if search.after is not None:
+            query = query.where(tuple_(rank, User.username) > tuple_(*search.after))
+        query = query.order_by(rank, User.username).limit(limit)
+        return [(user, user_rank) for user, user_rank in (await self.db.execute(query)).all()]
+
+    async def current_user_etag(self, auth0_id: str) -> Optional[str]:
+        """ETag of the user's current ``full`` representation, from version columns only."""
+        query = (
+            select(
+                User.id,
+                User.version,
+                User.updated_at,
+                UserProfile.version.label("profile_version"),
+                UserProfile.updated_at.label("profile_updated_at"),
+                user_roles.c.role_id,
+            )
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .outerjoin(user_roles, user_roles.c.user_id == User.id)
+            .where(User.auth0_id == auth0_id)
+        )
+        rows = (await self.db.execute(query)).all()
+        if not rows:
+            return None
+        first = rows[0]
+        return _user_etag(
+            first.id,
+            first.version,
+            first.updated_at,
+            [row.role_id for row in rows if row.role_id is not None],
+            first.profile_version,
+            first.profile_updated_at,
+        )
+
+    async def current_profile_etag(self, auth0_id: str) -> Optional[str]:
+        query = (
+            select(UserProfile.id, UserProfile.version, UserProfile.updated_at)
+            .join(UserProfile.user)
+            .where(User.auth0_id == auth0_id)
+        )
+        row = (await self.db.execute(query)).first()
+        return _profile_etag(row.id, row.version, row.updated_at) if row is not None else None
+
+    async def update_user(self, user: User, changes: Dict[str, Any]) -> User:
+        """Apply ``changes`` and commit.
+
+        The UPDATE is conditional on the version the user was loaded with, so a
+        concurrent change raises StaleDataError instead of being overwritten.
+        """
+        for name, value in changes.items():
+            setattr(user, name, value)
+        await self.db.commit()
+        return user
+
+    async def save_profile(self, user: User, changes: Dict[str, Any]) -> UserProfile:
+        """Apply ``changes`` to the user's profile, creating it if needed, and commit.
+
+        Same version check as update_user.
+        """
+        profile = user.profile
+        if profile is None:
+            profile = UserProfile(**changes)
+            user.profile = profile
+        else:
+            for name, value in changes.items():
+                setattr(profile, name, value)
+        await self.db.commit()
+        return profile
+
+    async def get_profile_by_auth0_id(self, auth0_id: str) -> Optional[UserProfile]:
+        query = (
+            select(UserProfile)
+            .join(UserProfile.user)
+            .where(User.auth0_id == auth0_id)
+            .options(raiseload("*"))
+        )
+        return (await self.db.scalars(query)).first()
@@ -0,0 +1,62 @@
+# backend/app/utils/etag.py
+import hashlib
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import Response, status
+
+
+def _etag_part(part: Any) -> str:
+    # Timestamp columns are naive UTC; values set in Python may still carry tzinfo
+    if isinstance(part, datetime):
+        part = part.replace(tzinfo=None)
+    return str(part)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) for a representation identified by ``parts``."""
+    digest = hashlib.sha256("|".join(_etag_part(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _entity_tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """Whether ``If-None-Match`` matches ``etag``, i.e. a GET can be answered with 304.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    if not header:
+        return False
+    for tag in _entity_tags(header):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def if_match(header: Optional[str], etag: Optional[str]) -> bool:
+    """Whether the ``If-Match`` precondition holds for the current ``etag``.
+
+    Uses strong comparison, so weak tags never match. A missing header always
+    holds; ``*`` holds when the resource exists (``etag`` is not None).
+    """
+    if header is None:
+        return True
+    if etag is None:
+        return False
+    return any(tag == "*" or tag == etag for tag in _entity_tags(header))
+
+
+# Browsers may store the response but must revalidate it, sending If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,57 @@
+# backend/app/utils/http_client.py
+import logging
+from typing import Optional
+
+import httpx
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a connection-pooled, keep-alive async client for outbound calls.
+
+    Every outbound call goes to the Auth0 tenant, so the pool-wide limits act as
+    the per-host connection limit.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client. Called once from the application lifespan."""
+    global _http_client
+    if _http_client is None:
+        _http_client = create_http_client()
+        logger.info("Started shared HTTP client")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Closed shared HTTP client")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Dependency returning the shared client started in the lifespan."""
+    if _http_client is None:
+        raise RuntimeError("HTTP client is not running; it is started in the application lifespan")
+    return _http_client
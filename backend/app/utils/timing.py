@@ -0,0 +1,30 @@
+# backend/app/utils/timing.py
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class PhaseTimer:
+    """Times the named phases of a longer operation, such as startup, and logs each one."""
+
+    def __init__(self, logger: logging.Logger, label: str):
+        self.logger = logger
+        self.label = label
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (time.perf_counter() - started) * 1000
+            self.logger.info(f"{self.label} phase {name} took {self.timings[name]:.1f} ms")
+
+    def summary(self) -> str:
+        """Total elapsed time followed by every phase, in the order they ran."""
+        total = (time.perf_counter() - self._started) * 1000
+        phases = ", ".join(f"{name}={elapsed:.1f}ms" for name, elapsed in self.timings.items())
+        return f"{self.label} took {total:.1f} ms ({phases})"
@@ -3,15 +3,29 @@ import logging
 from typing import Any
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.responses import JSONResponse
+from app.auth.auth0 import has_role
 from app.config import get_settings
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.middleware.cors_middleware import setup_cors
+from app.middleware.authentication_middleware import AuthenticationMiddleware
+from app.middleware.query_metrics_middleware import QueryMetricsMiddleware
 from app.api.v1.routes.user_routes import router as user_router
 from app.api.v1.routes.profile_routes import router as profile_router
 from app.api.v1.routes.auth_routes import router as auth_router
+from app.api.v1.routes.admin_routes import router as admin_router
 from app.db.init_db import init_db
+from app.db.session import dispose_engines
+from app.db.pool_metrics import get_pool_metrics
+from app.utils.http_client import start_http_client, close_http_client
+from app.utils.timing import PhaseTimer
+from app.core.security.jwks import get_jwks_provider
+from app.core.security.token_verifier import get_token_verifier
+from app.core.security.token_store import get_session_store
+from app.core.security.token_manager import get_session_token_manager
+from app.services.activity_service import get_last_login_buffer
+from app.services.role_service import get_role_catalog
 
 
 ua = "uvicorn.access"
@@ -46,11 +60,26 @@ async def lifespan(_: FastAPI):
     Handles startup and shutdown events.
     """
     # Startup
+    timer = PhaseTimer(logger, "Startup")
     try:
         logger.info("Starting up application...")
+        with timer.phase("http_client"):
+            await start_http_client()
+            get_token_verifier().start()
+        logger.info("Loading JWKS signing keys...")
+        with timer.phase("jwks"):
+            await get_jwks_provider().start()
+        if settings.AUTH_MODE == "session":
+            with timer.phase("session_store"):
+                await get_session_store().start()
+                await get_session_token_manager().start()
         logger.info("Initializing database...")
-        init_db()
+        await init_db(timer=timer)
         logger.info("Database initialization completed successfully")
+        with timer.phase("role_catalog"):
+            await get_role_catalog().start()
+        await get_last_login_buffer().start()
+        logger.info(timer.summary())
         yield
     except Exception as e:
         logger.error(f"Startup failed: {str(e)}")
@@ -61,6 +90,15 @@ async def lifespan(_: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down application...")
+        await get_session_token_manager().stop()
+        # Before the engines go away: the final flush still needs the database
+        await get_last_login_buffer().stop()
+        await get_role_catalog().stop()
+        await get_session_store().stop()
+        await get_jwks_provider().stop()
+        await get_token_verifier().close()
+        await close_http_client()
+        await dispose_engines()
 
 
 # Initialize FastAPI with lifespan
@@ -89,6 +127,15 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             )
 
 
+# Verify the caller's token once per request; innermost so CORS preflights skip it
+# noinspection PyTypeChecker
+app.add_middleware(AuthenticationMiddleware)
+
+# Outside authentication, so the queries that resolve the local user are counted too
+if settings.DB_QUERY_METRICS:
+    # noinspection PyTypeChecker
+    app.add_middleware(QueryMetricsMiddleware)
+
 # Configure CORS
 setup_cors(app)
 
@@ -116,17 +163,26 @@ app.include_router(
     tags=["User Profile"]
 )
 
+app.include_router(
+    admin_router,
+    prefix="/api/admin",
+    tags=["Administration"]
+)
+
 
 # Public Health Check Endpoint
 @app.get("/api/health", tags=["Health"])
 async def health_check():
     """Health check endpoint to verify service status"""
     try:
+        jwks_provider = get_jwks_provider()
         return {
             "status": "healthy",
             "version": settings.API_VERSION,
             "debug_mode": settings.DEBUG,
             "environment": settings.ENVIRONMENT,
+            "jwks_last_refreshed_at": jwks_provider.last_refreshed_at,
+            "jwks_key_count": len(jwks_provider.key_ids),
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -142,6 +198,13 @@ async def health_check():
         )
 
 
+# Pool internals aren't public, unlike /api/health
+@app.get("/api/health/db", tags=["Health"], dependencies=[Depends(has_role(["admin"]))])
+async def database_pool_metrics():
+    """Connection pool gauges and counters, to tell pool starvation from slow queries (admin only)"""
+    return {"pools": get_pool_metrics()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,88 @@
+# backend/tests/conftest.py
+import os
+from typing import Dict, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+# Settings are validated on import; tests run against SQLite, so placeholders suffice
+for name, value in {
+    "AUTH0_DOMAIN": "example.auth0.com",
+    "AUTH0_AUDIENCE": "https://api.example.com",
+    "AUTH0_CLIENT_ID": "test-client",
+    "AUTH0_CLIENT_SECRET": "test-secret",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+async def sqlite_engine():
+    """Empty in-memory SQLite database; StaticPool keeps it alive across connections."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def engine(sqlite_engine):
+    """In-memory SQLite database with every table created."""
+    # Imported here: app modules read settings on import, after the variables above are set
+    from app.db import Base
+
+    async with sqlite_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return sqlite_engine
+
+
+@pytest.fixture
+def session_factory(engine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+async def roles(session_factory) -> Dict:
+    """One row per RoleType, keyed by type."""
+    from app.models import Role, RoleType
+
+    async with session_factory() as db:
+        rows = {role_type: Role(name=role_type, description=role_type.value) for role_type in RoleType}
+        db.add_all(rows.values())
+        await db.commit()
+    return rows
+
+
+@pytest.fixture
+def statements(sqlite_engine) -> List[str]:
+    """SQL statements executed on the test database; tests clear it once seeding is done."""
+    executed: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(sqlite_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def load_role_catalog():
+    """Point the process-wide role catalog at a test database and load it; restored afterwards."""
+    # Imported here: app modules read settings on import, after the variables above are set
+    from app.services.role_service import get_role_catalog
+
+    catalog = get_role_catalog()
+    session_factory, snapshot = catalog.session_factory, catalog._snapshot
+
+    async def load(test_session_factory) -> None:
+        catalog.session_factory = test_session_factory
+        await catalog.load()
+
+    yield load
+    catalog.session_factory, catalog._snapshot = session_factory, snapshot
@@ -0,0 +1,38 @@
+# backend/tests/test_activity_service.py
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.activity_service import LastLoginBuffer
+
+SEEN_AT = datetime(2026, 1, 1, 12, 0)
+
+
+def _buffer(threshold: int = 100) -> LastLoginBuffer:
+    # Flushing is never reached in these tests; the factory only satisfies the constructor
+    return LastLoginBuffer(async_sessionmaker(create_async_engine("sqlite+aiosqlite://")), 60, threshold)
+
+
+def test_repeated_activity_keeps_the_latest_timestamp_per_user():
+    buffer = _buffer()
+
+    buffer.record(1, SEEN_AT)
+    buffer.record(1, SEEN_AT + timedelta(minutes=5))
+    buffer.record(1, SEEN_AT - timedelta(minutes=5))
+    buffer.record(2, SEEN_AT)
+
+    assert buffer.pending == 2
+    assert buffer._pending[1] == SEEN_AT + timedelta(minutes=5)
+
+
+async def test_threshold_wakes_the_flusher_early():
+    buffer = _buffer(threshold=3)
+    buffer.record(1, SEEN_AT)
+    buffer.record(2, SEEN_AT)
+    assert not buffer._wakeup.is_set()
+
+    buffer.record(2, SEEN_AT + timedelta(seconds=1))
+    assert not buffer._wakeup.is_set()
+    buffer.record(3, SEEN_AT)
+    await asyncio.wait_for(buffer._wakeup.wait(), timeout=1)
@@ -0,0 +1,17 @@
+# backend/tests/test_auth0_middleware.py
+import pytest
+
+from app.middleware.auth0_middleware import Auth0Middleware
+
+
+@pytest.mark.parametrize("payload, allowed", [
+    ({"permissions": ["admin"]}, True),
+    ({"permissions": ["admin", None, 42]}, True),
+    ({"permissions": None}, False),
+    # A string claim must not be split into single-character "roles"
+    ({"permissions": "admin"}, False),
+    ({"permissions": {"admin": True}}, False),
+    ({}, False),
+])
+def test_verify_permissions_ignores_malformed_claims(payload, allowed):
+    assert Auth0Middleware.verify_permissions(payload, ["admin"]) is allowed
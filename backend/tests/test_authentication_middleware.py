@@ -0,0 +1,89 @@
+# backend/tests/test_authentication_middleware.py
+import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core.security.token_store import InMemorySessionStore
+from app.core.security.user_auth import Principal, get_principal
+from app.middleware import authentication_middleware
+from app.middleware.authentication_middleware import AuthenticationMiddleware
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    # Routes depend on get_principal only, so no local user lookup (and no database) is involved
+    app = FastAPI()
+    app.add_middleware(AuthenticationMiddleware)
+
+    @app.get("/public")
+    async def public():
+        return {"ok": True}
+
+    @app.get("/private")
+    async def private(principal: Principal = Depends(get_principal)):
+        return {"sub": principal.sub, "roles": list(principal.roles)}
+
+    return app
+
+
+async def _get(app: FastAPI, path: str, session_id: str = None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        if session_id is not None:
+            cookies = {authentication_middleware.settings.SESSION_COOKIE_NAME: session_id}
+            return await client.get(path, cookies=cookies)
+        return await client.get(path, headers={"Authorization": "Bearer token"})
+
+
+@pytest.mark.parametrize("permissions", [None, "admin", 42, ["admin", None, {"x": 1}]])
+async def test_malformed_permissions_claim_grants_nothing_extra(app, monkeypatch, permissions):
+    async def verify(token: str):
+        return {"sub": "auth0|1", "permissions": permissions}
+
+    monkeypatch.setattr(authentication_middleware, "verify_access_token", verify)
+
+    assert (await _get(app, "/public")).status_code == 200
+    response = await _get(app, "/private")
+    assert response.status_code == 200
+    assert response.json() == {"sub": "auth0|1", "roles": ["admin"] if isinstance(permissions, list) else []}
+
+
+async def test_verifier_failure_is_an_auth_error_not_a_500(app, monkeypatch):
+    async def verify(token: str):
+        raise RuntimeError("verifier pool died")
+
+    monkeypatch.setattr(authentication_middleware, "verify_access_token", verify)
+
+    assert (await _get(app, "/public")).status_code == 200
+    response = await _get(app, "/private")
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Authentication unavailable"}
+
+
+@pytest.fixture
+def session_store(monkeypatch) -> InMemorySessionStore:
+    store = InMemorySessionStore(ttl=3600, sweep_interval=60, shards=1)
+    monkeypatch.setattr(authentication_middleware.settings, "AUTH_MODE", "session")
+    monkeypatch.setattr(authentication_middleware, "get_session_store", lambda: store)
+    return store
+
+
+async def test_session_without_refresh_token_ends_with_its_access_token(session_store):
+    expires = time.time() + 60
+    record = await session_store.create({"sub": "auth0|1", "exp": expires}, "access", refresh_token=None)
+    assert record.expires_at == expires
+
+
+async def test_session_with_expired_access_token_is_rejected(app, session_store):
+    live = await session_store.create({"sub": "auth0|1", "exp": time.time() + 600}, "access", refresh_token=None)
+    assert (await _get(app, "/private", live.session_id)).status_code == 200
+
+    # Stored before lifetimes were capped, or its refresh keeps failing
+    expired = await session_store.create({"sub": "auth0|1", "exp": time.time() + 600}, "access", refresh_token=None)
+    await session_store.update_tokens(expired, {"sub": "auth0|1", "exp": time.time() - 1}, "access", None)
+    response = await _get(app, "/private", expired.session_id)
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Session expired"}
+    assert (await _get(app, "/public", expired.session_id)).status_code == 200
@@ -0,0 +1,61 @@
+# backend/tests/test_export_service.py
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app.models import RoleType, User, UserProfile
+from app.services import export_service
+from app.services.export_service import EXPORT_COLUMNS, export_users
+from app.services.user_service import UserFilters
+
+
+@pytest.fixture
+async def session_factory(session_factory, roles, load_role_catalog):
+    async with session_factory() as db:
+        for index in range(25):
+            db.add(User(
+                email=f"user{index}@example.com",
+                username=f"user{index}",
+                first_name="Test",
+                last_name=f"User{index}",
+                auth0_id=f"auth0|{index}",
+                roles=[roles[RoleType.ADMIN], roles[RoleType.USER]] if index % 5 == 0 else [roles[RoleType.USER]],
+                profile=UserProfile(bio=f"Line one\nline two of {index}") if index % 2 else None,
+            ))
+        await db.commit()
+    await load_role_catalog(session_factory)
+    return session_factory
+
+
+async def _export(session_factory, **kwargs) -> bytes:
+    async with session_factory() as db:
+        return b"".join([chunk async for chunk in export_users(db, **kwargs)])
+
+
+async def test_ndjson_export_has_one_record_per_user(session_factory, monkeypatch):
+    # Small batches and flushes exercise users spanning fetch and output boundaries
+    monkeypatch.setattr(export_service.settings, "BULK_EXPORT_YIELD_PER", 3)
+    monkeypatch.setattr(export_service, "_FLUSH_BYTES", 100)
+
+    records = [json.loads(line) for line in (await _export(session_factory)).decode().splitlines()]
+
+    assert [record["auth0_id"] for record in records] == [f"auth0|{index}" for index in range(25)]
+    assert list(records[0]) == list(EXPORT_COLUMNS)
+    assert records[0]["roles"] == ["ADMIN", "USER"]
+    assert records[1]["roles"] == ["USER"]
+    assert records[1]["bio"] == "Line one\nline two of 1"
+    assert records[2]["bio"] is None
+
+
+async def test_gzip_csv_export_with_filters(session_factory):
+    data = await _export(session_factory, export_format="csv", filters=UserFilters(role=RoleType.ADMIN), compress=True)
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(data).decode())))
+
+    assert [row["auth0_id"] for row in rows] == ["auth0|0", "auth0|5", "auth0|10", "auth0|15", "auth0|20"]
+    assert rows[1]["roles"] == "ADMIN|USER"
+    assert rows[1]["bio"] == "Line one\nline two of 5"
+    assert rows[0]["is_active"] == "true" and rows[0]["last_login"] == ""
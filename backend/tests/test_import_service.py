@@ -0,0 +1,85 @@
+# backend/tests/test_import_service.py
+from typing import AsyncIterator, List
+
+import pytest
+
+from app.services.import_service import (
+    ImportFormatError,
+    _iter_csv_rows,
+    _iter_lines,
+    _iter_ndjson_rows,
+    validate_row,
+)
+
+
+async def _chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def _collect(rows) -> List:
+    return [row async for row in rows]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+async def test_csv_rows_survive_any_chunking(chunk_size):
+    body = (
+        "﻿auth0_id,email,username,bio\n"
+        'auth0|1,a@example.com,alice,"Line one\nline two, with ""quotes"""\n'
+        "\n"
+        "auth0|2,b@example.com,bob,\n"
+        "auth0|3,c@example.com\n"
+    ).encode("utf-8")
+
+    rows = await _collect(_iter_csv_rows(_iter_lines(_chunks(body, chunk_size))))
+
+    assert rows[0] == (1, {
+        "auth0_id": "auth0|1",
+        "email": "a@example.com",
+        "username": "alice",
+        "bio": 'Line one\nline two, with "quotes"',
+    })
+    assert rows[1][0] == 2
+    assert rows[2] == (3, "Expected 4 columns, got 2")
+
+
+async def test_csv_without_required_columns_is_rejected():
+    with pytest.raises(ImportFormatError):
+        await _collect(_iter_csv_rows(_iter_lines(_chunks(b"name,email\nx,y\n", 64))))
+
+
+async def test_ndjson_reports_bad_lines_per_row():
+    body = b'{"auth0_id": "auth0|1"}\n\nnot json\n[1, 2]\n'
+
+    rows = await _collect(_iter_ndjson_rows(_iter_lines(_chunks(body, 5))))
+
+    assert rows == [(1, {"auth0_id": "auth0|1"}), (2, "Invalid JSON"), (3, "Expected a JSON object")]
+
+
+def test_validate_row_stages_user_profile_and_roles():
+    staged = validate_row(4, {
+        "auth0_id": "auth0|4",
+        "email": "dana@example.com",
+        "username": "dana",
+        "first_name": "Dana",
+        "last_name": "Scully",
+        "is_active": "false",
+        "location": "",
+        "roles": "admin| user",
+    })
+
+    assert staged == (
+        4, "auth0|4", "dana@example.com", "dana", "Dana", "Scully", False,
+        None, None, None, None, "ADMIN,USER",
+    )
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"auth0_id": "auth0|5", "email": "nope", "username": "eve", "first_name": "E", "last_name": "V"}, "email"),
+    ({"auth0_id": "auth0|5", "email": "e@example.com", "username": "eve", "first_name": "E"}, "last_name"),
+    ({"auth0_id": "auth0|5", "email": "e@example.com", "username": "eve", "first_name": "E", "last_name": "V",
+      "roles": ["owner"]}, "Unknown role"),
+])
+def test_validate_row_reports_readable_errors(row, message):
+    with pytest.raises(ValueError, match=message):
+        validate_row(5, row)
@@ -0,0 +1,58 @@
+# backend/tests/test_init_db.py
+from typing import List
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.init_db import DEFAULT_ROLES, init_db, migration_heads
+from app.models import Role
+
+
+async def _stamp(engine, revisions) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        for revision in revisions:
+            await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+
+def _created_tables(statements: List[str]) -> List[str]:
+    return [statement for statement in statements if statement.lstrip().startswith("CREATE TABLE")]
+
+
+async def test_unversioned_database_gets_tables_and_roles(sqlite_engine, statements):
+    await init_db(sqlite_engine, async_sessionmaker(sqlite_engine), schema_init="auto")
+
+    assert _created_tables(statements)
+    async with async_sessionmaker(sqlite_engine)() as db:
+        names = set((await db.scalars(select(Role.name))).all())
+    assert names == set(DEFAULT_ROLES)
+
+
+async def test_database_at_head_skips_create_all(sqlite_engine, statements):
+    await init_db(sqlite_engine, async_sessionmaker(sqlite_engine), schema_init="create_all")
+    await _stamp(sqlite_engine, migration_heads())
+    statements.clear()
+
+    await init_db(sqlite_engine, async_sessionmaker(sqlite_engine), schema_init="auto")
+
+    assert not _created_tables(statements)
+    # Roles exist, so seeding is a single probe
+    assert not any(statement.lstrip().startswith("INSERT") for statement in statements)
+
+
+async def test_database_behind_head_falls_back_to_create_all(sqlite_engine, statements):
+    await _stamp(sqlite_engine, ["c4e8a2f6b910"])
+    statements.clear()
+
+    await init_db(sqlite_engine, async_sessionmaker(sqlite_engine), schema_init="auto")
+
+    assert _created_tables(statements)
+
+
+async def test_roles_are_seeded_once(sqlite_engine):
+    session_factory = async_sessionmaker(sqlite_engine)
+    await init_db(sqlite_engine, session_factory, schema_init="create_all")
+    await init_db(sqlite_engine, session_factory, schema_init="skip")
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(Role)) == len(DEFAULT_ROLES)
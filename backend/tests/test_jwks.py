@@ -0,0 +1,121 @@
+# backend/tests/test_jwks.py
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.core.security import jwks
+from app.core.security.jwks import JWKSKeyProvider
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(jwks, "time", clock)
+    return clock
+
+
+def _jwk(kid: str) -> Dict:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key()
+    return {**RSAAlgorithm.to_jwk(key, as_dict=True), "kid": kid, "use": "sig"}
+
+
+def _client(calls: List[str], kids: List[str], headers: Dict[str, str] = None) -> httpx.AsyncClient:
+    keys = {kid: _jwk(kid) for kid in kids}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        # Yield, so concurrent callers arrive while the fetch is in flight
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"keys": list(keys.values())}, headers=headers or {})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _provider(client: Optional[httpx.AsyncClient], default_ttl: int = 3600,
+              refresh_cooldown: int = 30) -> JWKSKeyProvider:
+    return JWKSKeyProvider(
+        jwks_url="https://tenant.example.com/.well-known/jwks.json",
+        default_ttl=default_ttl,
+        refresh_cooldown=refresh_cooldown,
+        refresh_interval=3600,
+        http_client=client,
+    )
+
+
+async def test_known_kids_are_served_from_the_cache(clock):
+    calls: List[str] = []
+    async with _client(calls, ["a", "b"]) as client:
+        provider = _provider(client)
+        first = await provider.get_signing_key("a")
+        clock.now += 60
+        again = await provider.get_signing_key("a")
+        other = await provider.get_signing_key("b")
+
+    assert first is not None and again is first and other is not None
+    assert provider.key_ids == ("a", "b")
+    assert calls == ["/.well-known/jwks.json"]
+
+
+@pytest.mark.parametrize("cache_control, ttl", [
+    ("public, max-age=600", 600),
+    # Never shorter than the refresh cooldown
+    ("max-age=5", 30),
+    ("no-cache", 30),
+    ("", 3600),
+])
+def test_ttl_follows_cache_control(cache_control, ttl):
+    provider = _provider(client=None)
+    assert provider._ttl_from_headers(httpx.Headers({"Cache-Control": cache_control})) == ttl
+
+
+async def test_keys_are_refetched_once_the_cache_control_ttl_passes(clock):
+    calls: List[str] = []
+    async with _client(calls, ["a"], headers={"Cache-Control": "max-age=600"}) as client:
+        provider = _provider(client)
+        await provider.get_signing_key("a")
+        clock.now += 599
+        await provider.get_signing_key("a")
+        assert len(calls) == 1
+
+        clock.now += 2
+        assert await provider.get_signing_key("a") is not None
+    assert len(calls) == 2
+
+
+async def test_concurrent_unknown_kids_share_one_refresh(clock):
+    calls: List[str] = []
+    kids = [f"rotated-{index}" for index in range(10)]
+    async with _client(calls, kids) as client:
+        provider = _provider(client)
+        keys = await asyncio.gather(*[provider.get_signing_key(kid) for kid in kids + ["missing"] * 5])
+
+    assert all(key is not None for key in keys[:10])
+    assert keys[10:] == [None] * 5
+    assert len(calls) == 1
+
+
+async def test_unknown_kid_is_negatively_cached_until_the_cooldown_passes(clock):
+    calls: List[str] = []
+    async with _client(calls, ["a"]) as client:
+        provider = _provider(client, refresh_cooldown=30)
+        assert await provider.get_signing_key("missing") is None
+        clock.now += 29
+        for _ in range(5):
+            assert await provider.get_signing_key("missing") is None
+        assert len(calls) == 1
+
+        clock.now += 2
+        assert await provider.get_signing_key("missing") is None
+    assert len(calls) == 2
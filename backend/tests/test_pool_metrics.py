@@ -0,0 +1,73 @@
+# backend/tests/test_pool_metrics.py
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, install_idle_pre_ping
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # One pooled connection plus one overflow, and a short timeout so exhausting it is quick
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def metrics(engine) -> PoolMetrics:
+    metrics = PoolMetrics("test")
+    metrics.attach(engine)
+    install_idle_pre_ping(engine, idle_seconds=0.05, metrics=metrics)
+    return metrics
+
+
+def test_exhausted_pool_counts_waits_timeouts_and_overflow(engine, metrics):
+    first, second = engine.connect(), engine.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert (snapshot["checkouts"], snapshot["checkout_timeouts"]) == (2, 1)
+    assert snapshot["checkout_wait_seconds_max"] >= 0.1
+    assert snapshot["checkout_wait_histogram"]["le_0.5"] == 1
+    assert (snapshot["connections_opened"], snapshot["overflow_connections_opened"]) == (2, 1)
+    assert (snapshot["in_use"], snapshot["overflow"]) == (2, 1)
+
+    first.close()
+    # The pool is full again, so the overflow connection is closed rather than kept
+    second.close()
+    snapshot = metrics.snapshot()
+    assert (snapshot["connections_closed"], snapshot["idle"], snapshot["in_use"]) == (1, 1, 0)
+
+
+def test_only_idle_connections_are_pinged(engine, metrics):
+    engine.connect().close()
+    engine.connect().close()
+    assert metrics.pre_pings == 0
+
+    time.sleep(0.06)
+    engine.connect().close()
+    assert (metrics.pre_pings, metrics.pre_ping_failures) == (1, 0)
+
+
+def test_failed_ping_replaces_the_connection(engine, metrics, monkeypatch):
+    engine.connect().close()
+    time.sleep(0.06)
+
+    def dead(_dbapi_connection):
+        raise ConnectionError("server closed the connection")
+
+    monkeypatch.setattr(engine.dialect, "do_ping", dead)
+    engine.connect().close()
+
+    assert (metrics.pre_pings, metrics.pre_ping_failures) == (1, 1)
+    assert (metrics.connections_opened, metrics.connections_closed) == (2, 1)
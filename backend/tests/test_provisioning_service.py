@@ -0,0 +1,153 @@
+# backend/tests/test_provisioning_service.py
+import asyncio
+from typing import Dict, List
+
+import pytest
+from sqlalchemy import select
+
+from app.core.security.roles import RoleFlag
+from app.core.security.user_auth import Principal
+from app.models import Role, RoleType, User
+from app.services.provisioning_service import UserProvisioner
+
+
+@pytest.fixture
+async def session_factory(session_factory, roles, load_role_catalog):
+    await load_role_catalog(session_factory)
+    return session_factory
+
+
+def _principal(sub: str, permissions=()) -> Principal:
+    return Principal.from_claims({"sub": sub, "permissions": list(permissions)}, "token")
+
+
+def _profile(name: str, **extra):
+    calls: List[str] = []
+
+    async def fetch() -> Dict:
+        calls.append(name)
+        await asyncio.sleep(0)
+        return {"email": f"{name}@example.com", "nickname": name, "given_name": name.title(), **extra}
+
+    return fetch, calls
+
+
+async def test_first_request_provisions_then_hits_the_cache(session_factory, statements):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    fetch, calls = _profile("alice", family_name="Liddell", email_verified=True)
+
+    principal = await provisioner.resolve(_principal("auth0|alice"), fetch)
+    statements.clear()
+    again = await provisioner.resolve(_principal("auth0|alice"), fetch)
+
+    assert principal.user_id is not None and again.user_id == principal.user_id
+    assert principal.role_mask == RoleFlag.USER
+    assert calls == ["alice"]
+    assert statements == []
+    async with session_factory() as db:
+        user = (await db.scalars(select(User).where(User.auth0_id == "auth0|alice"))).one()
+    assert (user.username, user.first_name, user.last_name, user.is_verified) == ("alice", "Alice", "Liddell", True)
+
+
+async def test_concurrent_misses_share_one_lookup(session_factory):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    fetch, calls = _profile("bob")
+
+    principals = await asyncio.gather(*[provisioner.resolve(_principal("auth0|bob"), fetch) for _ in range(5)])
+
+    assert len({principal.user_id for principal in principals}) == 1
+    assert calls == ["bob"]
+
+
+async def test_login_upsert_updates_identity_and_keeps_local_roles(session_factory):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    first = await provisioner.provision({"sub": "auth0|carol"}, {"email": "carol@example.com", "nickname": "carol"})
+    async with session_factory() as db:
+        user = await db.get(User, first.user_id)
+        await db.refresh(user, ["roles"])
+        user.roles = [(await db.scalars(select(Role).where(Role.name == RoleType.ADMIN))).one()]
+        user.first_name = "Edited"
+        await db.commit()
+
+    second = await provisioner.provision({"sub": "auth0|carol"}, {"email": "new@example.com", "nickname": "carol"})
+
+    assert second.user_id == first.user_id
+    assert second.role_mask == RoleFlag.ADMIN | RoleFlag.MODERATOR | RoleFlag.USER
+    async with session_factory() as db:
+        user = await db.get(User, first.user_id)
+    assert (user.email, user.first_name) == ("new@example.com", "Edited")
+
+
+async def test_local_roles_extend_the_token_roles(session_factory):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    fetch, _ = _profile("dave")
+
+    principal = await provisioner.resolve(_principal("auth0|dave", ["moderator"]), fetch)
+
+    assert principal.roles == ("moderator",)
+    assert principal.role_mask == RoleFlag.MODERATOR | RoleFlag.USER
+
+
+async def test_username_clash_gets_a_suffix_and_email_clash_is_cached_as_unlinked(session_factory, statements):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    await provisioner.provision({"sub": "auth0|erin"}, {"email": "erin@example.com", "nickname": "erin"})
+
+    renamed = await provisioner.resolve(
+        _principal("auth0|other-erin"),
+        lambda: asyncio.sleep(0, {"email": "erin2@example.com", "nickname": "erin"})
+    )
+    clashing = _principal("auth0|erin-copy")
+    unlinked = await provisioner.resolve(clashing, lambda: asyncio.sleep(0, {"email": "erin@example.com"}))
+    statements.clear()
+    again = await provisioner.resolve(clashing, lambda: asyncio.sleep(0, {"email": "erin@example.com"}))
+    assert statements == []
+
+    async with session_factory() as db:
+        username = await db.scalar(select(User.username).where(User.id == renamed.user_id))
+    assert username.startswith("erin_") and len(username) == 13
+    assert unlinked.user_id is None and again.user_id is None
+
+
+async def test_invalidate_forces_a_new_lookup(session_factory, statements):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    fetch, calls = _profile("frank")
+    await provisioner.resolve(_principal("auth0|frank"), fetch)
+
+    provisioner.invalidate("auth0|frank")
+    statements.clear()
+    principal = await provisioner.resolve(_principal("auth0|frank"), fetch)
+
+    assert principal.user_id is not None
+    assert len(statements) == 1
+    assert calls == ["frank"]
+
+
+async def test_failed_lookup_is_remembered_briefly(session_factory):
+    attempts: List[int] = []
+
+    def unavailable():
+        attempts.append(1)
+        raise ConnectionError("database unavailable")
+
+    provisioner = UserProvisioner(unavailable, max_entries=10, ttl=60, failure_ttl=60)
+    fetch, _ = _profile("down")
+    principal = _principal("auth0|down")
+
+    for _ in range(3):
+        assert (await provisioner.resolve(principal, fetch)).user_id is None
+    assert len(attempts) == 1
+    # The middleware's cache peek sees the unresolved entry and doesn't retry either
+    assert provisioner.cached(principal) is principal
+
+
+async def test_cached_never_queries(session_factory, statements):
+    provisioner = UserProvisioner(session_factory, max_entries=10, ttl=60)
+    principal = _principal("auth0|peek")
+    assert provisioner.cached(principal) is None
+
+    fetch, _ = _profile("peek")
+    linked = await provisioner.resolve(principal, fetch)
+    statements.clear()
+
+    assert provisioner.cached(principal) == linked
+    assert statements == []
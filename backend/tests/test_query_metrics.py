@@ -0,0 +1,103 @@
+# backend/tests/test_query_metrics.py
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.query_metrics import RepeatedQueryError, instrument_queries, track_queries
+from app.middleware import query_metrics_middleware
+from app.middleware.query_metrics_middleware import QueryMetricsMiddleware
+from app.models import Role, RoleType, User
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+async def engine(engine):
+    instrument_queries(engine.sync_engine)
+    async with async_sessionmaker(engine)() as db:
+        role = Role(name=RoleType.USER, description="user")
+        db.add_all(
+            User(email=f"user{index}@example.com", username=f"user{index}", first_name="Test",
+                 last_name="User", auth0_id=f"auth0|{index}", roles=[role])
+            for index in range(12)
+        )
+        await db.commit()
+    return engine
+
+
+def _app(engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware)
+    session_factory = async_sessionmaker(engine)
+
+    @app.get("/batched")
+    async def batched():
+        async with session_factory() as db:
+            users = await UserService(db).list_users(limit=12, load="with_roles")
+        return {"roles": sum(len(user.roles) for user in users)}
+
+    @app.get("/n-plus-one")
+    async def n_plus_one():
+        async with session_factory() as db:
+            ids = (await db.scalars(select(User.id))).all()
+            for user_id in ids:
+                await db.scalar(select(User.username).where(User.id == user_id))
+        return {"users": len(ids)}
+
+    return app
+
+
+async def _get(engine, path: str, raise_app_exceptions: bool = True) -> httpx.Response:
+    transport = httpx.ASGITransport(app=_app(engine), raise_app_exceptions=raise_app_exceptions)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_server_timing_reports_request_queries(engine):
+    response = await _get(engine, "/batched")
+
+    assert response.json() == {"roles": 12}
+    timing = response.headers["server-timing"]
+    # The page and one IN query for its roles
+    assert 'desc="2 queries"' in timing
+    assert "db-slowest;dur=" in timing
+
+
+async def test_repeated_statement_warns_or_fails(engine, monkeypatch, caplog):
+    monkeypatch.setattr(query_metrics_middleware.settings, "DB_REPEATED_QUERY_THRESHOLD", 10)
+
+    monkeypatch.setattr(query_metrics_middleware.settings, "DB_REPEATED_QUERY_MODE", "warn")
+    response = await _get(engine, "/n-plus-one")
+    assert response.status_code == 200
+    assert 'db-repeats;desc="12"' in response.headers["server-timing"]
+    assert "GET /n-plus-one ran the same statement 12 times" in caplog.text
+
+    monkeypatch.setattr(query_metrics_middleware.settings, "DB_REPEATED_QUERY_MODE", "raise")
+    with pytest.raises(RepeatedQueryError):
+        await _get(engine, "/n-plus-one")
+    # The check runs before the headers, so the client gets an error rather than a 200
+    response = await _get(engine, "/n-plus-one", raise_app_exceptions=False)
+    assert response.status_code == 500
+    # Batched loading stays under the threshold
+    assert (await _get(engine, "/batched")).status_code == 200
+
+
+async def test_tracking_is_per_task(engine):
+    async def run(count: int):
+        with track_queries() as stats:
+            async with engine.connect() as conn:
+                for _ in range(count):
+                    await conn.execute(text("SELECT 1"))
+        return stats
+
+    first, second = await asyncio.gather(run(3), run(5))
+
+    assert (first.count, second.count) == (3, 5)
+    assert first.repeated(3) == [("SELECT 1", 3)]
+    # Outside a tracked block nothing is recorded
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert first.count == 3
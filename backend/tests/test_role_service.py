@@ -0,0 +1,36 @@
+# backend/tests/test_role_service.py
+import dataclasses
+
+import pytest
+
+from app.models import RoleType
+from app.schemas.role import Role as RoleSchema
+from app.services.role_service import RoleCatalog
+
+
+@pytest.fixture
+async def catalog(engine, session_factory, roles):
+    catalog = RoleCatalog(session_factory, engine, reconnect_interval=1)
+    # No listener on SQLite; start() only loads
+    await catalog.start()
+    yield catalog
+    await catalog.stop()
+
+
+async def test_lookups_are_served_from_memory(catalog, statements):
+
+    user = catalog.by_name(RoleType.USER)
+    admin = catalog.by_name(RoleType.ADMIN)
+
+    assert catalog.by_id(user.id) is user
+    assert catalog.names([admin.id, 999, user.id]) == [RoleType.ADMIN, RoleType.USER]
+    assert [role.name for role in catalog.roles] == list(RoleType)
+    assert RoleSchema.model_validate(user).description == "USER"
+    assert statements == []
+
+
+async def test_catalog_entries_are_immutable(catalog):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        catalog.by_name(RoleType.USER).description = "changed"
+    with pytest.raises(TypeError):
+        catalog._snapshot.by_id[0] = None
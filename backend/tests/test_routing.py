@@ -0,0 +1,101 @@
+# backend/tests/test_routing.py
+from typing import Dict, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app.db.routing import ReplicaSet, RoutingSession
+from app.models import Role, RoleType
+
+
+@pytest.fixture
+def engines() -> Dict[str, Engine]:
+    engines = {name: create_engine("sqlite://", poolclass=StaticPool) for name in ("primary", "replica")}
+    for engine in engines.values():
+        Base.metadata.create_all(engine)
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def routed(engines) -> List[Tuple[str, str]]:
+    """(engine name, first word of the statement) for every statement run."""
+    executed: List[Tuple[str, str]] = []
+    for name, engine in engines.items():
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany, name=name):
+            executed.append((name, statement.split()[0]))
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return executed
+
+
+def _session(engines: Dict[str, Engine], replicas: bool = True) -> RoutingSession:
+    replica_set = ReplicaSet([engines["replica"]], retry_after=30) if replicas else None
+    return RoutingSession(engines["primary"], replica_set)
+
+
+def test_reads_go_to_the_replica(engines, routed):
+    with _session(engines) as session:
+        session.scalars(select(Role)).all()
+        session.scalars(select(Role)).all()
+
+    assert routed == [("replica", "SELECT"), ("replica", "SELECT")]
+
+
+def test_session_sticks_to_the_primary_after_a_write(engines, routed):
+    with _session(engines) as session:
+        session.scalars(select(Role)).all()
+        session.execute(update(Role).values(description="changed"))
+        session.scalars(select(Role)).all()
+
+    assert routed == [("replica", "SELECT"), ("primary", "UPDATE"), ("primary", "SELECT")]
+
+
+def test_flushes_go_to_the_primary(engines, routed):
+    with _session(engines) as session:
+        session.add(Role(name=RoleType.USER, description="user"))
+        session.flush()
+        session.scalars(select(Role)).all()
+
+    assert routed == [("primary", "INSERT"), ("primary", "SELECT")]
+
+
+def test_select_for_update_goes_to_the_primary(engines, routed):
+    with _session(engines) as session:
+        session.scalars(select(Role).with_for_update()).all()
+
+    assert routed == [("primary", "SELECT")]
+
+
+def test_without_replicas_everything_goes_to_the_primary(engines, routed):
+    with _session(engines, replicas=False) as session:
+        session.scalars(select(Role)).all()
+
+    assert routed == [("primary", "SELECT")]
+
+
+def test_reads_fall_back_to_the_primary_while_replicas_are_down(engines, routed):
+    replica_set = ReplicaSet([engines["replica"]], retry_after=30)
+    replica_set.mark_down(0)
+
+    with RoutingSession(engines["primary"], replica_set) as session:
+        session.scalars(select(Role)).all()
+
+    assert replica_set.healthy_count() == 0
+    assert routed == [("primary", "SELECT")]
+
+
+def test_failed_connect_marks_the_replica_down(tmp_path):
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica_set = ReplicaSet([unreachable], retry_after=30)
+
+    with pytest.raises(OperationalError):
+        with unreachable.connect():
+            pass
+
+    assert replica_set.choose() is None
+    unreachable.dispose()
@@ -0,0 +1,169 @@
+# backend/tests/test_token_manager.py
+import asyncio
+import dataclasses
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+
+from app.core.security import token_manager
+from app.core.security.token_manager import Auth0TokenRefresher, SessionTokenManager
+from app.core.security.token_store import SessionRecord
+
+
+def _client(calls: List[str], status_code: int = 200) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        # Yield, so concurrent callers arrive while the exchange is in flight
+        await asyncio.sleep(0.01)
+        if status_code != 200:
+            return httpx.Response(status_code, json={"error": "invalid_grant"})
+        return httpx.Response(200, json={"access_token": f"access-{len(calls)}", "refresh_token": "rotated"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def test_rejected_refresh_token_is_not_exchanged_again_within_ttl():
+    calls: List[str] = []
+    refresher = Auth0TokenRefresher(result_ttl=10, failure_ttl=60)
+    async with _client(calls, status_code=403) as client:
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await refresher.refresh("revoked", client)
+
+    assert calls == ["/oauth/token"]
+
+
+async def test_server_errors_are_retried():
+    calls: List[str] = []
+    refresher = Auth0TokenRefresher(result_ttl=10, failure_ttl=60)
+    async with _client(calls, status_code=503) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await refresher.refresh("token", client)
+
+    assert len(calls) == 2
+
+
+async def test_concurrent_refreshes_share_one_exchange():
+    calls: List[str] = []
+    refresher = Auth0TokenRefresher(result_ttl=10)
+    async with _client(calls) as client:
+        results = await asyncio.gather(*[refresher.refresh("token", client) for _ in range(10)])
+        # Within result_ttl, a late caller gets the same tokens rather than a second exchange
+        late = await refresher.refresh("token", client)
+
+    assert calls == ["/oauth/token"]
+    assert all(result == {"access_token": "access-1", "refresh_token": "rotated"} for result in results + [late])
+
+
+async def test_failed_exchange_is_shared_but_not_cached_as_a_result():
+    calls: List[str] = []
+    refresher = Auth0TokenRefresher(result_ttl=10)
+    async with _client(calls, status_code=503) as client:
+        results = await asyncio.gather(*[refresher.refresh("token", client) for _ in range(5)],
+                                       return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+
+    async with _client(calls) as client:
+        tokens = await refresher.refresh("token", client)
+    assert len(calls) == 2
+    assert tokens["access_token"] == "access-2"
+
+
+def _record(session_id: str, expires_in: float, refresh_token: Optional[str] = "refresh") -> SessionRecord:
+    now = time.time()
+    return SessionRecord(session_id=session_id, sub="auth0|user", claims={}, access_token="access",
+                         refresh_token=refresh_token, access_token_expires_at=now + expires_in,
+                         expires_at=now + 3600)
+
+
+@pytest.fixture
+def records() -> Dict[str, SessionRecord]:
+    """Contents of the session store the background refresh reads."""
+    return {}
+
+
+@pytest.fixture
+def refreshed(monkeypatch, records) -> List[str]:
+    """Session IDs passed to refresh_session, in order."""
+    sessions: List[str] = []
+
+    class _Store:
+        async def get(self, session_id: str) -> Optional[SessionRecord]:
+            return records.get(session_id)
+
+    async def refresh_session(record: SessionRecord, _http_client) -> SessionRecord:
+        sessions.append(record.session_id)
+        return dataclasses.replace(record, access_token_expires_at=time.time() + 3600)
+
+    monkeypatch.setattr(token_manager, "get_session_store", lambda: _Store())
+    monkeypatch.setattr(token_manager, "refresh_session", refresh_session)
+    monkeypatch.setattr(token_manager, "get_http_client", lambda: None)
+    return sessions
+
+
+def _manager(jitter: int = 0, idle_timeout: int = 600) -> SessionTokenManager:
+    return SessionTokenManager(lead=60, jitter=jitter, retry_interval=5, concurrency=2, idle_timeout=idle_timeout)
+
+
+def test_sessions_without_refresh_token_are_not_tracked():
+    manager = _manager()
+    for index in range(3):
+        manager.track(_record(f"s{index}", expires_in=600, refresh_token=None))
+
+    assert manager._last_seen == {} and manager._due == {}
+
+
+def test_refresh_is_scheduled_lead_plus_jitter_before_expiry():
+    manager = _manager(jitter=30)
+    records = [_record(f"s{index}", expires_in=600) for index in range(50)]
+    for record in records:
+        manager.track(record)
+    # Already scheduled; tracking again only notes activity
+    manager.track(dataclasses.replace(records[0], access_token_expires_at=0))
+
+    offsets = [record.access_token_expires_at - manager._due[record.session_id] for record in records]
+    assert all(60 <= offset <= 90 for offset in offsets)
+    # Sessions that logged in together are spread over the jitter window
+    assert max(offsets) - min(offsets) > 10
+
+
+async def test_due_sessions_are_refreshed_in_the_background(records, refreshed):
+    manager = _manager()
+    record = _record("due", expires_in=30)
+    records[record.session_id] = record
+    manager.track(record)
+
+    await manager.start()
+    try:
+        for _ in range(100):
+            if refreshed:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await manager.stop()
+
+    assert refreshed == ["due"]
+    # Rescheduled against the new access token
+    assert manager._due["due"] > time.time() + 3000
+
+
+async def test_idle_sessions_drop_out_of_the_schedule(records, refreshed):
+    manager = _manager(idle_timeout=0)
+    record = _record("idle", expires_in=30)
+    records[record.session_id] = record
+    manager.track(record)
+    await asyncio.sleep(0.01)
+
+    await manager.start()
+    try:
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+    finally:
+        await manager.stop()
+
+    assert refreshed == []
+    assert manager._last_seen == {} and manager._due == {}
@@ -0,0 +1,153 @@
+# backend/tests/test_token_verifier.py
+import asyncio
+import threading
+import time
+from typing import List
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.security import token_verifier
+from app.core.security.token_verifier import TokenVerifier
+
+_PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_PUBLIC_KEY = _PRIVATE_KEY.public_key()
+
+
+@pytest.fixture
+async def make_verifier():
+    verifiers: List[TokenVerifier] = []
+
+    def make(mode: str = "thread", batch_size: int = 32, batch_window: float = 0.05,
+             max_workers: int = 1) -> TokenVerifier:
+        verifier = TokenVerifier(mode=mode, max_workers=max_workers, queue_size=100,
+                                 batch_size=batch_size, batch_window=batch_window)
+        verifiers.append(verifier)
+        return verifier
+
+    yield make
+    for verifier in verifiers:
+        await verifier.close()
+
+
+@pytest.fixture
+def batches(monkeypatch) -> List[int]:
+    """Size of every batch handed to the executor (thread mode only; process workers import their own copy)."""
+    sizes: List[int] = []
+    decode_batch = token_verifier._decode_batch
+
+    def recording_decode_batch(jobs, audience, issuer):
+        sizes.append(len(jobs))
+        return decode_batch(jobs, audience, issuer)
+
+    monkeypatch.setattr(token_verifier, "_decode_batch", recording_decode_batch)
+    return sizes
+
+
+def _token(verifier: TokenVerifier, sub: str, expires_in: int = 300, **claims) -> str:
+    now = int(time.time())
+    payload = {"sub": sub, "aud": verifier.audience, "iss": verifier.issuer, "iat": now, "exp": now + expires_in}
+    return jwt.encode({**payload, **claims}, _PRIVATE_KEY, algorithm="RS256")
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_each_token_gets_its_own_result(make_verifier, mode):
+    verifier = make_verifier(mode=mode)
+    tokens = [
+        _token(verifier, "auth0|good"),
+        _token(verifier, "auth0|expired", expires_in=-60),
+        _token(verifier, "auth0|elsewhere", aud="https://other.example.com/"),
+        "not-a-jwt",
+        _token(verifier, "auth0|also-good"),
+    ]
+
+    results = await asyncio.gather(*[verifier.decode(token, _PUBLIC_KEY) for token in tokens],
+                                   return_exceptions=True)
+
+    assert results[0]["sub"] == "auth0|good"
+    assert isinstance(results[1], jwt.ExpiredSignatureError)
+    assert isinstance(results[2], jwt.InvalidAudienceError)
+    assert isinstance(results[3], jwt.DecodeError)
+    assert results[4]["sub"] == "auth0|also-good"
+
+
+async def test_concurrent_verifications_share_one_batch(make_verifier, batches):
+    verifier = make_verifier(batch_size=32)
+    tokens = [_token(verifier, f"auth0|{index}") for index in range(20)]
+
+    claims = await asyncio.gather(*[verifier.decode(token, _PUBLIC_KEY) for token in tokens])
+
+    assert [claim["sub"] for claim in claims] == [f"auth0|{index}" for index in range(20)]
+    assert batches == [20]
+
+
+async def test_full_batches_are_dispatched_without_waiting(make_verifier, batches):
+    verifier = make_verifier(batch_size=4, batch_window=0.5)
+    tokens = [_token(verifier, f"auth0|{index}") for index in range(8)]
+
+    started = time.monotonic()
+    await asyncio.gather(*[verifier.decode(token, _PUBLIC_KEY) for token in tokens])
+
+    assert batches == [4, 4]
+    assert time.monotonic() - started < 0.5
+
+
+async def test_partial_batch_is_dispatched_when_the_window_closes(make_verifier, batches):
+    verifier = make_verifier(batch_size=4, batch_window=0.1)
+    tokens = [_token(verifier, f"auth0|{index}") for index in range(6)]
+
+    started = time.monotonic()
+    await asyncio.gather(*[verifier.decode(token, _PUBLIC_KEY) for token in tokens])
+
+    assert batches == [4, 2]
+    assert time.monotonic() - started >= 0.1
+
+
+async def test_close_fails_queued_verifications(make_verifier):
+    verifier = make_verifier()
+    verifier.start()
+    # Stop the dispatcher before it takes the request off the queue
+    verifier._dispatcher.cancel()
+    pending = asyncio.create_task(verifier.decode(_token(verifier, "auth0|late"), _PUBLIC_KEY))
+    await asyncio.sleep(0)
+
+    await verifier.close()
+
+    with pytest.raises(RuntimeError, match="shutting down"):
+        await pending
+
+
+async def test_close_fails_verifications_already_in_the_executor(make_verifier, monkeypatch):
+    verifier = make_verifier(batch_window=0)
+    started, release = asyncio.Event(), threading.Event()
+    loop = asyncio.get_running_loop()
+
+    def stuck_decode_batch(jobs, audience, issuer):
+        loop.call_soon_threadsafe(started.set)
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(token_verifier, "_decode_batch", stuck_decode_batch)
+    pending = asyncio.create_task(verifier.decode(_token(verifier, "auth0|busy"), _PUBLIC_KEY))
+    await started.wait()
+
+    await verifier.close()
+    release.set()
+
+    with pytest.raises(RuntimeError, match="shutting down"):
+        await asyncio.wait_for(pending, 1)
+
+
+def test_process_workers_get_one_pem_per_key_material(make_verifier, monkeypatch):
+    monkeypatch.setattr(token_verifier, "_MAX_WORKER_KEYS", 2)
+    verifier = make_verifier(mode="process")
+    # A JWKS refresh parses a new object for the same key
+    reparsed = _PRIVATE_KEY.public_key()
+
+    pem = verifier._worker_key(_PUBLIC_KEY)
+    assert verifier._worker_key(reparsed) is pem
+    for _ in range(3):
+        verifier._worker_key(rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key())
+
+    assert len(verifier._pem_cache) == 2
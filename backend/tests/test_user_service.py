@@ -0,0 +1,253 @@
+# backend/tests/test_user_service.py
+from datetime import datetime
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models import Role, RoleType, User, UserProfile
+from app.schemas.user import User as UserSchema, UserUpdate, UserWithProfile
+from app.services.user_service import UserFilters, UserPage, UserSearch, UserService, profile_etag, user_etag
+from app.utils.etag import if_match, if_none_match
+from app.utils.pagination import InvalidCursorError
+
+
+async def _seed(engine, count: int) -> None:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        roles = [Role(name=role_type, description=role_type.value) for role_type in RoleType]
+        db.add_all(roles)
+        for index in range(count):
+            user = User(
+                email=f"user{index}@example.com",
+                username=f"user{index}",
+                first_name="Test",
+                last_name=f"User{index}",
+                auth0_id=f"auth0|{index}",
+                roles=[roles[1], roles[-1]] if index % 2 else [roles[-1]],
+                profile=UserProfile(bio=f"Bio {index}"),
+            )
+            db.add(user)
+        await db.commit()
+
+
+async def _session(engine, statements: List[str], count: int):
+    await _seed(engine, count)
+    statements.clear()
+    return async_sessionmaker(engine, expire_on_commit=False)()
+
+
+@pytest.mark.parametrize("page_size", [1, 10, 40])
+async def test_list_users_query_count_is_independent_of_page_size(engine, statements, page_size):
+    async with await _session(engine, statements, 40) as db:
+        users = await UserService(db).list_users(limit=page_size, load="with_roles")
+        payload = [UserSchema.model_validate(user) for user in users]
+
+    assert len(payload) == page_size
+    assert all(user.roles for user in payload)
+    # One query for the page, one IN query for all of its roles
+    assert len(statements) == 2
+
+
+async def test_full_profile_loads_roles_and_profile_up_front(engine, statements):
+    async with await _session(engine, statements, 5) as db:
+        user = await UserService(db).get_by_auth0_id("auth0|3", load="full")
+        payload = UserWithProfile.model_validate(user)
+
+    assert payload.profile.bio == "Bio 3"
+    assert {role.name for role in payload.roles} == {"MODERATOR", "USER"}
+    # User joined to profile, then roles
+    assert len(statements) == 2
+
+
+async def test_full_listing_is_two_queries(engine, statements):
+    async with await _session(engine, statements, 25) as db:
+        users = await UserService(db).list_users(limit=25, load="full")
+        payload = [UserWithProfile.model_validate(user) for user in users]
+
+    assert all(user.profile is not None for user in payload)
+    assert len(statements) == 2
+
+
+async def test_summary_is_one_query_and_refuses_lazy_loads(engine, statements):
+    async with await _session(engine, statements, 3) as db:
+        user = await UserService(db).get_by_auth0_id("auth0|1", load="summary")
+        assert user.username == "user1"
+        with pytest.raises(InvalidRequestError):
+            _ = user.roles
+
+    assert len(statements) == 1
+
+
+async def test_profile_lookup_by_auth0_id(engine, statements):
+    async with await _session(engine, statements, 3) as db:
+        profile = await UserService(db).get_profile_by_auth0_id("auth0|2")
+        missing = await UserService(db).get_profile_by_auth0_id("auth0|404")
+
+    assert profile.bio == "Bio 2"
+    assert missing is None
+    assert len(statements) == 2
+
+
+async def _walk(service: UserService, page: UserPage, filters: UserFilters, limit: int) -> List[str]:
+    """Follow cursors to the end, the way a client would, and return usernames seen."""
+    seen: List[str] = []
+    while True:
+        users = await service.list_users(page, filters, limit=limit + 1, load="summary")
+        seen.extend(user.username for user in users[:limit])
+        if len(users) <= limit:
+            return seen
+        page = UserPage.from_cursor(page.next_cursor(users[limit - 1]))
+
+
+@pytest.mark.parametrize("sort", ["created_at", "email", "username"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_keyset_pages_cover_every_user_once(engine, statements, sort, order):
+    async with await _session(engine, statements, 23) as db:
+        seen = await _walk(UserService(db), UserPage(sort=sort, order=order), UserFilters(), limit=5)
+
+    assert len(seen) == 23
+    assert len(set(seen)) == 23
+    if sort == "username":
+        assert seen == sorted(seen, reverse=order == "desc")
+
+
+async def test_keyset_pages_apply_filters(engine, statements, load_role_catalog):
+    async with await _session(engine, statements, 20) as db:
+        await load_role_catalog(async_sessionmaker(engine))
+        seen = await _walk(UserService(db), UserPage(), UserFilters(role=RoleType.MODERATOR), limit=3)
+
+    # Odd-numbered users are moderators
+    assert sorted(seen) == sorted(f"user{index}" for index in range(1, 20, 2))
+
+
+def test_tampered_cursor_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        UserPage.from_cursor("not-a-cursor")
+    with pytest.raises(InvalidCursorError):
+        UserPage.from_cursor(UserPage(sort="email").next_cursor(User(email="a@example.com", id="x")))
+
+
+async def test_current_etag_matches_full_load_with_one_query(engine, statements):
+    async with await _session(engine, statements, 3) as db:
+        user = await UserService(db).get_by_auth0_id("auth0|1", load="full")
+        statements.clear()
+        etag = await UserService(db).current_user_etag("auth0|1")
+        profile = await UserService(db).current_profile_etag("auth0|1")
+        missing = await UserService(db).current_user_etag("auth0|404")
+
+    assert etag == user_etag(user)
+    assert profile == profile_etag(user.profile)
+    assert missing is None
+    assert len(statements) == 3
+
+
+async def test_updates_bump_version_and_change_etag(engine, statements):
+    async with await _session(engine, statements, 2) as db:
+        service = UserService(db)
+        user = await service.get_by_auth0_id("auth0|0", load="full")
+        user_before, profile_before = user_etag(user), profile_etag(user.profile)
+
+        await service.update_user(user, {"first_name": "Renamed"})
+        assert user.version == 2
+        assert await service.current_user_etag("auth0|0") == user_etag(user) != user_before
+        assert await service.current_profile_etag("auth0|0") == profile_before
+
+        await service.save_profile(user, {"bio": "Updated"})
+        assert user.profile.version == 2
+        assert await service.current_profile_etag("auth0|0") != profile_before
+
+
+async def test_concurrent_update_is_rejected(engine, statements):
+    async with await _session(engine, statements, 1) as db:
+        stale = await UserService(db).get_by_auth0_id("auth0|0", load="full")
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        service = UserService(db)
+        await service.update_user(await service.get_by_auth0_id("auth0|0", load="full"), {"last_name": "First"})
+
+    async with session_factory() as db:
+        db.add(stale)
+        with pytest.raises(StaleDataError):
+            await UserService(db).update_user(stale, {"last_name": "Second"})
+
+
+def test_etag_preconditions():
+    etag = '"abc"'
+    assert if_none_match('"abc"', etag)
+    assert if_none_match('W/"abc", "def"', etag)
+    assert if_none_match("*", etag)
+    assert not if_none_match(None, etag)
+    assert not if_none_match('"def"', etag)
+
+    assert if_match(None, etag)
+    assert if_match('"abc"', etag)
+    assert if_match("*", etag)
+    assert not if_match('W/"abc"', etag)
+    assert not if_match("*", None)
+
+
+async def _search_all(service: UserService, query: str, limit: int) -> List[str]:
+    search = UserSearch.from_query(query)
+    seen: List[str] = []
+    while True:
+        matches = await service.search_users(search, limit=limit + 1)
+        seen.extend(user.username for user, _ in matches[:limit])
+        if len(matches) <= limit:
+            return seen
+        user, rank = matches[limit - 1]
+        search = search.resume(search.next_cursor(rank, user))
+
+
+async def test_search_ranks_exact_then_prefix_then_substring(engine, statements):
+    async with await _session(engine, statements, 25) as db:
+        seen = await _search_all(UserService(db), "  USER2 ", limit=2)
+
+    # The exact username first, then the usernames it prefixes, across pages
+    assert seen == ["user2"] + sorted(f"user{index}" for index in range(20, 25))
+
+
+async def test_search_matches_names_and_escapes_wildcards(engine, statements):
+    async with await _session(engine, statements, 12) as db:
+        service = UserService(db)
+        by_name = await _search_all(service, "test user1", limit=50)
+        wildcard = await _search_all(service, "user_", limit=50)
+
+    assert sorted(by_name) == ["user1", "user10", "user11"]
+    assert wildcard == []
+
+
+def test_search_cursor_round_trip():
+    search = UserSearch.from_query("Ann", UserFilters(role=RoleType.ADMIN))
+    cursor = search.next_cursor(1, User(username="anna"))
+    assert search.resume(cursor) == UserSearch(term="ann", filters=UserFilters(role=RoleType.ADMIN), after=(1, "anna"))
+    assert UserSearch.from_query(" ANN ", UserFilters(role=RoleType.ADMIN)).resume(cursor).after == (1, "anna")
+    with pytest.raises(InvalidCursorError):
+        search.resume(UserPage().next_cursor(User(created_at=datetime(2024, 1, 1), id=1)))
+
+
+@pytest.mark.parametrize("other", [
+    UserSearch.from_query("anne", UserFilters(role=RoleType.ADMIN)),
+    UserSearch.from_query("ann"),
+    UserSearch.from_query("ann", UserFilters(role=RoleType.ADMIN, is_active=True)),
+])
+def test_search_cursor_is_bound_to_term_and_filters(other):
+    cursor = UserSearch.from_query("ann", UserFilters(role=RoleType.ADMIN)).next_cursor(1, User(username="anna"))
+    with pytest.raises(InvalidCursorError, match="different search"):
+        other.resume(cursor)
+
+
+@pytest.mark.parametrize("body", [
+    {"email": "new@example.com"},
+    {"is_verified": True},
+    {"username": None},
+    {"is_active": None},
+])
+def test_user_update_rejects_auth0_owned_fields_and_nulls(body):
+    with pytest.raises(ValidationError):
+        UserUpdate.model_validate(body)
+    assert UserUpdate.model_validate({"first_name": "Ann"}).model_dump(exclude_unset=True) == {"first_name": "Ann"}
@@ -18,6 +18,7 @@ from backend.app.db.base import Base
 from backend.app.models.user import User  # noqa: F401
 from backend.app.models.role import Role  # noqa: F401
 from backend.app.models.profile import UserProfile  # noqa: F401
+from backend.app.models.session import AuthSession  # noqa: F401
 
 # Load application config
 settings = get_settings()
@@ -0,0 +1,50 @@
+"""Add auth_session table
+
+Revision ID: 3f9a1c2d7b41
+Revises: e7e43bc63152
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b41'
+down_revision: Union[str, None] = 'e7e43bc63152'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('auth_session',
+    sa.Column('session_hash', sa.String(length=64), nullable=False),
+    sa.Column('sub', sa.String(length=128), nullable=False),
+    sa.Column('claims', sa.JSON(), nullable=False),
+    sa.Column('access_token', sa.Text(), nullable=False),
+    sa.Column('refresh_token', sa.Text(), nullable=True),
+    sa.Column('access_token_expires_at', TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('expires_at', TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('created_at', TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'),
+              nullable=False),
+    sa.Column('updated_at', TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'),
+              onupdate=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_auth_session')),
+    schema=None
+    )
+    op.create_index(op.f('ix_auth_session_id'), 'auth_session', ['id'], unique=False)
+    op.create_index(op.f('ix_auth_session_session_hash'), 'auth_session', ['session_hash'], unique=True)
+    op.create_index(op.f('ix_auth_session_sub'), 'auth_session', ['sub'], unique=False)
+    op.create_index(op.f('ix_auth_session_expires_at'), 'auth_session', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_auth_session_expires_at'), table_name='auth_session')
+    op.drop_index(op.f('ix_auth_session_sub'), table_name='auth_session')
+    op.drop_index(op.f('ix_auth_session_session_hash'), table_name='auth_session')
+    op.drop_index(op.f('ix_auth_session_id'), table_name='auth_session')
+    op.drop_table('auth_session')
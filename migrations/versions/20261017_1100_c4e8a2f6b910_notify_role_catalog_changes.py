@@ -0,0 +1,38 @@
+"""Notify role catalog listeners when the role table changes
+
+Revision ID: c4e8a2f6b910
+Revises: 8b2d4e6f1a93
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f6b910'
+down_revision: Union[str, None] = '8b2d4e6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_role_catalog_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('role_catalog_changed', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER role_catalog_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON role
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_role_catalog_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS role_catalog_changed ON role")
+    op.execute("DROP FUNCTION IF EXISTS notify_role_catalog_changed()")
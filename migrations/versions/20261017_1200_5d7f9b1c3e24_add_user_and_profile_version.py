@@ -0,0 +1,28 @@
+"""Add version columns to user and user_profile for ETags and optimistic locking
+
+Revision ID: 5d7f9b1c3e24
+Revises: c4e8a2f6b910
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7f9b1c3e24'
+down_revision: Union[str, None] = 'c4e8a2f6b910'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('user_profile', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user_profile', 'version')
+    op.drop_column('user', 'version')
@@ -0,0 +1,34 @@
+"""Add pg_trgm GIN index on user email, username and names for admin search
+
+Revision ID: a7c3e9d1f258
+Revises: 5d7f9b1c3e24
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d1f258'
+down_revision: Union[str, None] = '5d7f9b1c3e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Must stay identical to SEARCH_TEXT in app/models/user.py, or the
+    # planner won't use the index for search queries
+    op.execute(
+        """
+        CREATE INDEX ix_user_search_trgm ON "user"
+        USING gin (lower(email || ' ' || username || ' ' || first_name || ' ' || last_name) gin_trgm_ops)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_search_trgm', table_name='user')
+    # pg_trgm is left installed; other objects may depend on it